@@ -3,15 +3,48 @@ from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime, timedelta
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import jwt
-from sqlmodel import Session, select
+import os
+import time
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from models import User
 from database import get_session
+from metrics import Counter, Gauge
 from passlib.context import CryptContext
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+
+# bcrypt takes ~250 ms of CPU per call, so it runs on a small dedicated thread pool
+# instead of the event loop. Past PASSWORD_HASH_QUEUE_LIMIT queued or running jobs,
+# new logins are turned away with a 503 rather than piling up.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "32"))
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+password_jobs = 0
+
+Gauge("password_hash_jobs", "Password hash and verify jobs queued or running", function=lambda: password_jobs)
+password_hash_rejections = Counter("password_hash_rejections_total", "Password jobs rejected because the queue was full")
+
+async def run_password_job(function, *args):
+    global password_jobs
+    if password_jobs >= PASSWORD_HASH_QUEUE_LIMIT:
+        password_hash_rejections.inc()
+        raise HTTPException(status_code=503, detail="Too many login attempts, try again shortly", headers={"Retry-After": "1"})
+    password_jobs += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(password_executor, function, *args)
+    finally:
+        password_jobs -= 1
+
+async def hash_password(password: str) -> str:
+    return await run_password_job(pwd_context.hash, password)
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    return await run_password_job(pwd_context.verify, password, hashed_password)
 
 
 # Secret key for encoding and decoding tokens
@@ -30,12 +63,54 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     username: Optional[str] = None
 
-def authenticate_user(email: str, password: str, session: Session):
+
+user_cache_hits = Counter("user_cache_hits_total", "Authenticated requests served from the user cache")
+user_cache_misses = Counter("user_cache_misses_total", "Authenticated requests that loaded the user from the database")
+
+class UserCache:
+    """LRU cache of users keyed by token subject (email), with a time-to-live.
+
+    The cache is per process: writes to a user row must call invalidate(), and
+    the TTL bounds how long other workers can serve a stale copy.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+
+    def get(self, email: str) -> Optional[User]:
+        entry = self._entries.get(email)
+        if entry is None or entry[0] < time.monotonic():
+            self._entries.pop(email, None)
+            user_cache_misses.inc()
+            return None
+        self._entries.move_to_end(email)
+        user_cache_hits.inc()
+        # Every request gets its own detached copy of the row
+        return User(**entry[1])
+
+    def set(self, user: User):
+        self._entries[user.email] = (time.monotonic() + self.ttl, user.model_dump())
+        self._entries.move_to_end(user.email)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, email: str):
+        self._entries.pop(email, None)
+
+    def clear(self):
+        self._entries.clear()
+
+user_cache = UserCache(
+    maxsize=int(os.getenv("USER_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("USER_CACHE_TTL_SECONDS", "60")),
+)
+
+async def authenticate_user(email: str, password: str, session: AsyncSession):
     statement = select(User).where(User.email == email)
-    user = session.exec(statement).first()
-    print(hash_password(password))
-    print(user.hashed_password)
-    if not user or not pwd_context.verify(password, user.hashed_password):
+    user = (await session.exec(statement)).first()
+    if not user or not await verify_password(password, user.hashed_password):
         return False
     return user
 
@@ -45,17 +120,22 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-async def get_current_user(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)):
+async def get_current_user(token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_session)):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("email")
         if email is None:
             raise HTTPException(status_code=401, detail="Invalid token")
+        user = user_cache.get(email)
+        if user:
+            return user
         statement = select(User).where(User.email == email)
-        user = session.exec(statement).first()
+        user = (await session.exec(statement)).first()
         if not user:
             raise HTTPException(status_code=401, detail="User not found")
-        return user
+        user_cache.set(user)
+        # Hand out a detached copy, the same as on a cache hit
+        return User(**user.model_dump())
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.PyJWTError:
@@ -0,0 +1,55 @@
+import os
+import time
+from contextlib import contextmanager
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+
+# Benchmarks run against a scratch PostgreSQL database, never the application one.
+# Its tables are dropped and recreated on every run.
+BENCH_DATABASE_URL = os.getenv("BENCH_DATABASE_URL")
+if not BENCH_DATABASE_URL:
+    raise SystemExit("Set BENCH_DATABASE_URL to a scratch PostgreSQL database")
+os.environ["DATABASE_URL"] = BENCH_DATABASE_URL
+
+
+async def create_bench_engine():
+    from database import async_database_url
+    # Importing models registers the tables on SQLModel's metadata
+    import models
+
+    engine = create_async_engine(async_database_url(BENCH_DATABASE_URL))
+    async with engine.begin() as connection:
+        await connection.run_sync(models.SQLModel.metadata.drop_all)
+        await connection.run_sync(models.SQLModel.metadata.create_all)
+    return engine
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+        self.parameters = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(statement)
+        self.parameters.append(parameters)
+
+
+# Count every SQL round-trip made through the engine inside the block
+@contextmanager
+def count_queries(engine):
+    counter = QueryCounter()
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", counter)
+
+
+@contextmanager
+def timed(label: str):
+    start = time.perf_counter()
+    yield
+    print(f"{label}: {(time.perf_counter() - start) * 1000:.1f} ms")
@@ -0,0 +1,54 @@
+"""Fan-out benchmark for property change events.
+
+Publishes EVENTS events to SUBSCRIBERS sockets' queues through the local
+broker, and through the Redis broker between two hubs standing in for two
+uvicorn workers (against an in-process Redis stand-in). Reports delivered
+events per second and checks every subscriber got every event. Needs no
+database. Run from the backend directory:
+
+    python -m benchmarks.events
+"""
+import asyncio
+import time
+from benchmarks.redis_stand_in import RedisStandIn
+from events import PropertyEvents, LocalBroker, RedisBroker
+
+SUBSCRIBERS = 200
+EVENTS = 50
+
+
+async def fan_out(name: str, publisher: PropertyEvents, receiver: PropertyEvents):
+    subscribers = [receiver.subscribe(1, "tenant") for _ in range(SUBSCRIBERS)]
+    start = time.perf_counter()
+    for i in range(EVENTS):
+        await publisher.publish(1, "announcement.added", {"id": i})
+    for subscriber in subscribers:
+        for i in range(EVENTS):
+            message = await asyncio.wait_for(subscriber.queue.get(), timeout=5)
+            if f'"id": {i}' not in message:
+                raise SystemExit(f"{name}: events arrived out of order")
+    elapsed = time.perf_counter() - start
+    for subscriber in subscribers:
+        receiver.unsubscribe(subscriber)
+    print(f"{name}: {SUBSCRIBERS * EVENTS / elapsed:.0f} deliveries/sec")
+
+
+async def main():
+    local = PropertyEvents(LocalBroker())
+    await local.start()
+    await fan_out("local broker", local, local)
+
+    stand_in = RedisStandIn()
+    port = await stand_in.start()
+    workers = [PropertyEvents(RedisBroker(f"redis://127.0.0.1:{port}/0")) for _ in range(2)]
+    for worker in workers:
+        await worker.start()
+    await asyncio.sleep(0.1)  # let both workers subscribe
+    await fan_out("redis broker across workers", workers[0], workers[1])
+    for worker in workers:
+        await worker.stop()
+    await stand_in.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,199 @@
+"""Query plan check for the hot read routes.
+
+Seeds a large dataset with generate_series, calls the list and lookup routes,
+captures the SQL they send and runs EXPLAIN on each statement. Exits non-zero
+if any plan falls back to a sequential scan. Run from the backend directory:
+
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.explain [--scale N]
+"""
+import argparse
+import asyncio
+import json
+import sys
+from datetime import date
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import text
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from benchmarks.common import create_bench_engine, count_queries, timed
+from ledger import rebuild_rollups
+from models import User
+from routes.announcements import get_announcements
+from routes.overview import get_property_overview
+from routes.properties import get_rental_properties, get_version
+from routes.responsibilities import get_responsibilities
+from routes.statistics import get_statistics
+from routes.tenant_requests import get_tenant_requests, get_request_resolutions
+from routes.transactions import get_transactions, get_resolved_transactions, get_transaction_resolutions
+from routes.users import get_tenants_for_property
+from response_cache import response_cache, MemoryBackend
+
+LANDLORDS = 500
+PROPERTIES_PER_LANDLORD = 4
+TENANTS_PER_PROPERTY = 2
+ROWS_PER_PROPERTY = 100
+
+# Ids are assigned explicitly so the route arguments below are known up front:
+# landlords are users 1..L, tenants follow, and property p belongs to landlord (p - 1) % L + 1.
+SEED = [
+    """
+    INSERT INTO users (id, name, email, hashed_password, role, invite_code, created_at)
+    SELECT g, 'User ' || g, 'user' || g || '@bench', 'x',
+           CASE WHEN g <= :landlords THEN 'landlord' ELSE 'tenant' END,
+           CASE WHEN g > :landlords THEN lpad(g::text, 10, '0') END,
+           now() - g * interval '1 minute'
+    FROM generate_series(1, :landlords + :properties * :tenants) AS g
+    """,
+    """
+    INSERT INTO rental_properties (id, name, location, landlord_id)
+    SELECT g, 'Property ' || g, 'Bench', (g - 1) % :landlords + 1
+    FROM generate_series(1, :properties) AS g
+    """,
+    """
+    INSERT INTO tenancies (tenant_id, property_id, lease_start, created_at)
+    SELECT :landlords + (p - 1) * :tenants + t, p, now(), now()
+    FROM generate_series(1, :properties) AS p, generate_series(1, :tenants) AS t
+    """,
+    """
+    INSERT INTO transactions (property_id, type, amount, due_date, payee_role, is_visible_to_tenants, created_at)
+    SELECT p, (ARRAY['Rent', 'Water', 'Electricity', 'Repairs'])[1 + r % 4], 10 + r % 2000,
+           date '2020-01-01' + r * 18, CASE WHEN r % 2 = 0 THEN 'landlord' ELSE 'tenant' END,
+           true, now() - r * interval '1 hour'
+    FROM generate_series(1, :properties) AS p, generate_series(1, :rows) AS r
+    """,
+    """
+    INSERT INTO transaction_resolutions (transaction_id, user_id, status, resolved_at)
+    SELECT x.id, :landlords + (x.property_id - 1) * :tenants + t,
+           CASE WHEN (x.id + t) % 10 = 0 THEN 'pending' ELSE 'resolved' END, now()
+    FROM transactions AS x, generate_series(1, :tenants) AS t
+    """,
+    """
+    INSERT INTO tenant_requests (tenant_id, property_id, title, description, request_date, created_at)
+    SELECT :landlords + (p - 1) * :tenants + 1, p, 'Request ' || r, 'Bench request',
+           date '2020-01-01' + r, now() - r * interval '1 hour'
+    FROM generate_series(1, :properties) AS p, generate_series(1, :rows) AS r
+    """,
+    """
+    INSERT INTO request_resolutions (request_id, user_id, status)
+    SELECT q.id, p.landlord_id, CASE WHEN q.id % 10 = 0 THEN 'pending' ELSE 'resolved' END
+    FROM tenant_requests AS q JOIN rental_properties AS p ON p.id = q.property_id
+    """,
+    """
+    INSERT INTO announcements (property_id, title, message, created_at)
+    SELECT p, 'Announcement ' || r, 'Bench announcement', now() - r * interval '1 hour'
+    FROM generate_series(1, :properties) AS p, generate_series(1, :rows) AS r
+    """,
+    """
+    INSERT INTO responsibilities (property_id, title, due_date, created_at)
+    SELECT p, 'Responsibility ' || r, date '2020-01-01' + r, now() - r * interval '1 hour'
+    FROM generate_series(1, :properties) AS p, generate_series(1, :rows) AS r
+    """,
+    """
+    INSERT INTO property_versions (property_id, version, updated_at)
+    SELECT id, 1, now() FROM rental_properties
+    """,
+    "SELECT setval('users_id_seq', (SELECT max(id) FROM users))",
+    "SELECT setval('rental_properties_id_seq', (SELECT max(id) FROM rental_properties))",
+]
+
+
+async def seed(session: AsyncSession, scale: int):
+    params = {
+        "landlords": LANDLORDS * scale,
+        "properties": LANDLORDS * scale * PROPERTIES_PER_LANDLORD,
+        "tenants": TENANTS_PER_PROPERTY,
+        "rows": ROWS_PER_PROPERTY,
+    }
+    for statement in SEED:
+        await session.exec(text(statement).bindparams(**{k: v for k, v in params.items() if f":{k}" in statement}))
+    await session.commit()
+    await rebuild_rollups(session)
+    return params
+
+
+# The read paths a page load goes through, called the way FastAPI would call them
+def hot_routes(landlord: User, tenant: User, property_id: int, first_tenant_id: int):
+    # Plans are checked on the database path, so nothing is served from the response cache
+    response_cache.backend = MemoryBackend(0)
+    request = Request({"type": "http", "path": "/bench", "query_string": b"", "headers": []})
+    page = {"request": request, "response": Response(), "limit": 100, "after": None}
+    return {
+        "landlord properties": lambda s: get_rental_properties(**page, session=s, current_user=landlord),
+        "tenant properties": lambda s: get_rental_properties(**page, session=s, current_user=tenant),
+        "tenants for property": lambda s: get_tenants_for_property(property_id, **page, session=s, current_user=landlord),
+        "transactions": lambda s: get_transactions(
+            property_id, **page, start_date=None, end_date=None, type=None, status=None, session=s, current_user=landlord),
+        "pending transactions": lambda s: get_transactions(
+            property_id, **page, start_date=date(2021, 1, 1), end_date=date(2021, 12, 31), type=None, status="pending",
+            session=s, current_user=landlord),
+        "transaction resolutions": lambda s: get_transaction_resolutions(first_tenant_id, session=s, current_user=landlord),
+        "resolved transactions": lambda s: get_resolved_transactions(session=s, current_user=landlord),
+        "tenant requests": lambda s: get_tenant_requests(
+            property_id, **page, start_date=None, end_date=None, status="pending", session=s, current_user=landlord),
+        "request resolutions": lambda s: get_request_resolutions(first_tenant_id, session=s, current_user=landlord),
+        "announcements": lambda s: get_announcements(
+            property_id, **page, start_date=None, end_date=None, session=s, current_user=landlord),
+        "responsibilities": lambda s: get_responsibilities(
+            property_id, **page, start_date=None, end_date=None, session=s, current_user=landlord),
+        "statistics (rollups)": lambda s: get_statistics(
+            start_date=date(2021, 1, 1), end_date=date(2021, 12, 31), property_id=None, session=s, current_user=landlord),
+        "statistics (raw)": lambda s: get_statistics(
+            start_date=date(2021, 1, 15), end_date=date(2021, 3, 10), property_id=property_id, session=s,
+            current_user=landlord),
+        "property overview": lambda s: get_property_overview(property_id, request, Response(), limit=20, session=s, current_user=landlord),
+        "property version": lambda s: get_version(property_id, session=s, current_user=tenant),
+        "invite code": lambda s: s.exec(select(User).where(User.invite_code == tenant.invite_code, User.role == "tenant")),
+    }
+
+
+def seq_scans(plan: dict):
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from seq_scans(child)
+
+
+async def main(args):
+    engine = await create_bench_engine()
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        with timed("seed"):
+            params = await seed(session, args.scale)
+        await session.exec(text("ANALYZE"))
+        print(f"Seeded {params['properties'] * ROWS_PER_PROPERTY} transactions across {params['properties']} properties")
+
+        landlord = await session.get(User, 1)
+        tenant = await session.get(User, params["landlords"] + 1)
+
+        failures = 0
+        for name, call in hot_routes(landlord, tenant, property_id=1, first_tenant_id=1).items():
+            # Routes answer 404 for an empty page, the statement is still captured
+            with count_queries(engine) as counter:
+                try:
+                    await call(session)
+                except HTTPException:
+                    pass
+            for statement, parameters in zip(counter.statements, counter.parameters):
+                result = await session.connection()
+                plan = (await result.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters)).scalar()
+                plan = plan if isinstance(plan, list) else json.loads(plan)
+                scans = sorted(set(seq_scans(plan[0]["Plan"])))
+                cost = plan[0]["Plan"]["Total Cost"]
+                status = "ok" if not scans else "SEQ SCAN on " + ", ".join(scans)
+                print(f"{name:<26} cost {cost:>10.1f}  {status}")
+                if scans:
+                    failures += 1
+                    if args.verbose:
+                        print(statement)
+    await engine.dispose()
+
+    if failures:
+        print(f"FAIL: {failures} hot queries use a sequential scan")
+        sys.exit(1)
+    print("PASS: every hot query uses an index")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail if a hot route query plans a sequential scan")
+    parser.add_argument("--scale", type=int, default=1, help="Multiply the number of landlords and properties")
+    parser.add_argument("--verbose", action="store_true", help="Print the SQL of failing queries")
+    asyncio.run(main(parser.parse_args()))
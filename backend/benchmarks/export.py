@@ -0,0 +1,67 @@
+"""Memory benchmark for the streaming ledger export.
+
+Streams the landlord's ledger as NDJSON and CSV at two ledger sizes and reports
+rows per second and the tracemalloc peak while streaming. The peak should stay
+about the same at both sizes, since only one batch is held at a time. Run from
+the backend directory:
+
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.export
+"""
+import asyncio
+import time
+import tracemalloc
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+from benchmarks.common import create_bench_engine
+
+SIZES = [20_000, 200_000]
+
+SEED = [
+    "INSERT INTO users (id, name, email, hashed_password, role, created_at) VALUES (1, 'Landlord', 'landlord@bench', 'x', 'landlord', now())",
+    "INSERT INTO rental_properties (id, name, location, landlord_id) VALUES (1, 'Property', 'Bench', 1)",
+]
+
+ADD_TRANSACTIONS = """
+    INSERT INTO transactions (property_id, type, amount, due_date, payee_role, is_visible_to_tenants, created_at)
+    SELECT 1, 'Rent', (500 + g % 1000) / 100.0, date '2020-01-01' + g % 2000, 'landlord', true, now()
+    FROM generate_series(1, :rows) AS g
+"""
+
+
+async def measure(format: str, rows: int):
+    from database import engine
+    from routes.exports import ledger_statement, stream_ledger
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = 0
+    async for chunk in stream_ledger(ledger_statement(1), format):
+        size += len(chunk)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await engine.dispose()
+    print(f"{format:<7} {rows:>8} rows  {rows / elapsed:9.0f} rows/sec  "
+          f"{size / 2**20:6.1f} MiB out  peak {peak / 2**20:5.1f} MiB")
+
+
+async def main():
+    engine = await create_bench_engine()
+    async with AsyncSession(engine) as session:
+        for statement in SEED:
+            await session.exec(text(statement))
+        await session.commit()
+
+    loaded = 0
+    for rows in SIZES:
+        async with AsyncSession(engine) as session:
+            await session.exec(text(ADD_TRANSACTIONS).bindparams(rows=rows - loaded))
+            await session.commit()
+        loaded = rows
+        for format in ("ndjson", "csv"):
+            await measure(format, rows)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
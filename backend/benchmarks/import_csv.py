@@ -0,0 +1,73 @@
+"""Throughput benchmark for the bulk CSV import.
+
+Imports PROPERTIES properties and then TRANSACTIONS transactions spread over
+them, from CSV generated in memory, and reports rows per second for each.
+Checks the rollups maintained during the import match a full rebuild. Run
+from the backend directory:
+
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.import_csv
+"""
+import asyncio
+import io
+import time
+from sqlalchemy import text
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from benchmarks.common import create_bench_engine
+from models import LedgerRollup
+
+PROPERTIES = 1000
+TRANSACTIONS = 100_000
+
+
+def properties_csv():
+    lines = ["name,location,description"]
+    lines += [f"Property {i},Street {i},Imported" for i in range(PROPERTIES)]
+    return io.StringIO("\n".join(lines) + "\n")
+
+
+def transactions_csv():
+    lines = ["property,type,amount,due_date,payee_role,is_visible_to_tenants"]
+    lines += [
+        f"Property {i % PROPERTIES},{('Rent', 'Water', 'Repairs')[i % 3]},{500 + i % 1000}.{i % 100:02d},"
+        f"2024-{1 + i % 12:02d}-{1 + i % 28:02d},{('landlord', 'tenant')[i % 2]},{('true', 'false')[i % 2]}"
+        for i in range(TRANSACTIONS)
+    ]
+    return io.StringIO("\n".join(lines) + "\n")
+
+
+async def rollups(session: AsyncSession):
+    return sorted(tuple(row) for row in (await session.exec(select(LedgerRollup))).all())
+
+
+async def main():
+    engine = await create_bench_engine()
+    from importer import import_csv
+    from ledger import rebuild_rollups
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await session.exec(text(
+            "INSERT INTO users (id, name, email, hashed_password, role, created_at) "
+            "VALUES (1, 'Landlord', 'landlord@bench', 'x', 'landlord', now())"
+        ))
+        await session.commit()
+
+        for kind, make_csv, rows in (("properties", properties_csv, PROPERTIES), ("transactions", transactions_csv, TRANSACTIONS)):
+            lines = make_csv()
+            start = time.perf_counter()
+            report = await import_csv(session, 1, kind, lines)
+            elapsed = time.perf_counter() - start
+            if report.imported != rows or report.failed:
+                raise SystemExit(f"{kind}: imported {report.imported} of {rows}, errors {report.errors[:3]}")
+            print(f"{kind:<13} {rows:>7} rows  {elapsed * 1000:8.1f} ms  {rows / elapsed:9.0f} rows/sec")
+
+        maintained = await rollups(session)
+        await rebuild_rollups(session)
+        if maintained != await rollups(session):
+            raise SystemExit("The rollups kept during the import differ from a rebuild")
+        print(f"rollups match a rebuild ({len(maintained)} rows)")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
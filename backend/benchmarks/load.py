@@ -0,0 +1,211 @@
+"""End-to-end load benchmark replaying the frontend's call patterns.
+
+Seeds a synthetic portfolio (benchmarks.seed), then runs CONCURRENCY virtual
+users against the FastAPI app (in-process, or a running server with --url)
+for DURATION seconds. Each user logs in once (before the timed part) and
+then browses the way the React pages do:
+- the home page lists the properties
+- the property page loads the overview and fetches the tab lists the
+  overview only holds the first page of
+- landlords open the statistics page
+- with probability --writes per visit, landlords add a transaction with its
+  confirmers (as the transaction form does) or an announcement, and tenants
+  resolve a pending transaction or file a request
+
+Reports overall throughput and count, errors and p50/p95/p99 latency per route:
+
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.load --concurrency 50
+
+When benchmarking a running server with --url, start it on BENCH_DATABASE_URL
+after seeding (--seed-only) so both see the same data.
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+from datetime import date
+import httpx
+from sqlmodel.ext.asyncio.session import AsyncSession
+from benchmarks.common import create_bench_engine
+from benchmarks.seed import seed_portfolio, PASSWORD
+
+# Tab lists the property page fetches itself when the overview has more pages
+TAB_ROUTES = {
+    "tenants": "/get-tenants-for-property/{property_id}",
+    "transactions": "/transactions/{property_id}",
+    "responsibilities": "/responsibilities/{property_id}",
+    "announcements": "/announcements/{property_id}",
+    "tenant_requests": "/tenant-request/{property_id}",
+}
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, route: str, seconds: float, ok: bool):
+        self.latencies[route].append(seconds)
+        if not ok:
+            self.errors[route] += 1
+
+
+# Nearest-rank percentile of sorted values
+def percentile(values: list, fraction: float) -> float:
+    return values[min(len(values) - 1, max(0, round(fraction * len(values)) - 1))]
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, user_id: int, role: str, property_ids: list, writes: float):
+        self.client = client
+        self.recorder = recorder
+        self.user_id = user_id
+        self.role = role
+        self.property_ids = property_ids
+        self.writes = writes
+        self.headers = {}
+
+    async def call(self, method: str, route: str, expected=(200,), **kwargs):
+        path = route.format(**kwargs.pop("path_params", {}))
+        start = time.perf_counter()
+        response = await self.client.request(method, path, headers=self.headers, **kwargs)
+        self.recorder.record(f"{method} {route}", time.perf_counter() - start, response.status_code in expected)
+        return response
+
+    async def login(self):
+        # The login queue turns requests away with 503 when it is full; the user tries again
+        while True:
+            response = await self.call("POST", "/token", expected=(200, 503),
+                                       data={"username": f"user{self.user_id}@bench", "password": PASSWORD})
+            if response.status_code == 200:
+                self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+                return
+            await asyncio.sleep(float(response.headers.get("retry-after", "1")))
+
+    async def property_page(self, property_id: int):
+        ids = {"property_id": property_id}
+        overview = (await self.call("GET", "/property/{property_id}/overview", path_params=ids)).json()
+        for section, route in TAB_ROUTES.items():
+            if overview["next_cursors"].get(section):
+                params = {"include": "resolutions"} if section == "transactions" else None
+                await self.call("GET", route, expected=(200, 404), path_params=ids, params=params)
+        return overview
+
+    async def landlord_writes(self, property_id: int, overview: dict):
+        ids = {"property_id": property_id}
+        if random.random() < 0.5:
+            # The transaction form loads the participants, then saves the transaction and its confirmers
+            await self.call("GET", "/get-tenants-for-property/{property_id}", path_params=ids)
+            await self.call("GET", "/users/me")
+            transaction = await self.call("POST", "/add-transaction/{property_id}", path_params=ids, json={
+                "property_id": property_id, "type": "Repairs", "amount": "120.00",
+                "due_date": date.today().isoformat(), "payee_role": "landlord", "is_visible_to_tenants": True,
+            })
+            await self.call("POST", "/add-transaction-resolutions", json={
+                "transaction_id": transaction.json()["id"],
+                "user_ids": [self.user_id] + [tenant["id"] for tenant in overview["tenants"]],
+                "status": "pending",
+            })
+        else:
+            await self.call("POST", "/add-announcement/{property_id}", path_params=ids, json={
+                "property_id": property_id, "title": "Load test", "message": "Water is off on Friday",
+            })
+
+    async def tenant_writes(self, property_id: int, overview: dict):
+        pending = [
+            transaction for transaction in overview["transactions"]
+            if any(r["user_id"] == self.user_id and r["status"] == "pending" for r in transaction["resolutions"] or [])
+        ]
+        if pending and random.random() < 0.7:
+            await self.call("PUT", "/resolve-transaction/{transaction_id}", path_params={"transaction_id": random.choice(pending)["id"]})
+        else:
+            await self.call("POST", "/add-tenant-request/{property_id}", path_params={"property_id": property_id}, json={
+                "property_id": property_id, "title": "Load test", "description": "The heating is off",
+            })
+
+    async def run(self, deadline: float):
+        while time.perf_counter() < deadline:
+            await self.call("GET", "/rental-properties")
+            property_id = random.choice(self.property_ids)
+            overview = await self.property_page(property_id)
+            if self.role == "landlord":
+                await self.call("GET", "/statistics")
+            if random.random() < self.writes:
+                if self.role == "landlord":
+                    await self.landlord_writes(property_id, overview)
+                else:
+                    await self.tenant_writes(property_id, overview)
+
+
+# One in four users is a landlord, spread over the seeded ids (see benchmarks.seed for the layout)
+def virtual_users(count: int, seeded: dict):
+    landlords, properties, tenants = seeded["landlords"], seeded["properties"], seeded["tenants"]
+    users = []
+    for i in range(count):
+        if i % 4 == 0:
+            landlord_id = i // 4 % landlords + 1
+            users.append((landlord_id, "landlord", list(range(landlord_id, properties + 1, landlords))))
+        else:
+            tenant_id = landlords + 1 + (i * 7919) % (properties * tenants)
+            users.append((tenant_id, "tenant", [(tenant_id - landlords - 1) // tenants + 1]))
+    return users
+
+
+def report(recorder: Recorder, elapsed: float):
+    total = sum(len(values) for values in recorder.latencies.values())
+    errors = sum(recorder.errors.values())
+    print(f"{'route':<48} {'count':>7} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for route, values in sorted(recorder.latencies.items(), key=lambda item: -len(item[1])):
+        values.sort()
+        print(f"{route:<48} {len(values):>7} {recorder.errors[route]:>6} {len(values) / elapsed:>8.1f} "
+              + " ".join(f"{percentile(values, fraction) * 1000:>8.1f}" for fraction in (0.5, 0.95, 0.99)))
+    print(f"total: {total} requests ({errors} errors) in {elapsed:.1f} s, {total / elapsed:.1f} requests/sec")
+
+
+async def main(args):
+    engine = await create_bench_engine()
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        seeded = await seed_portfolio(session, args.landlords, args.properties_per_landlord, args.tenants_per_property, args.years)
+    await engine.dispose()
+    if args.seed_only:
+        return
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=60)
+    else:
+        from main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60)
+
+    random.seed(args.random_seed)
+    recorder = Recorder()
+    users = [
+        VirtualUser(client, recorder, user_id, role, property_ids, args.writes)
+        for user_id, role, property_ids in virtual_users(args.concurrency, seeded)
+    ]
+    async with client:
+        # Everyone logs in first, so the slow password checks do not overlap the timed part
+        await asyncio.gather(*(user.login() for user in users))
+        logins = sorted(recorder.latencies.pop("POST /token"))
+        start = time.perf_counter()
+        await asyncio.gather(*(user.run(start + args.duration) for user in users))
+        elapsed = time.perf_counter() - start
+
+    print(f"concurrency: {args.concurrency}, duration: {elapsed:.1f} s")
+    print(f"logins: {len(logins)}, p50 {percentile(logins, 0.5) * 1000:.0f} ms, max {logins[-1] * 1000:.0f} ms")
+    report(recorder, elapsed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="End-to-end load benchmark replaying the frontend's call patterns")
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run for")
+    parser.add_argument("--writes", type=float, default=0.1, help="Chance of a write per property page visit")
+    parser.add_argument("--url", default=None, help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--seed-only", action="store_true", help="Only seed the database")
+    parser.add_argument("--random-seed", type=int, default=1)
+    parser.add_argument("--landlords", type=int, default=20)
+    parser.add_argument("--properties-per-landlord", type=int, default=5)
+    parser.add_argument("--tenants-per-property", type=int, default=2)
+    parser.add_argument("--years", type=int, default=2, help="Years of monthly history per property")
+    asyncio.run(main(parser.parse_args()))
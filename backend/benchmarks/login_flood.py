@@ -0,0 +1,76 @@
+"""Login flood benchmark.
+
+Measures /users/me latency on its own and while a flood of /token logins
+runs, to check that bcrypt work stays off the event loop. Run from the
+backend directory:
+
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.login_flood
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import httpx
+from sqlmodel.ext.asyncio.session import AsyncSession
+from benchmarks.common import create_bench_engine
+from models import User
+from auth import create_access_token, pwd_context
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def probe(client, headers, stop, latencies):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/users/me", headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.005)
+
+
+async def measure(client, headers, seconds, flood=None):
+    latencies = []
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe(client, headers, stop, latencies))
+    statuses = await flood if flood else await asyncio.sleep(seconds)
+    stop.set()
+    await prober
+    return latencies, statuses
+
+
+async def main(args):
+    engine = await create_bench_engine()
+    async with AsyncSession(engine) as session:
+        session.add(User(name="Tenant", email="tenant@bench", hashed_password=pwd_context.hash("password"), role="tenant"))
+        await session.commit()
+    await engine.dispose()
+
+    from main import app
+    headers = {"Authorization": f"Bearer {create_access_token({'email': 'tenant@bench', 'role': 'tenant'})}"}
+    credentials = {"username": "tenant@bench", "password": "password"}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+        idle, _ = await measure(client, headers, seconds=2)
+
+        async def flood():
+            responses = await asyncio.gather(*(client.post("/token", data=credentials) for _ in range(args.logins)))
+            return [response.status_code for response in responses]
+
+        start = time.perf_counter()
+        busy, statuses = await measure(client, headers, seconds=None, flood=flood())
+        elapsed = time.perf_counter() - start
+
+    print(f"logins: {args.logins} in {elapsed:.1f} s, {statuses.count(200)} ok, {statuses.count(503)} rejected (503)")
+    for label, samples in (("idle", idle), ("during flood", busy)):
+        print(
+            f"/users/me {label}: p50 {statistics.median(samples):.1f} ms, "
+            f"p99 {percentile(samples, 0.99):.1f} ms ({len(samples)} requests)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Login flood benchmark")
+    parser.add_argument("--logins", type=int, default=30, help="Concurrent logins in the flood")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,121 @@
+"""Query budget check for the API routes.
+
+Seeds a small portfolio (benchmarks.seed), calls each route once through the
+app and compares the statements it ran with its budget in BUDGETS. Prints the
+query count, rows and database time per route (as sent in the Server-Timing
+header) and the statements a route repeated, and exits non-zero when a route
+goes over its budget. Run from the backend directory:
+
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.query_budget
+
+A budget only holds while the route's query count does not grow with the data;
+a route that loops over rows shows up here as a repeated statement.
+
+The same budgets run as tests (tests/test_query_budget.py) when
+BENCH_DATABASE_URL is set.
+"""
+import asyncio
+import sys
+from datetime import date
+import httpx
+from sqlmodel.ext.asyncio.session import AsyncSession
+from benchmarks.common import create_bench_engine
+from benchmarks.seed import seed_portfolio
+
+LANDLORDS = 2
+PROPERTIES_PER_LANDLORD = 3
+TENANTS_PER_PROPERTY = 5
+
+# Property 1 belongs to landlord 1 and its first tenant is user LANDLORDS + 1 (see benchmarks.seed)
+LANDLORD = 1
+TENANT = LANDLORDS + 1
+TRANSACTION = {
+    "property_id": 1, "type": "Repairs", "amount": "120.00", "due_date": date.today().isoformat(),
+    "payee_role": "landlord", "is_visible_to_tenants": True,
+}
+
+# (user, method, path, body, most statements the route may run); the path may
+# name ids created by earlier calls
+BUDGETS = [
+    (LANDLORD, "GET", "/rental-properties", None, 3),
+    (LANDLORD, "GET", "/property/1/overview", None, 4),
+    (LANDLORD, "GET", "/transactions/1?include=resolutions", None, 4),
+    (LANDLORD, "GET", "/tenant-request/1", None, 3),
+    (LANDLORD, "GET", "/announcements/1", None, 3),
+    (LANDLORD, "GET", "/responsibilities/1", None, 3),
+    (LANDLORD, "GET", "/get-tenants-for-property/1", None, 3),
+    (LANDLORD, "GET", "/statistics", None, 4),
+    (LANDLORD, "GET", "/all-resolved-transactions", None, 2),
+    (LANDLORD, "GET", "/transaction-resolutions/1", None, 2),
+    (TENANT, "GET", "/property/1/overview", None, 4),
+    (TENANT, "GET", "/transactions/1", None, 3),
+    (LANDLORD, "POST", "/add-transaction/1", TRANSACTION, 2),
+    (LANDLORD, "POST", "/add-transaction-resolutions", "resolutions", 5),
+    (TENANT, "PUT", "/resolve-transaction/{transaction}", None, 5),
+    (LANDLORD, "PUT", "/update-transaction/{transaction}", {**TRANSACTION, "amount": "140.00"}, 5),
+    (LANDLORD, "DELETE", "/delete-transaction/{transaction}", None, 4),
+    (TENANT, "POST", "/add-tenant-request/1", {"property_id": 1, "title": "Budget", "description": "Check"}, 6),
+    (TENANT, "DELETE", "/delete-tenant-request/{request}", None, 1),
+    (LANDLORD, "POST", "/add-announcement/1", {"property_id": 1, "title": "Budget", "message": "Check"}, 1),
+    (LANDLORD, "PUT", "/update-announcement/{announcement}", {"property_id": 1, "title": "Budget", "message": "Changed"}, 1),
+    (LANDLORD, "DELETE", "/delete-announcement/{announcement}", None, 1),
+    (LANDLORD, "DELETE", "/delete-transactions/1?end_date=" + date.today().isoformat(), None, 4),
+    (LANDLORD, "DELETE", "/delete-property/3", None, 1),
+]
+
+# Routes whose new id later paths name, and the name they use
+CREATES = {
+    "/add-transaction/1": "transaction",
+    "/add-tenant-request/1": "request",
+    "/add-announcement/1": "announcement",
+}
+
+
+async def seed():
+    engine = await create_bench_engine()
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await seed_portfolio(session, LANDLORDS, PROPERTIES_PER_LANDLORD, TENANTS_PER_PROPERTY, years=1)
+    await engine.dispose()
+
+
+def headers(user_id: int):
+    from auth import create_access_token
+    role = "landlord" if user_id <= LANDLORDS else "tenant"
+    return {"Authorization": f"Bearer {create_access_token({'email': f'user{user_id}@bench', 'role': role})}"}
+
+
+# Call one BUDGETS route, filling its path from and recording new ids in created
+async def call_route(client: httpx.AsyncClient, user_id: int, method: str, path: str, body, created: dict):
+    if body == "resolutions":
+        tenants = range(TENANT, TENANT + TENANTS_PER_PROPERTY)
+        body = {"transaction_id": created["transaction"], "user_ids": [LANDLORD, *tenants], "status": "pending"}
+    response = await client.request(method, path.format(**created), json=body, headers=headers(user_id))
+    if response.is_success and path in CREATES:
+        created[CREATES[path]] = response.json()["id"]
+    return response
+
+
+async def main():
+    await seed()
+    from main import app
+    from query_stats import collect_queries
+
+    created = {}
+    over = 0
+    print(f"{'route':<48} {'status':>6} {'queries':>8} {'budget':>6} {'rows':>6} {'db ms':>7}")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app, raise_app_exceptions=False), base_url="http://bench") as client:
+        for user_id, method, path, body, budget in BUDGETS:
+            with collect_queries() as stats:
+                response = await call_route(client, user_id, method, path, body, created)
+
+            flag = "  OVER BUDGET" if stats.count > budget else ""
+            over += stats.count > budget or response.status_code >= 500
+            print(f"{method + ' ' + path:<48} {response.status_code:>6} {stats.count:>8} {budget:>6} "
+                  f"{stats.rows:>6} {stats.seconds * 1000:>7.1f}{flag}")
+            for statement, count in stats.repeated():
+                print(f"    repeated {count}x: {' '.join(statement.split())[:100]}")
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
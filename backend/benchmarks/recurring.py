@@ -0,0 +1,91 @@
+"""Catch-up benchmark for the recurring transaction scheduler.
+
+Seeds PROPERTIES properties with TENANTS_PER_PROPERTY tenants each and two
+monthly templates per property that started MONTHS months ago, then
+materializes the whole backlog and reports transactions per second. A second
+run must create nothing, and the rollups kept while materializing must match
+a full rebuild. Run from the backend directory:
+
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.recurring
+"""
+import asyncio
+import time
+from datetime import date
+from sqlalchemy import text, func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from benchmarks.common import create_bench_engine
+from models import LedgerRollup, TransactionResolution
+
+PROPERTIES = 2000
+TENANTS_PER_PROPERTY = 2
+MONTHS = 24
+TODAY = date(2026, 1, 15)
+
+SEED = [
+    """
+    INSERT INTO users (id, name, email, hashed_password, role, created_at)
+    SELECT g, 'User ' || g, 'user' || g || '@bench', 'x', CASE WHEN g = 1 THEN 'landlord' ELSE 'tenant' END, now()
+    FROM generate_series(1, 1 + :properties * :tenants) AS g
+    """,
+    """
+    INSERT INTO rental_properties (id, name, location, landlord_id)
+    SELECT g, 'Property ' || g, 'Bench', 1 FROM generate_series(1, :properties) AS g
+    """,
+    """
+    INSERT INTO tenancies (tenant_id, property_id, lease_start, created_at)
+    SELECT 1 + (p - 1) * :tenants + t, p, timestamp '2020-01-01', now()
+    FROM generate_series(1, :properties) AS p, generate_series(1, :tenants) AS t
+    """,
+    """
+    INSERT INTO recurring_transactions
+        (property_id, type, amount, payee_role, is_visible_to_tenants, start_date, occurrences, next_due_date, created_at)
+    SELECT p, kind, CASE kind WHEN 'Rent' THEN 900 ELSE 45.50 END, 'tenant', true,
+           :start, 0, :start, now()
+    FROM generate_series(1, :properties) AS p, unnest(ARRAY['Rent', 'Water']) AS kind
+    """,
+]
+
+
+async def rollups(session: AsyncSession):
+    return sorted(tuple(row) for row in (await session.exec(select(LedgerRollup))).all())
+
+
+async def main():
+    engine = await create_bench_engine()
+    from ledger import rebuild_rollups
+    from recurring import materialize_due
+
+    start = date(TODAY.year - MONTHS // 12, TODAY.month, 1)
+    parameters = {"properties": PROPERTIES, "tenants": TENANTS_PER_PROPERTY, "start": start}
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        for statement in SEED:
+            statement = text(statement)
+            await session.exec(statement.bindparams(**{name: parameters[name] for name in statement.compile().params}))
+        await session.commit()
+
+        began = time.perf_counter()
+        created = await materialize_due(session, TODAY)
+        elapsed = time.perf_counter() - began
+        resolutions = (await session.exec(select(func.count(TransactionResolution.id)))).one()
+        print(f"first run: {len(created)} transactions, {resolutions} resolutions in {elapsed * 1000:.0f} ms "
+              f"({len(created) / elapsed:.0f} transactions/sec)")
+        expected = PROPERTIES * 2 * (MONTHS + 1)
+        if len(created) != expected or resolutions != expected * (1 + TENANTS_PER_PROPERTY):
+            raise SystemExit(f"expected {expected} transactions with {1 + TENANTS_PER_PROPERTY} resolutions each")
+
+        again = await materialize_due(session, TODAY)
+        print(f"second run: {len(again)} transactions")
+        if again:
+            raise SystemExit("materializing twice created duplicates")
+
+        maintained = await rollups(session)
+        await rebuild_rollups(session)
+        if maintained != await rollups(session):
+            raise SystemExit("The rollups kept while materializing differ from a rebuild")
+        print(f"rollups match a rebuild ({len(maintained)} rows)")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
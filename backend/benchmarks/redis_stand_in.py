@@ -0,0 +1,92 @@
+import asyncio
+import time
+from fnmatch import fnmatchcase
+from redis_client import encode_command
+
+
+class RedisStandIn:
+    """Just enough of a Redis server (GET, SET with EX, DEL, SCAN, FLUSHDB, PING, PUBLISH, PSUBSCRIBE)
+    to exercise the RESP client in benchmarks and tests without installing Redis."""
+
+    def __init__(self):
+        self.data = {}
+        # Keys set with EX, with the time.monotonic() after which they are gone
+        self.expires = {}
+        self.subscribers = []
+        self.handlers = set()
+        self.server = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        for _, writer in self.subscribers:
+            writer.close()
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+        await self.server.wait_closed()
+
+    async def read_command(self, reader):
+        header = await reader.readline()
+        if not header:
+            return None
+        args = []
+        for _ in range(int(header[1:])):
+            length = int((await reader.readline())[1:])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    # Drop keys whose EX has passed, which Redis does lazily on access too
+    def expire(self):
+        now = time.monotonic()
+        for key in [key for key, deadline in self.expires.items() if deadline <= now]:
+            del self.expires[key]
+            self.data.pop(key, None)
+
+    async def handle(self, reader, writer):
+        self.handlers.add(asyncio.current_task())
+        while (args := await self.read_command(reader)) is not None:
+            command = args[0].upper()
+            self.expire()
+            if command == b"GET":
+                value = self.data.get(args[1])
+                writer.write(b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value))
+            elif command == b"SET":
+                self.data[args[1]] = args[2]
+                self.expires.pop(args[1], None)
+                if len(args) > 4 and args[3].upper() == b"EX":
+                    self.expires[args[1]] = time.monotonic() + int(args[4])
+                writer.write(b"+OK\r\n")
+            elif command == b"DEL":
+                deleted = [key for key in args[1:] if self.data.pop(key, None) is not None]
+                writer.write(b":%d\r\n" % len(deleted))
+            elif command == b"SCAN":
+                # Everything in one step: cursor 0 and every key matching the MATCH pattern
+                options = {args[i].upper(): args[i + 1] for i in range(2, len(args) - 1, 2)}
+                pattern = options.get(b"MATCH", b"*").decode()
+                keys = [key for key in self.data if fnmatchcase(key.decode(), pattern)]
+                writer.write(b"*2\r\n$1\r\n0\r\n" + encode_command(*keys))
+            elif command == b"FLUSHDB":
+                self.data.clear()
+                self.expires.clear()
+                writer.write(b"+OK\r\n")
+            elif command == b"PING":
+                writer.write(b"+PONG\r\n")
+            elif command == b"PSUBSCRIBE":
+                self.subscribers.append((args[1], writer))
+                writer.write(b"*3\r\n$10\r\npsubscribe\r\n$%d\r\n%s\r\n:1\r\n" % (len(args[1]), args[1]))
+            elif command == b"PUBLISH":
+                receivers = [
+                    (pattern, subscriber) for pattern, subscriber in self.subscribers
+                    if fnmatchcase(args[1].decode(), pattern.decode()) and not subscriber.is_closing()
+                ]
+                # Pushed messages have the same shape as a command: pmessage, pattern, channel, payload
+                for pattern, subscriber in receivers:
+                    subscriber.write(encode_command("pmessage", pattern, args[1], args[2]))
+                writer.write(b":%d\r\n" % len(receivers))
+            else:
+                writer.write(b"-ERR unknown command\r\n")
+            await writer.drain()
+        self.subscribers = [(pattern, subscriber) for pattern, subscriber in self.subscribers if subscriber is not writer]
+        writer.close()
@@ -0,0 +1,86 @@
+"""Regression benchmark for /all-resolved-transactions.
+
+Seeds a landlord with 10k transactions and counts the SQL round-trips the
+endpoint makes. Run from the backend directory:
+
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.resolved_transactions
+"""
+import asyncio
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from sqlmodel.ext.asyncio.session import AsyncSession
+from benchmarks.common import create_bench_engine, count_queries, timed
+from models import User, RentalProperty, Transaction, TransactionResolution
+from routes.transactions import get_resolved_transactions
+
+TRANSACTIONS = 10_000
+PROPERTIES = 20
+TENANTS_PER_PROPERTY = 2
+QUERY_BUDGET = 1
+
+
+async def seed(session: AsyncSession) -> int:
+    landlord = User(name="Landlord", email="landlord@bench", hashed_password="x", role="landlord")
+    session.add(landlord)
+    await session.commit()
+    await session.refresh(landlord)
+
+    tenants = [
+        User(name=f"Tenant {i}", email=f"tenant{i}@bench", hashed_password="x", role="tenant")
+        for i in range(PROPERTIES * TENANTS_PER_PROPERTY)
+    ]
+    properties = [
+        RentalProperty(name=f"Property {i}", location="Bench", landlord_id=landlord.id)
+        for i in range(PROPERTIES)
+    ]
+    session.add_all(tenants + properties)
+    await session.commit()
+
+    random.seed(0)
+    transactions = [
+        Transaction(
+            property_id=properties[i % PROPERTIES].id,
+            type=random.choice(["Rent", "Water", "Electricity", "Repairs"]),
+            amount=Decimal(random.randint(10, 2000)),
+            due_date=date(2020, 1, 1) + timedelta(days=i % 1800),
+            payee_role=random.choice(["landlord", "tenant"]),
+        )
+        for i in range(TRANSACTIONS)
+    ]
+    session.add_all(transactions)
+    await session.commit()
+
+    resolutions = []
+    for i, transaction in enumerate(transactions):
+        offset = (i % PROPERTIES) * TENANTS_PER_PROPERTY
+        for tenant in tenants[offset:offset + TENANTS_PER_PROPERTY]:
+            resolutions.append(TransactionResolution(
+                transaction_id=transaction.id,
+                user_id=tenant.id,
+                status="resolved" if random.random() < 0.8 else "pending",
+            ))
+    session.add_all(resolutions)
+    await session.commit()
+    return landlord.id
+
+
+async def main():
+    engine = await create_bench_engine()
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        landlord_id = await seed(session)
+
+    async with AsyncSession(engine) as session:
+        landlord = await session.get(User, landlord_id)
+        with count_queries(engine) as counter, timed("get_resolved_transactions"):
+            result = await get_resolved_transactions(session=session, current_user=landlord)
+    await engine.dispose()
+
+    print(f"transactions: {TRANSACTIONS}, fully resolved: {len(result)}")
+    print(f"SQL round-trips: {counter.count} (budget {QUERY_BUDGET})")
+    if counter.count > QUERY_BUDGET:
+        raise SystemExit("Query budget exceeded")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
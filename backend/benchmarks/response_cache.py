@@ -0,0 +1,94 @@
+"""Benchmark for the property-scoped response cache.
+
+Runs the cached list endpoints cold and warm against the in-process LRU and
+against the Redis backend talking to a small local stand-in server, checks
+that warm responses are byte-identical and that a write is visible on the
+next read. Run from the backend directory:
+
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.response_cache
+"""
+import asyncio
+import time
+import httpx
+from sqlmodel.ext.asyncio.session import AsyncSession
+from benchmarks.common import create_bench_engine, count_queries
+from benchmarks.seed import seed_portfolio
+from benchmarks.redis_stand_in import RedisStandIn
+from auth import create_access_token
+from response_cache import response_cache, response_cache_hits, response_cache_misses, MemoryBackend, RedisBackend
+
+ROUNDS = 20
+
+
+def hit_count():
+    return sum(response_cache_hits._values.values()), sum(response_cache_misses._values.values())
+
+
+async def run(client, engine, paths, headers, landlord_headers, property_id):
+    await response_cache.clear()
+    with count_queries(engine) as cold:
+        first = [await client.get(path, headers=headers) for path in paths]
+
+    hits_before, misses_before = hit_count()
+    start = time.perf_counter()
+    with count_queries(engine) as warm:
+        for _ in range(ROUNDS):
+            for path, expected in zip(paths, first):
+                response = await client.get(path, headers=headers)
+                if response.content != expected.content or response.headers.get("etag") != expected.headers.get("etag"):
+                    raise SystemExit(f"Cached response differs for {path}")
+    elapsed = time.perf_counter() - start
+    hits, misses = hit_count()
+
+    # A write bumps the version, so the next read is rebuilt and shows it
+    await client.post(f"/add-announcement/{property_id}", json={"title": "Fresh", "message": "Bench"}, headers=landlord_headers)
+    announcements = await client.get(f"/announcements/{property_id}", params={"limit": 500}, headers=headers)
+    if not any(item["title"] == "Fresh" for item in announcements.json()):
+        raise SystemExit("Write not visible after invalidation")
+
+    requests = ROUNDS * len(paths)
+    print(f"  cold: {cold.count / len(paths):.2f} queries/request")
+    print(f"  warm: {warm.count / requests:.2f} queries/request, {requests / elapsed:.0f} requests/sec")
+    print(f"  hit ratio: {(hits - hits_before) / ((hits - hits_before) + (misses - misses_before)):.2%}")
+
+
+async def main():
+    bench_engine = await create_bench_engine()
+    # One landlord with ten properties, each with four years of monthly history
+    async with AsyncSession(bench_engine, expire_on_commit=False) as session:
+        seeded = await seed_portfolio(session, landlords=1, properties_per_landlord=10, tenants_per_property=1, years=4)
+    await bench_engine.dispose()
+    property_ids = list(range(1, seeded["properties"] + 1))
+
+    from main import app
+    from database import engine
+
+    # The landlord owns all ten properties, so one login reads and writes them all
+    landlord_headers = {"Authorization": f"Bearer {create_access_token({'email': 'user1@bench', 'role': 'landlord'})}"}
+    headers = landlord_headers
+    paths = []
+    for property_id in property_ids:
+        paths += [
+            f"/announcements/{property_id}",
+            f"/responsibilities/{property_id}",
+            f"/transactions/{property_id}?include=resolutions",
+            f"/get-tenants-for-property/{property_id}",
+        ]
+
+    stand_in = RedisStandIn()
+    port = await stand_in.start()
+    backends = {
+        "memory": MemoryBackend(32 * 1024 * 1024),
+        "redis stand-in": RedisBackend(f"redis://127.0.0.1:{port}/0", ttl=300),
+    }
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for name, backend in backends.items():
+            response_cache.backend = backend
+            print(name)
+            await run(client, engine, paths, headers, landlord_headers, property_ids[0])
+    await backends["redis stand-in"].close()
+    await stand_in.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,158 @@
+"""Synthetic portfolio generator.
+
+Fills the scratch database with landlords, their properties, tenants and
+tenancies, and YEARS of monthly history per property: rent and utility
+transactions (plus occasional repairs) with a resolution for the landlord and
+each tenant, tenant requests, announcements and responsibilities. Older
+transactions are mostly resolved and recent ones pending, as in real use. The
+rows are generated inside PostgreSQL with generate_series, so even large
+portfolios load in seconds, and the ledger rollups and property versions are
+rebuilt at the end.
+
+Ids follow a fixed layout so callers can address the data without querying:
+landlords are users 1..L, property p belongs to landlord (p - 1) % L + 1, and
+its tenants are users L + (p - 1) * T + 1 .. L + p * T. Every user's email is
+user<id>@bench and their password is PASSWORD. Run from the backend directory:
+
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.seed --landlords 100 --years 3
+"""
+import argparse
+import asyncio
+import time
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+from benchmarks.common import create_bench_engine
+
+PASSWORD = "bench-password"
+
+# Each statement uses the parameters it names; :months is the history length
+SEED = [
+    """
+    INSERT INTO users (id, name, email, hashed_password, role, invite_code, created_at)
+    SELECT g, CASE WHEN g <= :landlords THEN 'Landlord ' ELSE 'Tenant ' END || g, 'user' || g || '@bench', :password_hash,
+           CASE WHEN g <= :landlords THEN 'landlord' ELSE 'tenant' END,
+           CASE WHEN g > :landlords THEN lpad(g::text, 10, '0') END,
+           now() - interval '1 month' * :months
+    FROM generate_series(1, :landlords + :properties * :tenants) AS g
+    """,
+    """
+    INSERT INTO rental_properties (id, name, location, landlord_id, description)
+    SELECT g, 'Property ' || g, (ARRAY['Riverside', 'Old Town', 'Harbour', 'Hillcrest', 'Market Square'])[1 + g % 5],
+           (g - 1) % :landlords + 1, CASE WHEN g % 3 = 0 THEN 'Furnished flat' END
+    FROM generate_series(1, :properties) AS g
+    """,
+    """
+    INSERT INTO tenancies (tenant_id, property_id, lease_start, created_at)
+    SELECT :landlords + (p - 1) * :tenants + t, p, date_trunc('month', now()) - interval '1 month' * :months, now()
+    FROM generate_series(1, :properties) AS p, generate_series(1, :tenants) AS t
+    """,
+    # Rent and utilities every month, repairs every fourth month (hidden from tenants half of the time)
+    """
+    INSERT INTO transactions (property_id, type, amount, due_date, payee_role, is_visible_to_tenants, created_at)
+    SELECT p, kind.type,
+           CASE kind.type WHEN 'Rent' THEN 600 + p % 20 * 25 WHEN 'Repairs' THEN 80 + (p * m) % 400
+                          ELSE 30 + (p + m) % 50 + (p + m) % 100 / 100.0 END,
+           (date_trunc('month', now()) - interval '1 month' * (:months - m))::date + kind.day,
+           kind.payee_role, kind.type <> 'Repairs' OR (p + m) % 8 = 0,
+           date_trunc('month', now()) - interval '1 month' * (:months - m) - interval '10 days'
+    FROM generate_series(1, :properties) AS p, generate_series(0, :months - 1) AS m,
+         (VALUES ('Rent', 0, 'tenant'), ('Water', 14, 'tenant'), ('Electricity', 19, 'tenant'), ('Repairs', 9, 'landlord'))
+             AS kind (type, day, payee_role)
+    WHERE kind.type <> 'Repairs' OR (p + m) % 4 = 0
+    """,
+    # The landlord and every tenant confirm each transaction the tenants can see; the last two months are still open
+    """
+    INSERT INTO transaction_resolutions (transaction_id, user_id, status, resolved_at)
+    SELECT x.id, u.user_id,
+           CASE WHEN x.due_date < now() - interval '2 months' AND (x.id + u.user_id) % 50 <> 0 THEN 'resolved' ELSE 'pending' END,
+           CASE WHEN x.due_date < now() - interval '2 months' AND (x.id + u.user_id) % 50 <> 0 THEN x.due_date + 3 END
+    FROM transactions AS x
+    JOIN rental_properties AS r ON r.id = x.property_id
+    CROSS JOIN LATERAL (
+        SELECT r.landlord_id AS user_id
+        UNION ALL
+        SELECT :landlords + (x.property_id - 1) * :tenants + t FROM generate_series(1, :tenants) AS t
+        WHERE x.is_visible_to_tenants
+    ) AS u
+    """,
+    """
+    INSERT INTO tenant_requests (tenant_id, property_id, title, description, request_date, created_at)
+    SELECT :landlords + (p - 1) * :tenants + 1 + m % :tenants, p,
+           (ARRAY['Leaking tap', 'Broken heating', 'Noisy neighbours', 'Mould in bathroom'])[1 + (p + m) % 4],
+           'Please have a look', (now() - interval '1 month' * (:months - m))::date,
+           now() - interval '1 month' * (:months - m)
+    FROM generate_series(1, :properties) AS p, generate_series(0, :months - 1, 3) AS m
+    """,
+    """
+    INSERT INTO request_resolutions (request_id, user_id, status, resolved_at)
+    SELECT q.id, p.landlord_id,
+           CASE WHEN q.request_date < now() - interval '1 month' THEN 'resolved' ELSE 'pending' END,
+           CASE WHEN q.request_date < now() - interval '1 month' THEN q.created_at + interval '5 days' END
+    FROM tenant_requests AS q JOIN rental_properties AS p ON p.id = q.property_id
+    """,
+    """
+    INSERT INTO announcements (property_id, title, message, created_at)
+    SELECT p, 'Notice for ' || to_char(now() - interval '1 month' * (:months - m), 'Mon YYYY'),
+           'Bins are collected on Tuesdays.', now() - interval '1 month' * (:months - m)
+    FROM generate_series(1, :properties) AS p, generate_series(0, :months - 1) AS m
+    """,
+    """
+    INSERT INTO responsibilities (property_id, title, description, due_date, created_at)
+    SELECT p, (ARRAY['Mow the lawn', 'Clean the gutters', 'Test smoke alarms'])[1 + r % 3], NULL,
+           (now() + interval '1 week' * r)::date, now() - interval '1 day' * r
+    FROM generate_series(1, :properties) AS p, generate_series(1, 3) AS r
+    """,
+    """
+    INSERT INTO property_versions (property_id, version, updated_at)
+    SELECT id, 1, now() FROM rental_properties
+    """,
+    "SELECT setval('users_id_seq', (SELECT max(id) FROM users))",
+    "SELECT setval('rental_properties_id_seq', (SELECT max(id) FROM rental_properties))",
+]
+
+
+async def seed_portfolio(session: AsyncSession, landlords: int = 20, properties_per_landlord: int = 5,
+                         tenants_per_property: int = 2, years: int = 2):
+    from auth import hash_password
+    from ledger import rebuild_rollups
+
+    params = {
+        "landlords": landlords,
+        "properties": landlords * properties_per_landlord,
+        "tenants": tenants_per_property,
+        "months": years * 12,
+        "password_hash": await hash_password(PASSWORD),
+    }
+    for statement in SEED:
+        statement = text(statement)
+        await session.exec(statement.bindparams(**{name: params[name] for name in statement.compile().params}))
+    await session.commit()
+    await rebuild_rollups(session)
+    return params
+
+
+async def count_rows(session: AsyncSession):
+    tables = ["users", "rental_properties", "tenancies", "transactions", "transaction_resolutions",
+              "tenant_requests", "request_resolutions", "announcements", "responsibilities", "ledger_rollups"]
+    return {table: (await session.exec(text(f"SELECT count(*) FROM {table}"))).one()[0] for table in tables}
+
+
+async def main(args):
+    engine = await create_bench_engine()
+    start = time.perf_counter()
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await seed_portfolio(session, args.landlords, args.properties_per_landlord, args.tenants_per_property, args.years)
+        counts = await count_rows(session)
+    await engine.dispose()
+    for table, count in counts.items():
+        print(f"{table:<24} {count:>10}")
+    print(f"seeded in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill the benchmark database with a synthetic portfolio")
+    parser.add_argument("--landlords", type=int, default=20)
+    parser.add_argument("--properties-per-landlord", type=int, default=5)
+    parser.add_argument("--tenants-per-property", type=int, default=2)
+    parser.add_argument("--years", type=int, default=2, help="Years of monthly history per property")
+    asyncio.run(main(parser.parse_args()))
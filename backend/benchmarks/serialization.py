@@ -0,0 +1,83 @@
+"""Serialization micro-benchmark for large list responses.
+
+Loads ROWS transactions once, then encodes them the way FastAPI does for
+response_model=List[TransactionRead] (validate every object, jsonable
+conversion, json.dumps) and the way the fast path does (column rows straight
+to orjson). Reports time and peak memory of each and checks both produce the
+same bytes. Run from the backend directory:
+
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.serialization
+"""
+import asyncio
+import time
+import tracemalloc
+from typing import List
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy import text
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from benchmarks.common import create_bench_engine
+from models import Transaction, TransactionRead
+from fast_json import columns, dump_rows
+
+ROWS = 10_000
+RUNS = 5
+
+SEED = [
+    "INSERT INTO users (id, name, email, hashed_password, role, created_at) VALUES (1, 'Landlord', 'landlord@bench', 'x', 'landlord', now())",
+    "INSERT INTO rental_properties (id, name, location, landlord_id) VALUES (1, 'Property', 'Bench', 1)",
+    """
+    INSERT INTO transactions (property_id, type, amount, due_date, payee_role, is_visible_to_tenants, created_at)
+    SELECT 1, 'Rent', (500 + g % 1000) / 100.0, date '2020-01-01' + g % 2000, 'landlord', true,
+           now() - g * interval '1 minute'
+    FROM generate_series(1, :rows) AS g
+    """,
+]
+
+
+async def response_model_path(objects):
+    field = create_model_field("Response_get_transactions", List[TransactionRead], mode="serialization")
+    content = await serialize_response(field=field, response_content=objects)
+    return JSONResponse(content).body
+
+
+async def fast_path(rows):
+    return dump_rows([dict(row._mapping, resolutions=None) for row in rows])
+
+
+async def measure(name, encode, data):
+    best = float("inf")
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        body = await encode(data)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    await encode(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<16} {best * 1000:8.1f} ms  {ROWS / best:10.0f} rows/sec  peak {peak / 2**20:6.1f} MiB")
+    return body, best
+
+
+async def main():
+    engine = await create_bench_engine()
+    async with AsyncSession(engine) as session:
+        for statement in SEED:
+            await session.exec(text(statement).bindparams(**({"rows": ROWS} if ":rows" in statement else {})))
+        await session.commit()
+        order = [Transaction.created_at, Transaction.id]
+        objects = (await session.exec(select(Transaction).order_by(*order))).all()
+        rows = (await session.exec(select(*columns(Transaction)).order_by(*order))).all()
+    await engine.dispose()
+
+    expected, slow = await measure("response_model", response_model_path, objects)
+    body, fast = await measure("orjson rows", fast_path, rows)
+    print(f"speed-up: {slow / fast:.1f}x, {len(body) / 2**20:.1f} MiB of JSON")
+    if body != expected:
+        raise SystemExit("The fast path does not produce the same JSON")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
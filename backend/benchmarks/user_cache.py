@@ -0,0 +1,49 @@
+"""Benchmark for the authenticated-user cache.
+
+Counts the SQL statements each authenticated request to /users/me makes,
+cold and warm. Run from the backend directory:
+
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.user_cache
+"""
+import asyncio
+import time
+import httpx
+from sqlmodel.ext.asyncio.session import AsyncSession
+from benchmarks.common import create_bench_engine, count_queries
+from models import User
+from auth import create_access_token, user_cache, user_cache_hits, user_cache_misses
+
+REQUESTS = 1000
+
+
+async def main():
+    bench_engine = await create_bench_engine()
+    async with AsyncSession(bench_engine) as session:
+        session.add(User(name="Tenant", email="tenant@bench", hashed_password="x", role="tenant"))
+        await session.commit()
+    await bench_engine.dispose()
+
+    from main import app
+    from database import engine
+
+    headers = {"Authorization": f"Bearer {create_access_token({'email': 'tenant@bench', 'role': 'tenant'})}"}
+    user_cache.clear()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        with count_queries(engine) as cold:
+            await client.get("/users/me", headers=headers)
+
+        start = time.perf_counter()
+        with count_queries(engine) as warm:
+            for _ in range(REQUESTS):
+                await client.get("/users/me", headers=headers)
+        elapsed = time.perf_counter() - start
+
+    print(f"cold request: {cold.count} queries")
+    print(f"warm requests: {warm.count / REQUESTS:.2f} queries/request, {REQUESTS / elapsed:.0f} requests/sec")
+    print(f"cache hits: {user_cache_hits.value()}, misses: {user_cache_misses.value()}")
+    if warm.count:
+        raise SystemExit("Warm requests still query the users table")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,39 @@
+import asyncio
+import os
+import httpx
+import pytest
+import query_stats
+
+# Tests run from the backend directory. Tests that call the app run against the
+# scratch database of the benchmarks (BENCH_DATABASE_URL, whose tables are
+# dropped and recreated) and are skipped without it.
+
+
+# One event loop for the session, so the app's connection pool can be reused
+# between tests; run() executes a coroutine on it in the caller's context
+@pytest.fixture(scope="session")
+def run():
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+# Client for the app on a seeded portfolio (see benchmarks.query_budget for its layout)
+@pytest.fixture(scope="session")
+def bench_client(run):
+    if not os.getenv("BENCH_DATABASE_URL"):
+        pytest.skip("Set BENCH_DATABASE_URL to a scratch PostgreSQL database")
+    from benchmarks.query_budget import seed
+    run(seed())
+
+    from main import app
+    from database import engine
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app, raise_app_exceptions=False), base_url="http://test")
+    yield client
+    run(client.aclose())
+    run(engine.dispose())
+
+# query_budget(n): a block that fails the test when it runs more than n
+# statements, listing them; yields the QueryStats of the block
+@pytest.fixture
+def query_budget():
+    return query_stats.query_budget
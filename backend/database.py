@@ -1,17 +1,63 @@
-from sqlmodel import Session, create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from dotenv import load_dotenv
+from metrics import Counter, Gauge, Histogram
+from query_stats import instrument
 import os
+import time
 
 load_dotenv()
 
 # Database connection URL
 DATABASE_URL = os.getenv("DATABASE_URL")
-print(f"Connecting to database at {DATABASE_URL}")
 
-# Create the engine
-engine = create_engine(DATABASE_URL)
+# Connection pool settings
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# Run plain postgresql:// URLs through the asyncpg driver
+def async_database_url(url: str):
+    url = make_url(url)
+    if url.drivername in ("postgresql", "postgresql+psycopg2"):
+        url = url.set(drivername="postgresql+asyncpg")
+    return url
+
+# Create the async engine
+engine = create_async_engine(
+    async_database_url(DATABASE_URL),
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+)
+
+# Count queries, rows and database time per request (see query_stats.py)
+instrument(engine)
+
+# Pool metrics, read from the pool when /metrics is scraped
+Gauge("db_pool_size", "Configured number of pooled connections", function=lambda: engine.pool.size())
+Gauge("db_pool_checked_out", "Connections currently checked out of the pool", function=lambda: engine.pool.checkedout())
+Gauge("db_pool_idle", "Idle connections waiting in the pool", function=lambda: engine.pool.checkedin())
+Gauge("db_pool_overflow", "Connections open beyond pool_size", function=lambda: max(engine.pool.overflow(), 0))
+pool_wait_seconds = Histogram("db_pool_wait_seconds", "Time spent waiting for a pooled connection")
+pool_timeouts = Counter("db_pool_timeouts_total", "Requests that gave up waiting for a pooled connection")
 
 # Dependency to get the database session
-def get_session():
-    with Session(engine) as session:
-        yield session
\ No newline at end of file
+async def get_session():
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        # Check out the connection up front to measure the pool wait
+        start = time.perf_counter()
+        try:
+            await session.connection()
+        except PoolTimeoutError:
+            pool_timeouts.inc()
+            raise
+        finally:
+            pool_wait_seconds.observe(time.perf_counter() - start)
+        yield session
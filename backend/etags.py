@@ -0,0 +1,74 @@
+import hashlib
+from fastapi import Request, Response
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from models import PropertyVersion, RentalProperty
+
+# Conditional GET: read routes send a strong ETag and answer a matching
+# If-None-Match with 304 Not Modified. Every write to a property's data bumps
+# its version (see versions.py), so a property-scoped response is identified by
+# that version, the caller's role and the request's path and query: checking
+# it is one primary key lookup, and no rows are read or hashed. The version is
+# read before the rows, so a tag is never newer than the body it is sent with.
+
+# Let browsers keep responses but revalidate them on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(digest: str) -> str:
+    return f'"{digest}"'
+
+# If-None-Match uses the weak comparison, so W/ prefixes are ignored
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+def set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+# Set the validator on the response, or return the 304 to send instead of the body
+def conditional_response(request: Request, response: Response, etag: str):
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return None
+
+# Path and sorted query string: what selects the response besides the data and the caller
+def request_key(request: Request) -> str:
+    query = "&".join(sorted(f"{name}={value}" for name, value in request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+# ETag of a response built from data at the given version(s)
+def version_etag(request: Request, role: str, version) -> str:
+    return make_etag(hashlib.md5(f"{version}:{role}:{request_key(request)}".encode()).hexdigest())
+
+# Check the request against the current version of the property the route reads;
+# a property without a version (or that does not exist) gets no ETag
+async def check_property_etag(request: Request, response: Response, session: AsyncSession, property_id: int, role: str):
+    statement = select(PropertyVersion.version).where(PropertyVersion.property_id == property_id)
+    version = (await session.exec(statement)).first()
+    if version is None:
+        return None
+    return conditional_response(request, response, version_etag(request, role, version))
+
+# Check the request against the versions of the properties on a page of
+# properties; only the page's ids are selected
+async def check_properties_etag(request: Request, response: Response, session: AsyncSession, page, role: str):
+    ids = page.with_only_columns(RentalProperty.id).subquery()
+    entry = func.concat(ids.c.id, ":", func.coalesce(PropertyVersion.version, 0))
+    statement = (
+        select(func.coalesce(func.string_agg(entry, aggregate_order_by(literal_column("','"), ids.c.id)), ""))
+        .select_from(ids)
+        .outerjoin(PropertyVersion, PropertyVersion.property_id == ids.c.id)
+    )
+    versions = (await session.exec(statement)).one()
+    return conditional_response(request, response, version_etag(request, role, versions))
@@ -0,0 +1,141 @@
+import asyncio
+import json
+import os
+from fastapi.encoders import jsonable_encoder
+from metrics import Counter, Gauge
+from redis_client import RedisClient, RedisError, CONNECTION_ERRORS
+
+# Change events pushed to clients watching a property over /ws/property/{id}.
+# Write routes publish after their commit, so an event never announces data a
+# reader cannot see yet. Events carry the changed row (a delta), so clients
+# update their lists in place instead of downloading them again.
+#
+# Publishing goes through a broker. The local broker delivers straight to this
+# worker's sockets; with EVENTS_BROKER_URL=redis://host:port/db every worker
+# publishes to Redis and receives every event back through one subscription,
+# so a client sees writes handled by any worker.
+
+EVENTS_BROKER_URL = os.getenv("EVENTS_BROKER_URL")
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+CHANNEL_PREFIX = "property-events:"
+
+events_published = Counter("property_events_published_total", "Property change events published", ("type",))
+events_dropped_subscribers = Counter("property_events_dropped_subscribers_total", "Sockets closed for falling too far behind")
+events_broker_errors = Counter("property_events_broker_errors_total", "Event broker calls that failed")
+
+
+class Subscriber:
+    def __init__(self, property_id: int, role: str):
+        self.property_id = property_id
+        self.role = role
+        # None in the queue means the socket fell behind and must resync
+        self.queue = asyncio.Queue(maxsize=EVENTS_QUEUE_SIZE)
+
+    def deliver(self, event: dict, message: str):
+        if event["audience"] not in ("all", self.role):
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            events_dropped_subscribers.inc()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class LocalBroker:
+    """Delivers events to the sockets of this process only."""
+
+    def __init__(self):
+        self.deliver = None
+
+    async def start(self, deliver):
+        self.deliver = deliver
+
+    async def publish(self, property_id: int, message: str):
+        if self.deliver:
+            self.deliver(property_id, message)
+
+    async def stop(self):
+        pass
+
+
+class RedisBroker:
+    """Fans events out across workers through Redis pub/sub."""
+
+    def __init__(self, url: str):
+        self.client = RedisClient(url)
+        self.listener = None
+
+    async def start(self, deliver):
+        self.listener = asyncio.create_task(self.listen(deliver))
+
+    async def listen(self, deliver):
+        while True:
+            try:
+                async for channel, message in self.client.psubscribe(CHANNEL_PREFIX + "*"):
+                    deliver(int(channel.removeprefix(CHANNEL_PREFIX)), message.decode())
+            except (*CONNECTION_ERRORS, RedisError):
+                events_broker_errors.inc()
+                await asyncio.sleep(1)
+
+    async def publish(self, property_id: int, message: str):
+        await self.client.execute("PUBLISH", f"{CHANNEL_PREFIX}{property_id}", message)
+
+    async def stop(self):
+        if self.listener:
+            self.listener.cancel()
+            await asyncio.gather(self.listener, return_exceptions=True)
+        await self.client.close()
+
+
+class PropertyEvents:
+    def __init__(self, broker):
+        self.broker = broker
+        self.subscribers = {}
+
+    async def start(self):
+        await self.broker.start(self.deliver)
+
+    async def stop(self):
+        await self.broker.stop()
+
+    def subscribe(self, property_id: int, role: str) -> Subscriber:
+        subscriber = Subscriber(property_id, role)
+        self.subscribers.setdefault(property_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        subscribers = self.subscribers.get(subscriber.property_id, set())
+        subscribers.discard(subscriber)
+        if not subscribers:
+            self.subscribers.pop(subscriber.property_id, None)
+
+    # Hand a message from the broker to every socket watching the property
+    def deliver(self, property_id: int, message: str):
+        subscribers = self.subscribers.get(property_id)
+        if not subscribers:
+            return
+        event = json.loads(message)
+        for subscriber in list(subscribers):
+            subscriber.deliver(event, message)
+
+    # Publish a change; audience is "all", "landlord" or "tenant"
+    async def publish(self, property_id: int, type: str, data, audience: str = "all"):
+        message = json.dumps({
+            "type": type,
+            "property_id": property_id,
+            "audience": audience,
+            "data": jsonable_encoder(data),
+        })
+        events_published.inc(type=type)
+        try:
+            await self.broker.publish(property_id, message)
+        except (*CONNECTION_ERRORS, RedisError):
+            # The write is committed; clients catch up when they next load the list
+            events_broker_errors.inc()
+
+
+property_events = PropertyEvents(RedisBroker(EVENTS_BROKER_URL) if EVENTS_BROKER_URL else LocalBroker())
+Gauge("property_events_subscribers", "Open property event sockets in this worker",
+      function=lambda: sum(len(subscribers) for subscribers in property_events.subscribers.values()))
@@ -0,0 +1,256 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+from datetime import datetime, date
+from decimal import Decimal
+from itertools import islice
+from typing import Literal, Optional
+import asyncpg
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models import RentalProperty, Tenancy, Transaction, User
+from versions import bump_property_version
+from events import property_events
+from ledger import add_new_transactions
+
+# Bulk import of properties, tenancies and transactions from CSV, used when
+# onboarding a landlord. The file is read row by row and handled in chunks:
+# each chunk is validated, written with COPY (or a batched INSERT when the new
+# ids are needed) and committed on its own, so memory stays flat and a
+# failure only loses its own chunk. Invalid rows are skipped and reported
+# with their line number. Parsing and validating a chunk runs in a worker
+# thread, so a large file does not hold up the event loop, and every chunk
+# bumps the versions of the properties it wrote to before it commits.
+#
+# Transactions and tenancies name their property in a "property" column,
+# matched against the names of the landlord's properties.
+
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "10000"))
+MAX_REPORTED_ERRORS = 1000
+
+
+class PropertyRow(BaseModel):
+    name: str
+    location: str
+    description: Optional[str] = None
+
+class TenancyRow(BaseModel):
+    property: str
+    invite_code: str
+    lease_start: Optional[datetime] = None
+    lease_end: Optional[datetime] = None
+
+class TransactionRow(BaseModel):
+    property: str
+    type: str = Field(max_length=100)
+    amount: Decimal
+    due_date: date
+    payee_role: Literal["tenant", "landlord"]
+    is_visible_to_tenants: bool = True
+
+
+class ImportReport:
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+        self.property_ids = set()
+
+    def error(self, line: int, *messages: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "errors": list(messages)})
+
+    def as_dict(self):
+        return {
+            "kind": self.kind,
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+# Errors that reject a chunk: statements run through SQLAlchemy raise DBAPIError,
+# COPY on the driver connection raises asyncpg's own errors unwrapped
+CHUNK_ERRORS = (DBAPIError, asyncpg.PostgresError)
+
+# Write rows with COPY on the session's connection, inside its transaction
+async def copy_rows(session: AsyncSession, table, columns: list, records: list):
+    if not records:
+        return
+    connection = await (await session.connection()).get_raw_connection()
+    await connection.driver_connection.copy_records_to_table(table.__tablename__, records=records, columns=columns)
+
+# Ids of the landlord's properties by name; names used twice map to None
+async def property_ids_by_name(session: AsyncSession, landlord_id: int):
+    statement = select(RentalProperty.name, RentalProperty.id).where(RentalProperty.landlord_id == landlord_id)
+    ids = {}
+    for name, property_id in (await session.exec(statement)).all():
+        ids[name] = None if name in ids else property_id
+    return ids
+
+def _resolve_property(report: ImportReport, properties: dict, line: int, name: str):
+    if name not in properties:
+        report.error(line, f"property: no property named {name!r}")
+    elif properties[name] is None:
+        report.error(line, f"property: several properties are named {name!r}")
+    else:
+        return properties[name]
+
+
+async def _import_properties(session: AsyncSession, landlord_id: int, rows: list, report: ImportReport, context: dict):
+    # The new ids are needed to start their versions, so this one is an INSERT ... RETURNING
+    statement = insert(RentalProperty).returning(RentalProperty.id)
+    values = [{**row.model_dump(), "landlord_id": landlord_id} for line, row in rows]
+    property_ids = (await session.exec(statement, params=values)).scalars().all()
+    return len(property_ids), property_ids
+
+async def _import_tenancies(session: AsyncSession, landlord_id: int, rows: list, report: ImportReport, context: dict):
+    properties = context["properties"]
+    statement = select(User.invite_code, User.id).where(
+        User.invite_code.in_({row.invite_code for line, row in rows}),
+        User.role == "tenant"
+    )
+    tenants = dict((await session.exec(statement)).all())
+
+    # Skip tenants already on the property, including earlier rows of the file
+    statement = select(Tenancy.tenant_id, Tenancy.property_id).where(
+        Tenancy.tenant_id.in_(tenants.values()),
+        Tenancy.property_id.in_({id for id in properties.values() if id})
+    )
+    # A new set rather than the context's, so a chunk that is rolled back leaves no pairs behind
+    existing = context["tenancies"] = context.get("tenancies", set()) | set((await session.exec(statement)).all())
+
+    records = []
+    property_ids = []
+    now = datetime.utcnow()
+    for line, row in rows:
+        property_id = _resolve_property(report, properties, line, row.property)
+        if not property_id:
+            continue
+        tenant_id = tenants.get(row.invite_code)
+        if not tenant_id:
+            report.error(line, "invite_code: tenant with the given invite code not found")
+            continue
+        if (tenant_id, property_id) in existing:
+            report.error(line, "invite_code: tenant is already associated with this property")
+            continue
+        existing.add((tenant_id, property_id))
+        records.append((tenant_id, property_id, row.lease_start or now, row.lease_end, now))
+        property_ids.append(property_id)
+
+    await copy_rows(session, Tenancy, ["tenant_id", "property_id", "lease_start", "lease_end", "created_at"], records)
+    return len(records), property_ids
+
+async def _import_transactions(session: AsyncSession, landlord_id: int, rows: list, report: ImportReport, context: dict):
+    properties = context["properties"]
+    transactions = []
+    now = datetime.utcnow()
+    for line, row in rows:
+        property_id = _resolve_property(report, properties, line, row.property)
+        if property_id:
+            transactions.append({
+                **row.model_dump(exclude={"property"}),
+                "property_id": property_id,
+                "landlord_id": landlord_id,
+                "created_at": now,
+            })
+
+    columns = ["property_id", "type", "amount", "due_date", "payee_role", "is_visible_to_tenants", "created_at"]
+    await copy_rows(session, Transaction, columns, [tuple(t[column] for column in columns) for t in transactions])
+    await add_new_transactions(session, transactions)
+    return len(transactions), [t["property_id"] for t in transactions]
+
+IMPORTERS = {
+    "properties": (PropertyRow, _import_properties),
+    "tenancies": (TenancyRow, _import_tenancies),
+    "transactions": (TransactionRow, _import_transactions),
+}
+
+
+# Read and validate up to IMPORT_CHUNK_SIZE records; returns how many were read and the valid rows
+def _parse_chunk(reader: csv.DictReader, row_model, report: ImportReport):
+    rows = []
+    read = 0
+    for record in islice(reader, IMPORT_CHUNK_SIZE):
+        read += 1
+        # Empty cells count as not given
+        values = {name: value for name, value in record.items() if name and value not in ("", None)}
+        try:
+            rows.append((reader.line_num, row_model.model_validate(values)))
+        except ValidationError as e:
+            report.error(reader.line_num, *(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            ))
+    return read, rows
+
+
+# Import CSV text lines (a file object or any iterable of lines) for a landlord
+async def import_csv(session: AsyncSession, landlord_id: int, kind: str, lines) -> ImportReport:
+    if kind not in IMPORTERS:
+        raise ValueError(f"Unknown import kind {kind!r}, expected one of {', '.join(IMPORTERS)}")
+    row_model, write_chunk = IMPORTERS[kind]
+
+    reader = csv.DictReader(lines)
+    required = [name for name, field in row_model.model_fields.items() if field.is_required()]
+    missing = [name for name in required if name not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"CSV is missing the columns: {', '.join(missing)}")
+
+    report = ImportReport(kind)
+    context = {"properties": await property_ids_by_name(session, landlord_id)}
+    while True:
+        read, rows = await asyncio.to_thread(_parse_chunk, reader, row_model, report)
+        if not read:
+            break
+        if not rows:
+            continue
+
+        failed, errors = report.failed, len(report.errors)
+        # Writers replace context entries; the copy is kept only once the chunk commits
+        chunk_context = dict(context)
+        try:
+            imported, property_ids = await write_chunk(session, landlord_id, rows, report, chunk_context)
+            # Readers and caches compare versions, so the chunk's properties are bumped with it
+            if property_ids:
+                await bump_property_version(session, select(RentalProperty.id).where(RentalProperty.id.in_(set(property_ids))))
+            await session.commit()
+        except CHUNK_ERRORS as e:
+            # Report every row of the chunk, instead of the errors found before it failed
+            await session.rollback()
+            report.failed, report.errors = failed, report.errors[:errors]
+            for line, row in rows:
+                report.error(line, f"not imported, its chunk was rolled back: {getattr(e, 'orig', e)}")
+            continue
+        context = chunk_context
+        report.imported += imported
+        report.property_ids.update(property_ids)
+
+    # One event per property rather than one per row; clients reload their lists
+    for property_id in report.property_ids:
+        await property_events.publish(property_id, "property.reload", {"reason": "import", "kind": kind})
+    return report
+
+
+async def _main(args):
+    from database import engine
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        with open(args.file, newline="", encoding="utf-8-sig") as lines:
+            report = await import_csv(session, args.landlord_id, args.kind, lines)
+    await engine.dispose()
+    print(json.dumps(report.as_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import properties, tenancies or transactions from a CSV file")
+    parser.add_argument("kind", choices=list(IMPORTERS))
+    parser.add_argument("file", help="CSV file with a header row")
+    parser.add_argument("--landlord-id", type=int, required=True, help="Landlord the rows are imported for")
+    asyncio.run(_main(parser.parse_args()))
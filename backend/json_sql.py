@@ -0,0 +1,33 @@
+from sqlmodel import select
+from sqlalchemy import func, cast, literal_column, Text
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from models import User
+
+# Helpers that let PostgreSQL render rows as JSON text, so a whole page can be
+# returned by the database without loading ORM objects.
+
+
+# JSON array of a statement's rows, ordered by the given columns ('[]' when empty)
+def json_rows(statement, order_by, descending: bool = False):
+    rows = statement.subquery()
+    keys = [rows.c[column.key].desc() if descending else rows.c[column.key] for column in order_by]
+    aggregate = func.json_agg(aggregate_order_by(rows.table_valued(), *keys))
+    return cast(select(func.coalesce(aggregate, literal_column("'[]'::json"))).scalar_subquery(), Text)
+
+# Resolutions of the outer row with the user's name and role, as a JSON array
+def json_resolutions(resolution, parent_key: str, parent_id):
+    detail = func.json_build_object(
+        "resolution_id", resolution.id,
+        parent_key, getattr(resolution, parent_key),
+        "user_id", resolution.user_id,
+        "status", resolution.status,
+        "resolved_at", resolution.resolved_at,
+        "user_name", User.name,
+        "user_role", User.role,
+    )
+    return (
+        select(func.coalesce(func.json_agg(aggregate_order_by(detail, resolution.id)), literal_column("'[]'::json")))
+        .join(User, resolution.user_id == User.id)
+        .where(getattr(resolution, parent_key) == parent_id)
+        .scalar_subquery()
+    )
@@ -0,0 +1,289 @@
+import argparse
+import asyncio
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy import func, case, delete, and_, literal, Date
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models import Transaction, TransactionResolution, RentalProperty, LedgerRollup
+
+# Month bucket used by every statistics series
+month_column = func.date_trunc("month", Transaction.due_date).label("month")
+
+# Columns identifying a row of the ledger_rollups table
+ROLLUP_KEY = ["landlord_id", "property_id", "month", "type", "payee_role"]
+
+
+# Condition that a transaction has resolutions and none of them is still pending.
+# Correlated per transaction, so it is answered from the resolution indexes.
+def transaction_fully_resolved():
+    resolutions = select(TransactionResolution.id).where(TransactionResolution.transaction_id == Transaction.id)
+    return and_(
+        resolutions.exists(),
+        ~resolutions.where(TransactionResolution.status == "pending").exists(),
+    )
+
+# Restrict a transactions statement to the landlord's fully resolved transactions
+def _filter_resolved(
+    statement,
+    landlord_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    property_id: Optional[int] = None,
+):
+    statement = (
+        statement
+        .join(RentalProperty, RentalProperty.id == Transaction.property_id)
+        .where(RentalProperty.landlord_id == landlord_id)
+        .where(transaction_fully_resolved())
+    )
+    if start_date:
+        statement = statement.where(Transaction.due_date >= start_date)
+    if end_date:
+        statement = statement.where(Transaction.due_date <= end_date)
+    if property_id:
+        statement = statement.where(Transaction.property_id == property_id)
+    return statement
+
+# All fully resolved transactions across the properties of a landlord, in one query
+def resolved_transactions_for_landlord(landlord_id: int):
+    return _filter_resolved(select(Transaction), landlord_id)
+
+# Sum and count of the landlord's resolved transactions, grouped by the given columns
+def resolved_totals(landlord_id: int, *columns, **filters):
+    statement = select(
+        *columns,
+        func.sum(Transaction.amount).label("total"),
+        func.count(Transaction.id).label("count"),
+    )
+    statement = _filter_resolved(statement, landlord_id, **filters)
+    return statement.group_by(*columns).order_by(*columns)
+
+# Same totals read from the monthly rollups, costing O(months) instead of O(transactions)
+def rollup_totals(
+    landlord_id: int,
+    *columns,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    property_id: Optional[int] = None,
+):
+    statement = (
+        select(
+            *columns,
+            func.sum(LedgerRollup.resolved_total).label("total"),
+            func.sum(LedgerRollup.resolved_count).label("count"),
+        )
+        .where(LedgerRollup.landlord_id == landlord_id)
+        .where(LedgerRollup.resolved_count > 0)
+    )
+    if start_date:
+        statement = statement.where(LedgerRollup.month >= start_date)
+    if end_date:
+        statement = statement.where(LedgerRollup.month <= end_date)
+    if property_id:
+        statement = statement.where(LedgerRollup.property_id == property_id)
+    return statement.group_by(*columns).order_by(*columns)
+
+def _month_aligned(start_date: Optional[date], end_date: Optional[date]) -> bool:
+    if start_date and start_date.day != 1:
+        return False
+    if end_date and (end_date + timedelta(days=1)).day != 1:
+        return False
+    return True
+
+# Totals grouped by the given keys ("month", "type", "payee_role", "property_id").
+# Whole-month ranges are served from the rollups, other ranges from the raw transactions.
+def statistics_totals(landlord_id: int, keys: list, **filters):
+    if _month_aligned(filters.get("start_date"), filters.get("end_date")):
+        columns = [getattr(LedgerRollup, key) for key in keys]
+        return rollup_totals(landlord_id, *columns, **filters)
+    columns = [month_column if key == "month" else getattr(Transaction, key) for key in keys]
+    return resolved_totals(landlord_id, *columns, **filters)
+
+
+# Rollup key, amount and resolved flag of a transaction, or None if it does not exist.
+# Locks the transaction row so concurrent writers update its rollup one at a time.
+async def rollup_snapshot(session: AsyncSession, transaction_id: int):
+    open_resolutions = (
+        select(func.count(TransactionResolution.id))
+        .where(TransactionResolution.transaction_id == Transaction.id)
+        .where(TransactionResolution.status != "resolved")
+        .scalar_subquery()
+    )
+    all_resolutions = (
+        select(func.count(TransactionResolution.id))
+        .where(TransactionResolution.transaction_id == Transaction.id)
+        .scalar_subquery()
+    )
+    statement = (
+        select(
+            RentalProperty.landlord_id,
+            Transaction.property_id,
+            Transaction.due_date,
+            Transaction.type,
+            Transaction.payee_role,
+            Transaction.amount,
+            open_resolutions.label("open_resolutions"),
+            all_resolutions.label("all_resolutions"),
+        )
+        .join(RentalProperty, RentalProperty.id == Transaction.property_id)
+        .where(Transaction.id == transaction_id)
+        .with_for_update(of=Transaction)
+    )
+    row = (await session.exec(statement)).first()
+    if not row:
+        return None
+    return snapshot_of(row.landlord_id, row, row.all_resolutions > 0 and row.open_resolutions == 0)
+
+# Snapshot of a transaction (or a row with its columns) whose resolved flag is already known
+def snapshot_of(landlord_id: int, transaction, resolved: bool):
+    key = {
+        "landlord_id": landlord_id,
+        "property_id": transaction.property_id,
+        "month": transaction.due_date.replace(day=1),
+        "type": transaction.type,
+        "payee_role": transaction.payee_role,
+    }
+    return key, transaction.amount, resolved
+
+async def _add_to_rollup(session: AsyncSession, key: dict, amount: Decimal, resolved: bool, sign: int):
+    values = {
+        "total": sign * amount,
+        "transaction_count": sign,
+        "resolved_total": sign * amount if resolved else 0,
+        "resolved_count": sign if resolved else 0,
+    }
+    statement = insert(LedgerRollup).values(**key, **values)
+    statement = statement.on_conflict_do_update(
+        index_elements=ROLLUP_KEY,
+        set_={column: getattr(LedgerRollup, column) + statement.excluded[column] for column in values},
+    )
+    await session.exec(statement)
+
+    # Drop rows that no longer hold any transaction
+    if sign < 0:
+        await session.exec(
+            delete(LedgerRollup)
+            .where(*(getattr(LedgerRollup, column) == value for column, value in key.items()))
+            .where(LedgerRollup.transaction_count == 0)
+        )
+
+# Apply the difference between two snapshots of a transaction to the rollups
+async def update_rollup(session: AsyncSession, before, after):
+    if before == after:
+        return
+    if before:
+        await _add_to_rollup(session, *before, sign=-1)
+    if after:
+        await _add_to_rollup(session, *after, sign=1)
+
+
+ROLLUP_VALUES = ["total", "transaction_count", "resolved_total", "resolved_count"]
+
+# Add per-key deltas (rollup key tuple -> one value per ROLLUP_VALUES column) with one upsert
+async def _add_rollup_deltas(session: AsyncSession, deltas: dict):
+    # The groups go in as one array per column, unnested into rows: a single
+    # round-trip and statement however many groups the batch touches
+    values = {column: [] for column in ROLLUP_KEY + ROLLUP_VALUES}
+    for key, delta in deltas.items():
+        for column, value in zip(ROLLUP_KEY + ROLLUP_VALUES, key + tuple(delta)):
+            values[column].append(value)
+    rows = select(*(
+        func.unnest(literal(column_values, ARRAY(LedgerRollup.__table__.c[column].type))).label(column)
+        for column, column_values in values.items()
+    ))
+    statement = insert(LedgerRollup).from_select(list(values), rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=ROLLUP_KEY,
+        set_={column: getattr(LedgerRollup, column) + statement.excluded[column] for column in ROLLUP_VALUES},
+    )
+    await session.exec(statement)
+
+# Per-key deltas of a batch of transactions (dicts that also carry the property's
+# landlord_id and, unless new, whether they were resolved), added with the given sign
+def _rollup_deltas(transactions: list, sign: int):
+    deltas = {}
+    for transaction in transactions:
+        key = (transaction["landlord_id"], transaction["property_id"], transaction["due_date"].replace(day=1),
+               transaction["type"], transaction["payee_role"])
+        amount = sign * transaction["amount"]
+        resolved = transaction.get("resolved", False)
+        total, count, resolved_total, resolved_count = deltas.get(key, (0, 0, 0, 0))
+        deltas[key] = (total + amount, count + sign,
+                       resolved_total + (amount if resolved else 0), resolved_count + (sign if resolved else 0))
+    return deltas
+
+# Count a batch of new, still unresolved transactions with one upsert
+async def add_new_transactions(session: AsyncSession, transactions: list):
+    if transactions:
+        await _add_rollup_deltas(session, _rollup_deltas(transactions, 1))
+
+# Take a batch of deleted transactions out of the rollups, dropping rows left empty
+async def remove_transactions(session: AsyncSession, transactions: list):
+    if not transactions:
+        return
+    await _add_rollup_deltas(session, _rollup_deltas(transactions, -1))
+    await session.exec(
+        delete(LedgerRollup)
+        .where(LedgerRollup.property_id.in_({transaction["property_id"] for transaction in transactions}))
+        .where(LedgerRollup.transaction_count == 0)
+    )
+
+
+# Recompute the rollups in bulk from the transactions, for one landlord or everyone
+async def rebuild_rollups(session: AsyncSession, landlord_id: Optional[int] = None):
+    resolution_state = (
+        select(
+            TransactionResolution.transaction_id,
+            (func.count(case((TransactionResolution.status != "resolved", 1))) == 0).label("resolved"),
+        )
+        .group_by(TransactionResolution.transaction_id)
+        .subquery()
+    )
+    is_resolved = func.coalesce(resolution_state.c.resolved, False)
+    month = func.date_trunc("month", Transaction.due_date).cast(Date)
+    group_columns = [RentalProperty.landlord_id, Transaction.property_id, month, Transaction.type, Transaction.payee_role]
+
+    aggregate = (
+        select(
+            *group_columns,
+            func.sum(Transaction.amount),
+            func.count(Transaction.id),
+            func.coalesce(func.sum(Transaction.amount).filter(is_resolved), 0),
+            func.count(Transaction.id).filter(is_resolved),
+        )
+        .join(RentalProperty, RentalProperty.id == Transaction.property_id)
+        .outerjoin(resolution_state, resolution_state.c.transaction_id == Transaction.id)
+        .group_by(*group_columns)
+    )
+    clear = delete(LedgerRollup)
+    if landlord_id is not None:
+        aggregate = aggregate.where(RentalProperty.landlord_id == landlord_id)
+        clear = clear.where(LedgerRollup.landlord_id == landlord_id)
+
+    await session.exec(clear)
+    await session.exec(
+        insert(LedgerRollup).from_select(
+            ROLLUP_KEY + ["total", "transaction_count", "resolved_total", "resolved_count"],
+            aggregate,
+        )
+    )
+    await session.commit()
+
+
+async def _main(args):
+    # The ledger_rollups table is created by the migrations (alembic upgrade head)
+    from database import engine
+    async with AsyncSession(engine) as session:
+        await rebuild_rollups(session, args.landlord_id)
+    await engine.dispose()
+    print("Ledger rollups rebuilt")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the monthly ledger rollups")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--landlord-id", type=int, default=None, help="Only rebuild this landlord's rollups")
+    asyncio.run(_main(parser.parse_args()))
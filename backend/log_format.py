@@ -0,0 +1,32 @@
+import json
+import logging
+import os
+from datetime import datetime, timezone
+
+# Application logs go to stderr as one JSON object per line, so they can be
+# shipped and queried without parsing free text. Modules log through
+# logging.getLogger(__name__) and pass structured data as extra={"fields": {...}}.
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **getattr(record, "fields", {}),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level: str = LOG_LEVEL):
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter())
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level)
@@ -1,7 +1,18 @@
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routes import properties, users, transactions, responsibilities, announcements, tenant_requests
+from routes import properties, users, transactions, responsibilities, announcements, tenant_requests, statistics, overview, metrics, live, exports, imports, recurring_transactions
 from database import engine
+from events import property_events
+from recurring import recurring_scheduler, RECURRING_SCHEDULER_ENABLED
+from pagination import NEXT_CURSOR_HEADER
+from query_stats import QueryStatsMiddleware
+from metrics import RequestMetricsMiddleware
+from log_format import configure_logging
+
+# JSON log lines on stderr (LOG_LEVEL sets the level)
+configure_logging()
+logger = logging.getLogger(__name__)
 
 # Create the FastAPI app
 app = FastAPI()
@@ -12,13 +23,39 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
-try:
-    with engine.connect() as connection:
-        print("Connection successful!")
-except Exception as e:
-    print(f"Failed to connect: {e}")
+# Server-Timing header with each request's query count, rows and database time
+app.add_middleware(QueryStatsMiddleware)
+
+# Per-route request counts, latency histograms and errors, scraped from /metrics
+app.add_middleware(RequestMetricsMiddleware)
+
+@app.on_event("startup")
+async def check_database_connection():
+    try:
+        async with engine.connect():
+            logger.info("Connected to the database", extra={"fields": {"database": engine.url.render_as_string(hide_password=True)}})
+    except Exception:
+        logger.exception("Failed to connect to the database")
+
+@app.on_event("startup")
+async def start_property_events():
+    await property_events.start()
+
+@app.on_event("shutdown")
+async def stop_property_events():
+    await property_events.stop()
+
+@app.on_event("startup")
+async def start_recurring_scheduler():
+    if RECURRING_SCHEDULER_ENABLED:
+        await recurring_scheduler.start()
+
+@app.on_event("shutdown")
+async def stop_recurring_scheduler():
+    await recurring_scheduler.stop()
 
 # Include all routers
 app.include_router(properties.router)
@@ -27,4 +64,11 @@ app.include_router(transactions.router)
 app.include_router(responsibilities.router)
 app.include_router(announcements.router)
 app.include_router(tenant_requests.router)
+app.include_router(statistics.router)
+app.include_router(overview.router)
+app.include_router(metrics.router)
+app.include_router(live.router)
+app.include_router(exports.router)
+app.include_router(imports.router)
+app.include_router(recurring_transactions.router)
 
@@ -0,0 +1,147 @@
+import time
+from typing import Callable, Optional
+
+# Minimal Prometheus-style metrics rendered in the text exposition format.
+# Metrics are only updated from the event loop thread, so plain arithmetic is enough.
+
+REGISTRY = []
+
+
+def _format_labels(labelnames, values, extra: Optional[dict] = None):
+    pairs = list(zip(labelnames, values)) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        REGISTRY.append(self)
+
+    def _key(self, labels: dict):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        for key, value in self._values.items():
+            yield self.name, _format_labels(self.labelnames, key), value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines += [f"{name}{labels} {value}" for name, labels, value in self.samples()]
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    # A gauge either holds set/inc/dec values or reads its value from a callback at scrape time
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), function: Optional[Callable] = None):
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def samples(self):
+        if self.function:
+            yield self.name, "", self.function()
+        else:
+            yield from super().samples()
+
+
+class Histogram(Metric):
+    type = "histogram"
+    DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        if key not in self._values:
+            self._values[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+        series = self._values[key]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series["buckets"][i] += 1
+        series["sum"] += value
+        series["count"] += 1
+
+    def samples(self):
+        for key, series in self._values.items():
+            for bound, count in zip(self.buckets, series["buckets"]):
+                yield f"{self.name}_bucket", _format_labels(self.labelnames, key, {"le": bound}), count
+            yield f"{self.name}_bucket", _format_labels(self.labelnames, key, {"le": "+Inf"}), series["count"]
+            yield f"{self.name}_sum", _format_labels(self.labelnames, key), series["sum"]
+            yield f"{self.name}_count", _format_labels(self.labelnames, key), series["count"]
+
+
+def render_metrics() -> str:
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+http_requests = Counter("http_requests_total", "HTTP requests handled", ("method", "route", "status"))
+http_request_seconds = Histogram("http_request_duration_seconds", "Time to handle an HTTP request, body included", ("method", "route"))
+http_requests_in_flight = Gauge("http_requests_in_flight", "HTTP requests currently being handled")
+http_request_errors = Counter("http_request_errors_total", "HTTP requests that failed with a 5xx status or an exception", ("method", "route"))
+
+
+class RequestMetricsMiddleware:
+    """Counts and times each HTTP request under its route template.
+
+    Requests no route matched share the "unmatched" label, so probing random
+    paths cannot grow the number of series."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            method = scope["method"]
+            route = getattr(scope.get("route"), "path", "unmatched")
+            http_request_seconds.observe(time.perf_counter() - start, method=method, route=route)
+            http_requests.inc(method=method, route=route, status=status)
+            if status >= 500:
+                http_request_errors.inc(method=method, route=route)
@@ -0,0 +1,50 @@
+"""route indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 21:13:59.320002
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_announcements_property_id_created_at', 'announcements', ['property_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_rental_properties_landlord_id', 'rental_properties', ['landlord_id', 'id'], unique=False)
+    op.create_index('ix_request_resolutions_pending', 'request_resolutions', ['request_id'], unique=False, postgresql_where=sa.text("status = 'pending'"))
+    op.create_index('ix_request_resolutions_request_id_user_id', 'request_resolutions', ['request_id', 'user_id'], unique=False)
+    op.create_index('ix_responsibilities_property_id_created_at', 'responsibilities', ['property_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_tenancies_property_id_tenant_id', 'tenancies', ['property_id', 'tenant_id'], unique=False)
+    op.create_index('ix_tenancies_tenant_id_property_id', 'tenancies', ['tenant_id', 'property_id'], unique=False)
+    op.create_index('ix_tenant_requests_property_id_created_at', 'tenant_requests', ['property_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_tenant_requests_tenant_id', 'tenant_requests', ['tenant_id'], unique=False)
+    op.create_index('ix_transaction_resolutions_pending', 'transaction_resolutions', ['transaction_id'], unique=False, postgresql_where=sa.text("status = 'pending'"))
+    op.create_index('ix_transaction_resolutions_transaction_id_user_id', 'transaction_resolutions', ['transaction_id', 'user_id'], unique=False)
+    op.create_index('ix_transactions_property_id_created_at', 'transactions', ['property_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_transactions_property_id_due_date', 'transactions', ['property_id', 'due_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_property_id_due_date', table_name='transactions')
+    op.drop_index('ix_transactions_property_id_created_at', table_name='transactions')
+    op.drop_index('ix_transaction_resolutions_transaction_id_user_id', table_name='transaction_resolutions')
+    op.drop_index('ix_transaction_resolutions_pending', table_name='transaction_resolutions', postgresql_where=sa.text("status = 'pending'"))
+    op.drop_index('ix_tenant_requests_tenant_id', table_name='tenant_requests')
+    op.drop_index('ix_tenant_requests_property_id_created_at', table_name='tenant_requests')
+    op.drop_index('ix_tenancies_tenant_id_property_id', table_name='tenancies')
+    op.drop_index('ix_tenancies_property_id_tenant_id', table_name='tenancies')
+    op.drop_index('ix_responsibilities_property_id_created_at', table_name='responsibilities')
+    op.drop_index('ix_request_resolutions_request_id_user_id', table_name='request_resolutions')
+    op.drop_index('ix_request_resolutions_pending', table_name='request_resolutions', postgresql_where=sa.text("status = 'pending'"))
+    op.drop_index('ix_rental_properties_landlord_id', table_name='rental_properties')
+    op.drop_index('ix_announcements_property_id_created_at', table_name='announcements')
@@ -0,0 +1,48 @@
+"""cascade property deletes
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 22:06:09.866377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Foreign keys recreated with an ON DELETE action, under their existing names
+FOREIGN_KEYS = [
+    ('announcements', 'property_id', 'rental_properties', 'CASCADE'),
+    ('ledger_rollups', 'property_id', 'rental_properties', 'CASCADE'),
+    ('recurring_transactions', 'property_id', 'rental_properties', 'CASCADE'),
+    ('request_resolutions', 'request_id', 'tenant_requests', 'CASCADE'),
+    ('responsibilities', 'property_id', 'rental_properties', 'CASCADE'),
+    ('tenancies', 'property_id', 'rental_properties', 'CASCADE'),
+    ('tenant_requests', 'property_id', 'rental_properties', 'CASCADE'),
+    ('transaction_resolutions', 'transaction_id', 'transactions', 'CASCADE'),
+    ('transactions', 'property_id', 'rental_properties', 'CASCADE'),
+    ('transactions', 'recurring_id', 'recurring_transactions', 'SET NULL'),
+]
+
+
+def upgrade() -> None:
+    op.create_index('ix_ledger_rollups_property_id', 'ledger_rollups', ['property_id'], unique=False)
+    for table, column, referent, ondelete in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referent, [column], ['id'], ondelete=ondelete)
+
+
+def downgrade() -> None:
+    for table, column, referent, ondelete in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referent, [column], ['id'])
+    op.drop_index('ix_ledger_rollups_property_id', table_name='ledger_rollups')
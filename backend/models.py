@@ -1,14 +1,36 @@
 from datetime import datetime, date
 from sqlmodel import SQLModel, Field
-from sqlalchemy import CheckConstraint
-from typing import Optional
+from sqlalchemy import CheckConstraint, Index, UniqueConstraint, text
+from typing import List, Optional
 from decimal import Decimal
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from fastapi.exceptions import RequestValidationError
 
 
-# Define the SQLModel for the rental_properties table
+# Table models are not validated when FastAPI parses them from a request body,
+# so dates and decimals arrive as strings. asyncpg only accepts the declared
+# Python types, so convert the fields that were sent before using the object.
+def validate_fields(instance: SQLModel):
+    for name in instance.model_fields_set:
+        value = getattr(instance, name)
+        if value is None:
+            continue
+        annotation = type(instance).model_fields[name].annotation
+        try:
+            setattr(instance, name, TypeAdapter(annotation).validate_python(value))
+        except ValidationError as e:
+            raise RequestValidationError([{**error, "loc": ("body", name)} for error in e.errors()])
+    return instance
+
+
+# Define the SQLModel for the rental_properties table. Rows belonging to a
+# property (tenancies, transactions, requests, ...) reference it with ON DELETE
+# CASCADE, so deleting the property is one statement.
 class RentalProperty(SQLModel, table=True):
     __tablename__ = "rental_properties"
+    __table_args__ = (
+        Index("ix_rental_properties_landlord_id", "landlord_id", "id"),
+    )
     id: int = Field(default=None, primary_key=True)
     name: str
     location: str
@@ -30,18 +52,25 @@ class User(SQLModel, table=True):
 
 class Tenancy(SQLModel, table=True):
     __tablename__ = "tenancies"
+    __table_args__ = (
+        Index("ix_tenancies_property_id_tenant_id", "property_id", "tenant_id"),
+        Index("ix_tenancies_tenant_id_property_id", "tenant_id", "property_id"),
+    )
     id: int = Field(default=None, primary_key=True)
     tenant_id: int = Field(foreign_key="users.id")
-    property_id: int = Field(foreign_key="rental_properties.id")
+    property_id: int = Field(foreign_key="rental_properties.id", ondelete="CASCADE")
     lease_start: datetime = Field(nullable=False)
     lease_end: datetime | None = None
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
 
 class Responsibility(SQLModel, table=True):
     __tablename__ = "responsibilities"
+    __table_args__ = (
+        Index("ix_responsibilities_property_id_created_at", "property_id", "created_at", "id"),
+    )
 
     id: int = Field(default=None, primary_key=True)
-    property_id: int = Field(foreign_key="rental_properties.id", nullable=False)
+    property_id: int = Field(foreign_key="rental_properties.id", nullable=False, ondelete="CASCADE")
     title: str = Field(max_length=255, nullable=False)
     description: Optional[str] = None
     due_date: Optional[date] = None
@@ -50,68 +79,178 @@ class Responsibility(SQLModel, table=True):
 
 class Announcement(SQLModel, table=True):
     __tablename__ = "announcements"
+    __table_args__ = (
+        Index("ix_announcements_property_id_created_at", "property_id", "created_at", "id"),
+    )
 
     id: int = Field(default=None, primary_key=True)
-    property_id: int = Field(foreign_key="rental_properties.id", nullable=False)
+    property_id: int = Field(foreign_key="rental_properties.id", nullable=False, ondelete="CASCADE")
     title: str = Field(max_length=255, nullable=False)
     message: str = Field(nullable=False)
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
 
 
-class Transaction(SQLModel, table=True):
+class TransactionBase(SQLModel):
+    property_id: int = Field(foreign_key="rental_properties.id", nullable=False, ondelete="CASCADE")
+    type: str = Field(max_length=100, nullable=False)
+    amount: Decimal = Field(nullable=False)
+    due_date: date = Field(nullable=False)
+    payee_role: str = Field(nullable=False)
+    is_visible_to_tenants: bool = Field(default=True, nullable=False)
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    # Template the transaction was materialized from, if it is recurring
+    recurring_id: Optional[int] = Field(default=None, foreign_key="recurring_transactions.id", ondelete="SET NULL")
+
+
+class Transaction(TransactionBase, table=True):
     __tablename__ = "transactions"
     __table_args__ = (
         CheckConstraint("payee_role IN ('tenant', 'landlord')", name="check_payee_role"),
+        Index("ix_transactions_property_id_created_at", "property_id", "created_at", "id"),
+        Index("ix_transactions_property_id_due_date", "property_id", "due_date"),
+        # One transaction per template and due date, so materializing twice is harmless
+        UniqueConstraint("recurring_id", "due_date", name="uq_transactions_recurring_id_due_date"),
+    )
+
+    id: int = Field(default=None, primary_key=True)
+
+
+# Template of a transaction that repeats every month on the day of start_date
+# (the last day in shorter months), materialized by the recurring scheduler
+class RecurringTransaction(SQLModel, table=True):
+    __tablename__ = "recurring_transactions"
+    __table_args__ = (
+        CheckConstraint("payee_role IN ('tenant', 'landlord')", name="check_recurring_payee_role"),
+        Index("ix_recurring_transactions_property_id", "property_id"),
+        Index("ix_recurring_transactions_next_due_date", "next_due_date"),
     )
 
     id: int = Field(default=None, primary_key=True)
-    property_id: int = Field(foreign_key="rental_properties.id", nullable=False)
+    property_id: int = Field(foreign_key="rental_properties.id", nullable=False, ondelete="CASCADE")
     type: str = Field(max_length=100, nullable=False)
     amount: Decimal = Field(nullable=False)
-    due_date: date = Field(nullable=False)
     payee_role: str = Field(nullable=False)
     is_visible_to_tenants: bool = Field(default=True, nullable=False)
+    start_date: date = Field(nullable=False)
+    end_date: Optional[date] = None
+    # Occurrences materialized so far and the due date of the next one (None once it has ended)
+    occurrences: int = Field(default=0, nullable=False)
+    next_due_date: Optional[date] = None
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
 
 
+# Transaction as listed, with its resolutions when they were asked for
+class TransactionRead(TransactionBase):
+    id: int
+    resolutions: Optional[List[dict]] = None
+
+
 class TransactionResolution(SQLModel, table=True):
     __tablename__ = "transaction_resolutions"
     __table_args__ = (
         CheckConstraint("status IN ('resolved', 'pending')", name="check_transaction_status"),
+        # One resolution per user and transaction; adding one again is an ON CONFLICT no-op
+        UniqueConstraint("transaction_id", "user_id", name="uq_transaction_resolutions_transaction_id_user_id"),
+        # Only pending resolutions are looked up by status, and they are the minority
+        Index(
+            "ix_transaction_resolutions_pending",
+            "transaction_id",
+            postgresql_where=text("status = 'pending'"),
+        ),
     )
 
     id: int = Field(default=None, primary_key=True)
-    transaction_id: int = Field(foreign_key="transactions.id", nullable=False)
+    transaction_id: int = Field(foreign_key="transactions.id", nullable=False, ondelete="CASCADE")
     user_id: int = Field(foreign_key="users.id", nullable=False)
     status: str = Field(default="pending", nullable=False)
     resolved_at: Optional[datetime] = None
 
 
-class TenantRequest(SQLModel, table=True):
-    __tablename__ = "tenant_requests"
-
-    id: int = Field(default=None, primary_key=True)
+class TenantRequestBase(SQLModel):
     tenant_id: int = Field(foreign_key="users.id", nullable=False)
-    property_id: int = Field(foreign_key="rental_properties.id", nullable=False)
+    property_id: int = Field(foreign_key="rental_properties.id", nullable=False, ondelete="CASCADE")
     title: str = Field(max_length=255, nullable=False)
     description: str = Field(nullable=False)
     request_date: date = Field(default_factory=date.today, nullable=False)
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
 
 
+class TenantRequest(TenantRequestBase, table=True):
+    __tablename__ = "tenant_requests"
+    __table_args__ = (
+        Index("ix_tenant_requests_property_id_created_at", "property_id", "created_at", "id"),
+        Index("ix_tenant_requests_tenant_id", "tenant_id"),
+    )
+
+    id: int = Field(default=None, primary_key=True)
+
+
+# Tenant request as listed, with its resolutions when they were asked for
+class TenantRequestRead(TenantRequestBase):
+    id: int
+    resolutions: Optional[List[dict]] = None
+
+
 class RequestResolution(SQLModel, table=True):
     __tablename__ = "request_resolutions"
     __table_args__ = (
         CheckConstraint("status IN ('resolved', 'pending')", name="check_request_status"),
+        # One resolution per user and request; adding one again is an ON CONFLICT no-op
+        UniqueConstraint("request_id", "user_id", name="uq_request_resolutions_request_id_user_id"),
+        Index(
+            "ix_request_resolutions_pending",
+            "request_id",
+            postgresql_where=text("status = 'pending'"),
+        ),
     )
 
     id: int = Field(default=None, primary_key=True)
-    request_id: int = Field(foreign_key="tenant_requests.id", nullable=False)
+    request_id: int = Field(foreign_key="tenant_requests.id", nullable=False, ondelete="CASCADE")
     user_id: int = Field(foreign_key="users.id", nullable=False)
     status: str = Field(default="pending", nullable=False)
     resolved_at: Optional[datetime] = None
 
 
+class LedgerRollup(SQLModel, table=True):
+    __tablename__ = "ledger_rollups"
+    __table_args__ = (
+        # The primary key leads with landlord_id; cascaded property deletes look rows up by property
+        Index("ix_ledger_rollups_property_id", "property_id"),
+    )
+
+    landlord_id: int = Field(foreign_key="users.id", primary_key=True)
+    property_id: int = Field(foreign_key="rental_properties.id", primary_key=True, ondelete="CASCADE")
+    month: date = Field(primary_key=True)
+    type: str = Field(max_length=100, primary_key=True)
+    payee_role: str = Field(primary_key=True)
+    total: Decimal = Field(default=0, nullable=False)
+    transaction_count: int = Field(default=0, nullable=False)
+    resolved_total: Decimal = Field(default=0, nullable=False)
+    resolved_count: int = Field(default=0, nullable=False)
+
+
+# Change counter of a property, bumped in the same transaction as every write to its data
+class PropertyVersion(SQLModel, table=True):
+    __tablename__ = "property_versions"
+
+    property_id: int = Field(foreign_key="rental_properties.id", primary_key=True, ondelete="CASCADE")
+    version: int = Field(default=0, nullable=False)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
+# Request bodies for adding one resolution per user in a single call
+class TransactionResolutionBatch(BaseModel):
+    transaction_id: int
+    user_ids: List[int]
+    status: str = "pending"
+
+
+class RequestResolutionBatch(BaseModel):
+    request_id: int
+    user_ids: List[int]
+    status: str = "pending"
+
+
 class UserResponse(BaseModel):
     id: int
     name: str
@@ -121,4 +260,15 @@ class UserResponse(BaseModel):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+# First page of every tab of a property, with cursors to continue each list
+class PropertyOverview(BaseModel):
+    property: RentalProperty
+    tenants: List[UserResponse]
+    transactions: List[TransactionRead]
+    responsibilities: List[Responsibility]
+    announcements: List[Announcement]
+    tenant_requests: List[TenantRequestRead]
+    next_cursors: dict
\ No newline at end of file
@@ -0,0 +1,61 @@
+from typing import Optional, Union
+from fastapi import HTTPException
+from sqlalchemy import and_, insert, update, delete, literal, Select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models import RentalProperty
+from versions import version_bump
+from response_cache import response_cache
+
+# Writes to a landlord's property data in a single round-trip. The write checks
+# ownership itself (INSERT ... SELECT FROM rental_properties, UPDATE ... FROM,
+# DELETE ... USING) and runs in a CTE beside the version bump of the property it
+# touched, so a successful write is one statement. Only when nothing matched
+# does a second query tell a missing row (404) from someone else's (403).
+
+
+# Condition that a row of model belongs to one of the landlord's properties
+def owned_by(model, landlord_id: int):
+    return and_(RentalProperty.id == model.property_id, RentalProperty.landlord_id == landlord_id)
+
+# Run a write returning the model's columns together with the version bump of
+# the properties it wrote to, or of the given property for tables without a
+# property_id (that bump happens even if nothing was written, so callers roll
+# back when the result is empty); returns the written rows as models
+async def write_and_bump(session: AsyncSession, statement, model, property_id: Optional[Union[int, Select]] = None):
+    written = statement.returning(*model.__table__.columns).cte("written")
+    bumped = version_bump(select(written.c.property_id) if property_id is None else property_id).cte("bumped")
+    rows = (await session.exec(select(*written.c).add_cte(bumped))).all()
+    if rows:
+        property_ids = {property_id} if isinstance(property_id, int) else {row.property_id for row in rows}
+        await response_cache.invalidate(property_ids)
+    return [model(**row._mapping) for row in rows]
+
+# Insert a row for a property of the landlord; None if the property is not theirs
+async def insert_owned(session: AsyncSession, model, property_id: int, landlord_id: int, values: dict):
+    source = select(*(literal(value, model.__table__.c[column].type) for column, value in values.items()), RentalProperty.id).where(
+        RentalProperty.id == property_id,
+        RentalProperty.landlord_id == landlord_id,
+    )
+    statement = insert(model).from_select([*values, "property_id"], source)
+    rows = await write_and_bump(session, statement, model)
+    return rows[0] if rows else None
+
+# Update a row of one of the landlord's properties; None if there is no such row
+async def update_owned(session: AsyncSession, model, row_id: int, landlord_id: int, values: dict):
+    statement = update(model).where(model.id == row_id, owned_by(model, landlord_id)).values(**values)
+    rows = await write_and_bump(session, statement, model)
+    return rows[0] if rows else None
+
+# Delete a row of one of the landlord's properties; returns it, or None if there is no such row
+async def delete_owned(session: AsyncSession, model, row_id: int, landlord_id: int):
+    statement = delete(model).where(model.id == row_id, owned_by(model, landlord_id))
+    rows = await write_and_bump(session, statement, model)
+    return rows[0] if rows else None
+
+# After an owned write matched nothing: 404 if the row does not exist, 403 if it is someone else's
+async def raise_missing_or_forbidden(session: AsyncSession, model, row_id: int, not_found: str, forbidden: str):
+    exists = (await session.exec(select(model.id).where(model.id == row_id))).first()
+    if exists:
+        raise HTTPException(status_code=403, detail=forbidden)
+    raise HTTPException(status_code=404, detail=not_found)
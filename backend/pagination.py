@@ -0,0 +1,54 @@
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import tuple_
+
+# Keyset pagination: pages list the newest rows first, ordered by a tuple of
+# columns (e.g. created_at, id) descending, and the next page starts strictly
+# before the last row of the previous one, so every page costs the same however
+# deep it is. The cursor for the next page is returned in the X-Next-Cursor
+# header, keeping response bodies plain lists; the frontend lists follow it
+# with a "Load more" button.
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+page_limit = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+
+
+def encode_cursor(values) -> str:
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str, columns) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(values) != len(columns):
+            raise ValueError("Cursor does not match the page ordering")
+        return [
+            datetime.fromisoformat(value) if column.type.python_type is datetime else value
+            for column, value in zip(columns, values)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+# Newest first: the keyset columns, descending
+def newest_first(columns) -> list:
+    return [column.desc() for column in columns]
+
+# Order the statement newest first by the keyset columns and fetch one row past the limit
+def paginate(statement, columns, after: str | None, limit: int):
+    if after:
+        statement = statement.where(tuple_(*columns) < tuple_(*decode_cursor(after, columns)))
+    return statement.order_by(*newest_first(columns)).limit(limit + 1)
+
+# Trim the extra row and, if there was one, point the client at the next page
+def finish_page(response: Response, rows, columns, limit: int):
+    rows = list(rows)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(rows[-1], column.key) for column in columns])
+    return rows
@@ -0,0 +1,173 @@
+import logging
+import os
+import time
+from collections import Counter as Tally
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from metrics import Counter
+
+# Per-request SQL instrumentation. Engine events add every statement run through
+# the engine to the QueryStats collectors active in the current context: one per
+# request (QueryStatsMiddleware), plus any opened with collect_queries() around
+# code under test. The middleware reports the totals in a Server-Timing header
+# and logs statements repeated QUERY_REPEAT_THRESHOLD times or more in one
+# request, which is what an N+1 loop looks like from the database's side.
+#
+# Statements slower than SLOW_QUERY_MS are logged as warnings with the request
+# they ran in; 0 turns the slow-query log off. Parameters are left out of the
+# log, as they can hold personal data and password hashes.
+
+QUERY_STATS_ENABLED = os.getenv("QUERY_STATS_ENABLED", "true").lower() in ("1", "true", "yes")
+QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "5"))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+repeated_statements = Counter("db_repeated_statements_total", "Requests that ran the same statement QUERY_REPEAT_THRESHOLD times or more", ("route",))
+
+slow_queries = Counter("db_slow_queries_total", "Statements that took longer than SLOW_QUERY_MS")
+
+logger = logging.getLogger(__name__)
+
+_collectors = ContextVar("query_stats_collectors", default=())
+_request_scope = ContextVar("query_stats_request_scope", default=None)
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.rows = 0
+        self.seconds = 0.0
+        self.statements = Tally()
+
+    def record(self, statement: str, rows: int, seconds: float):
+        self.count += 1
+        self.rows += max(rows, 0)
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    # Statements run at least threshold times, most repeated first
+    def repeated(self, threshold: int = QUERY_REPEAT_THRESHOLD):
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+    def server_timing(self) -> str:
+        timing = f'db;dur={self.seconds * 1000:.1f};desc="{self.count} queries, {self.rows} rows"'
+        repeated = self.repeated()
+        if repeated:
+            timing += f', db-repeated;desc="{len(repeated)} repeated, up to {repeated[0][1]}x"'
+        return timing
+
+
+# Statements are timed for the slow-query log, or when someone is collecting them
+def _timing() -> bool:
+    return bool(SLOW_QUERY_MS) or bool(_collectors.get())
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _timing():
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not _timing():
+        return
+    seconds = time.perf_counter() - conn.info["query_start"].pop()
+    for stats in _collectors.get():
+        stats.record(statement, cursor.rowcount, seconds)
+    if SLOW_QUERY_MS and seconds * 1000 >= SLOW_QUERY_MS:
+        log_slow_query(statement, cursor.rowcount, seconds, executemany)
+
+# A failed statement never reaches after_cursor_execute; drop its start time
+def _handle_error(context):
+    starts = context.connection.info.get("query_start") if context.connection is not None else None
+    if starts:
+        starts.pop()
+
+def log_slow_query(statement: str, rows: int, seconds: float, executemany: bool):
+    slow_queries.inc()
+    scope = _request_scope.get()
+    logger.warning("Slow query", extra={"fields": {
+        "event": "slow_query",
+        "duration_ms": round(seconds * 1000, 1),
+        "rows": rows,
+        "executemany": executemany,
+        "method": scope["method"] if scope else None,
+        "route": getattr(scope.get("route"), "path", scope["path"]) if scope else None,
+        "statement": " ".join(statement.split())[:1000],
+    }})
+
+# Hook the collectors into an engine (async engines are instrumented through their sync engine)
+def instrument(engine):
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+# Collect the statements run inside the block, on top of any collector already active
+@contextmanager
+def collect_queries():
+    stats = QueryStats()
+    token = _collectors.set(_collectors.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _collectors.reset(token)
+
+# Fail when the block runs more than max_queries statements, listing what ran
+@contextmanager
+def query_budget(max_queries: int):
+    with collect_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        statements = "\n".join(f"  {count}x {statement}" for statement, count in stats.statements.most_common())
+        raise AssertionError(f"{stats.count} queries, over the budget of {max_queries}:\n{statements}")
+
+
+class QueryStatsMiddleware:
+    """Counts each HTTP request's queries and reports them in a Server-Timing header,
+    and names the request in slow-query log lines.
+
+    The header goes out with the response start, so queries made while a
+    streamed body is generated are not included."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _request_scope.set(scope)
+        try:
+            if QUERY_STATS_ENABLED:
+                await self.count_queries(scope, receive, send)
+            else:
+                await self.app(scope, receive, send)
+        finally:
+            _request_scope.reset(token)
+
+    async def count_queries(self, scope, receive, send):
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode()))
+                message = {**message, "headers": headers}
+                report_repeated(scope, stats)
+            await send(message)
+
+        with collect_queries() as stats:
+            await self.app(scope, receive, send_with_timing)
+
+
+def report_repeated(scope, stats: QueryStats):
+    repeated = stats.repeated()
+    if not repeated:
+        return
+    route = getattr(scope.get("route"), "path", scope["path"])
+    repeated_statements.inc(route=route)
+    for statement, count in repeated:
+        logger.warning("Repeated statement", extra={"fields": {
+            "event": "repeated_statement",
+            "method": scope["method"],
+            "route": route,
+            "count": count,
+            "statement": " ".join(statement.split())[:1000],
+        }})
@@ -0,0 +1,197 @@
+import argparse
+import asyncio
+import calendar
+import logging
+import os
+from datetime import date, datetime
+from typing import List, Optional
+from sqlalchemy import and_, or_, any_, func, literal, union_all, Integer
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models import RecurringTransaction, Transaction, TransactionResolution, RentalProperty, Tenancy
+from versions import bump_property_version
+from events import property_events
+from ledger import add_new_transactions
+from metrics import Counter
+
+# Materializes recurring transaction templates into transactions. Each round
+# locks a batch of due templates, inserts every occurrence up to today for all
+# of them with one INSERT, adds a pending resolution for the landlord and each
+# tenant whose lease covers the due date with one INSERT ... SELECT, advances
+# the templates and commits. A run that stops halfway resumes from the last
+# committed round, and the unique (recurring_id, due_date) constraint makes a
+# repeated occurrence a no-op, so several workers can run the scheduler at once
+# (they skip each other's locked templates).
+
+RECURRING_SCHEDULER_ENABLED = os.getenv("RECURRING_SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes")
+RECURRING_INTERVAL_SECONDS = float(os.getenv("RECURRING_INTERVAL_SECONDS", "3600"))
+RECURRING_BATCH_SIZE = int(os.getenv("RECURRING_BATCH_SIZE", "500"))
+
+logger = logging.getLogger(__name__)
+
+recurring_created = Counter("recurring_transactions_created_total", "Transactions materialized from recurring templates")
+recurring_errors = Counter("recurring_scheduler_errors_total", "Recurring scheduler runs that failed")
+
+
+# The start date moved forward by some months, on the last day of shorter months
+def add_months(start: date, months: int) -> date:
+    month = start.month - 1 + months
+    year, month = start.year + month // 12, month % 12 + 1
+    return date(year, month, min(start.day, calendar.monthrange(year, month)[1]))
+
+# Due dates of a template's occurrences up to today, and the template's state after them
+def due_occurrences(template: RecurringTransaction, today: date):
+    last_day = min(today, template.end_date) if template.end_date else today
+    occurrences = template.occurrences
+    due_dates = []
+    due_date = template.next_due_date
+    while due_date and due_date <= last_day:
+        due_dates.append(due_date)
+        occurrences += 1
+        due_date = add_months(template.start_date, occurrences)
+    if template.end_date and due_date > template.end_date:
+        due_date = None
+    return due_dates, occurrences, due_date
+
+# Pending resolutions for new transactions: the landlord, and the tenants whose
+# lease covers the due date when the transaction is visible to them
+def _resolutions_for(transaction_ids: List[int]):
+    # One array parameter rather than an IN list with a placeholder per id
+    new = Transaction.id == any_(literal(transaction_ids, ARRAY(Integer)))
+    landlords = (
+        select(Transaction.id, RentalProperty.landlord_id, literal("pending"))
+        .join(RentalProperty, RentalProperty.id == Transaction.property_id)
+        .where(new)
+    )
+    tenants = (
+        select(Transaction.id, Tenancy.tenant_id, literal("pending"))
+        .join(Tenancy, and_(
+            Tenancy.property_id == Transaction.property_id,
+            func.date(Tenancy.lease_start) <= Transaction.due_date,
+            or_(Tenancy.lease_end == None, func.date(Tenancy.lease_end) >= Transaction.due_date),
+        ))
+        .where(new)
+        .where(Transaction.is_visible_to_tenants == True)
+    )
+    return insert(TransactionResolution).from_select(
+        ["transaction_id", "user_id", "status"], union_all(landlords, tenants)
+    )
+
+# One round: materialize a batch of due templates and commit; returns the new transactions
+async def _materialize_batch(session: AsyncSession, today: date, template_ids: Optional[List[int]]):
+    statement = (
+        select(RecurringTransaction, RentalProperty.landlord_id)
+        .join(RentalProperty, RentalProperty.id == RecurringTransaction.property_id)
+        .where(RecurringTransaction.next_due_date <= today)
+        .order_by(RecurringTransaction.id)
+        .limit(RECURRING_BATCH_SIZE)
+        .with_for_update(of=RecurringTransaction, skip_locked=True)
+    )
+    if template_ids is not None:
+        statement = statement.where(RecurringTransaction.id.in_(template_ids))
+    templates = (await session.exec(statement)).all()
+    if not templates:
+        return None
+
+    values = []
+    landlords = {}
+    now = datetime.utcnow()
+    for template, landlord_id in templates:
+        due_dates, template.occurrences, template.next_due_date = due_occurrences(template, today)
+        landlords[template.property_id] = landlord_id
+        values += [
+            {
+                "property_id": template.property_id,
+                "type": template.type,
+                "amount": template.amount,
+                "due_date": due_date,
+                "payee_role": template.payee_role,
+                "is_visible_to_tenants": template.is_visible_to_tenants,
+                "created_at": now,
+                "recurring_id": template.id,
+            }
+            for due_date in due_dates
+        ]
+        session.add(template)
+
+    created = []
+    if values:
+        # Sent as multi-row INSERTs of up to a thousand rows, whatever the backlog
+        statement = (
+            insert(Transaction.__table__)
+            .on_conflict_do_nothing(constraint="uq_transactions_recurring_id_due_date")
+            .returning(*Transaction.__table__.columns)
+        )
+        created = [dict(row._mapping) for row in (await session.exec(statement, params=values)).all()]
+    if created:
+        await session.exec(_resolutions_for([transaction["id"] for transaction in created]))
+        await add_new_transactions(session, [
+            {**transaction, "landlord_id": landlords[transaction["property_id"]]} for transaction in created
+        ])
+        property_ids = {transaction["property_id"] for transaction in created}
+        await bump_property_version(session, select(RentalProperty.id).where(RentalProperty.id.in_(property_ids)))
+    await session.commit()
+    return created
+
+# Materialize every due occurrence (of the given templates, or all of them), round by round
+async def materialize_due(session: AsyncSession, today: Optional[date] = None, template_ids: Optional[List[int]] = None):
+    today = today or date.today()
+    created = []
+    while True:
+        batch = await _materialize_batch(session, today, template_ids)
+        if batch is None:
+            break
+        created += batch
+    recurring_created.inc(len(created))
+
+    # One event per property; clients reload instead of applying each new row
+    for property_id in {transaction["property_id"] for transaction in created}:
+        await property_events.publish(property_id, "property.reload", {"reason": "recurring"})
+    return created
+
+
+class RecurringScheduler:
+    """Runs materialize_due in the background every RECURRING_INTERVAL_SECONDS."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.task = None
+
+    async def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def run(self):
+        from database import engine
+        while True:
+            try:
+                async with AsyncSession(engine, expire_on_commit=False) as session:
+                    await materialize_due(session)
+            except Exception:
+                # Committed rounds are kept; the next run picks up the rest
+                recurring_errors.inc()
+                logger.exception("Recurring scheduler failed")
+            await asyncio.sleep(self.interval)
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+
+
+recurring_scheduler = RecurringScheduler(RECURRING_INTERVAL_SECONDS)
+
+
+async def _main(args):
+    from database import engine
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        created = await materialize_due(session, args.today)
+    await engine.dispose()
+    print(f"Materialized {len(created)} recurring transactions")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Materialize due recurring transactions")
+    parser.add_argument("command", choices=["run"])
+    parser.add_argument("--today", type=date.fromisoformat, default=None, help="Materialize as if it were this date")
+    asyncio.run(_main(parser.parse_args()))
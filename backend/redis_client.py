@@ -0,0 +1,125 @@
+import asyncio
+import os
+from urllib.parse import urlsplit
+
+# Minimal client for the Redis protocol (RESP), enough for the response cache
+# and the event broker without another dependency. Any server speaking RESP
+# (Redis, Valkey, KeyDB, ...) works.
+#
+# Every command, including the wait for the shared connection and connecting,
+# gives up after REDIS_TIMEOUT_SECONDS, so a stalled server costs each caller
+# at most that long; callers treat the timeout like a connection error and
+# fall back to the database.
+
+REDIS_TIMEOUT_SECONDS = float(os.getenv("REDIS_TIMEOUT_SECONDS", "0.5"))
+
+CONNECTION_ERRORS = (OSError, ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError)
+
+
+class RedisError(Exception):
+    pass
+
+
+def encode_command(*args) -> bytes:
+    chunks = [f"*{len(args)}\r\n".encode()]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        chunks += [f"${len(data)}\r\n".encode(), data, b"\r\n"]
+    return b"".join(chunks)
+
+
+async def read_reply(reader: asyncio.StreamReader):
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Redis connection closed")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode()
+    if kind == b"-":
+        raise RedisError(payload.decode())
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        return [await read_reply(reader) for _ in range(int(payload))]
+    raise RedisError(f"Unexpected reply {line!r}")
+
+
+class RedisClient:
+    """One connection used for request/reply commands, one call at a time."""
+
+    def __init__(self, url: str, timeout: float = REDIS_TIMEOUT_SECONDS):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.password = parts.password
+        self.timeout = timeout
+        self._connection = None
+        self._lock = asyncio.Lock()
+
+    # Open and authenticate a new connection; also used for subscriptions
+    async def connect(self):
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+        try:
+            if self.password:
+                await asyncio.wait_for(self._send(reader, writer, "AUTH", self.password), self.timeout)
+            if self.db:
+                await asyncio.wait_for(self._send(reader, writer, "SELECT", self.db), self.timeout)
+        except BaseException:
+            writer.close()
+            raise
+        return reader, writer
+
+    async def _send(self, reader, writer, *args):
+        writer.write(encode_command(*args))
+        await writer.drain()
+        return await read_reply(reader)
+
+    async def execute(self, *args):
+        return await asyncio.wait_for(self._execute(*args), self.timeout)
+
+    async def _execute(self, *args):
+        async with self._lock:
+            try:
+                if self._connection is None:
+                    self._connection = await self.connect()
+                return await self._send(*self._connection, *args)
+            except RedisError:
+                raise
+            except BaseException:
+                # Broken, timed out or cancelled mid-reply: reconnect on the next
+                # call rather than reusing a stream that may hold part of a reply
+                self._drop()
+                raise
+
+    def _drop(self):
+        connection, self._connection = self._connection, None
+        if connection:
+            connection[1].close()
+
+    async def close(self):
+        connection, self._connection = self._connection, None
+        if connection:
+            connection[1].close()
+            try:
+                await connection[1].wait_closed()
+            except CONNECTION_ERRORS:
+                pass
+
+    # Pattern subscription on a dedicated connection, yielding (channel, message)
+    async def psubscribe(self, pattern: str):
+        reader, writer = await self.connect()
+        try:
+            writer.write(encode_command("PSUBSCRIBE", pattern))
+            await writer.drain()
+            while True:
+                reply = await read_reply(reader)
+                if reply[0] == b"pmessage":
+                    yield reply[2].decode(), reply[3]
+        finally:
+            writer.close()
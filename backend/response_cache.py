@@ -0,0 +1,192 @@
+import json
+import os
+from collections import OrderedDict
+from typing import Optional
+from fastapi import Request, Response
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models import PropertyVersion, User
+from etags import etag_matches, not_modified, set_etag, request_key, version_etag
+from fast_json import json_response
+from metrics import Counter, Gauge
+from redis_client import RedisClient, RedisError, CONNECTION_ERRORS
+
+# Server-side cache of serialised property-scoped list responses. Keys carry the
+# property's data version (see versions.py), the caller's role and the full
+# query, so a write makes every older entry unreachable without coordination
+# between workers. The version is read before the page, so a cached body is
+# never older than the version it is stored under. The ETag is derived from the
+# same version (see etags.py), so a revalidation is answered with 304 before
+# the cache or the database is read.
+#
+# Entries live in an in-process LRU bounded by bytes, or in a Redis-compatible
+# server when RESPONSE_CACHE_URL is set (redis://host:port/db), which lets
+# several workers share one cache.
+
+RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL")
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+
+response_cache_hits = Counter("response_cache_hits_total", "List responses served from the response cache", ("route",))
+response_cache_misses = Counter("response_cache_misses_total", "List responses built from the database", ("route",))
+response_cache_errors = Counter("response_cache_errors_total", "Response cache backend calls that failed")
+
+
+class MemoryBackend:
+    """LRU of cached responses bounded by the total size of keys and values."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes):
+        await self.delete(key)
+        entry_size = len(key) + len(value)
+        if entry_size > self.max_bytes:
+            return
+        self._entries[key] = value
+        self.size += entry_size
+        while self.size > self.max_bytes:
+            old_key, old_value = self._entries.popitem(last=False)
+            self.size -= len(old_key) + len(old_value)
+
+    async def delete(self, key: str):
+        value = self._entries.pop(key, None)
+        if value is not None:
+            self.size -= len(key) + len(value)
+
+    # Drop every entry of a property; newer versions would miss them anyway
+    async def invalidate(self, property_id: int):
+        prefix = f"{property_id}:"
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            await self.delete(key)
+
+    async def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+
+class RedisBackend:
+    """Cached responses in a Redis-compatible server, shared by every worker.
+
+    Entries expire after ttl seconds; the server's maxmemory policy bounds their size.
+    """
+
+    def __init__(self, url: str, ttl: int, prefix: str = "response:"):
+        self.client = RedisClient(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.execute("GET", self.prefix + key)
+
+    async def set(self, key: str, value: bytes):
+        await self.client.execute("SET", self.prefix + key, value, "EX", self.ttl)
+
+    # Versioned keys are never read again after a write and expire on their own
+    async def invalidate(self, property_id: int):
+        pass
+
+    # Delete this cache's entries only; the database may be shared with other data
+    async def clear(self):
+        cursor = b"0"
+        while True:
+            cursor, keys = await self.client.execute("SCAN", cursor, "MATCH", self.prefix + "*", "COUNT", 1000)
+            if keys:
+                await self.client.execute("DEL", *keys)
+            if cursor == b"0":
+                return
+
+    async def close(self):
+        await self.client.close()
+
+
+class CachedRead:
+    """A cache lookup for one request: either the response to send, or the key to
+    store under and the ETag to send with the body."""
+
+    def __init__(self, cache, key: Optional[str], route: str, response: Optional[Response] = None, etag: Optional[str] = None):
+        self.cache = cache
+        self.key = key
+        self.route = route
+        self.response = response
+        self.etag = etag
+
+    # Store the route's serialised body with its headers and send the same bytes
+    async def store(self, response: Response, body: bytes):
+        if self.etag is not None:
+            set_etag(response, self.etag)
+        json_body = json_response(response, body)
+        if self.key is not None:
+            headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+            await self.cache.put(self.key, json.dumps(headers).encode() + b"\n" + body)
+        return json_body
+
+
+class ResponseCache:
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def put(self, key: str, value: bytes):
+        try:
+            await self.backend.set(key, value)
+        except (*CONNECTION_ERRORS, RedisError):
+            response_cache_errors.inc()
+
+    # Find the cached response of this request at the property's current version,
+    # or the 304 to send when the client already has it
+    async def lookup(self, request: Request, session: AsyncSession, property_id: int, current_user: User) -> CachedRead:
+        route = request.scope["route"].path if "route" in request.scope else request.url.path
+        version_statement = select(PropertyVersion.version).where(PropertyVersion.property_id == property_id)
+        version = (await session.exec(version_statement)).first()
+        if version is None:
+            return CachedRead(self, None, route)
+
+        etag = version_etag(request, current_user.role, version)
+        if etag_matches(request, etag):
+            return CachedRead(self, None, route, not_modified(etag))
+
+        key = f"{property_id}:{version}:{current_user.role}:{request_key(request)}"
+        try:
+            value = await self.backend.get(key)
+        except (*CONNECTION_ERRORS, RedisError):
+            response_cache_errors.inc()
+            value = None
+        if value is None:
+            response_cache_misses.inc(route=route)
+            return CachedRead(self, key, route, etag=etag)
+
+        response_cache_hits.inc(route=route)
+        raw_headers, body = value.split(b"\n", 1)
+        response = Response(content=body, media_type="application/json", headers=json.loads(raw_headers))
+        return CachedRead(self, key, route, response)
+
+    async def invalidate(self, property_ids):
+        for property_id in property_ids:
+            await self.backend.invalidate(property_id)
+
+    async def clear(self):
+        await self.backend.clear()
+
+
+def _hit_ratio():
+    hits = sum(response_cache_hits._values.values())
+    total = hits + sum(response_cache_misses._values.values())
+    return hits / total if total else 0
+
+
+if RESPONSE_CACHE_URL:
+    response_cache = ResponseCache(RedisBackend(RESPONSE_CACHE_URL, RESPONSE_CACHE_TTL_SECONDS))
+else:
+    response_cache = ResponseCache(MemoryBackend(RESPONSE_CACHE_MAX_BYTES))
+    Gauge("response_cache_bytes", "Bytes held by the in-process response cache", function=lambda: response_cache.backend.size)
+    Gauge("response_cache_entries", "Responses held by the in-process response cache",
+          function=lambda: len(response_cache.backend._entries))
+Gauge("response_cache_hit_ratio", "Share of cacheable list requests served from the cache", function=_hit_ratio)
@@ -1,50 +1,71 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
-from models import Announcement, User, RentalProperty
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models import Announcement, User
 from database import get_session
 from auth import get_current_user
-from typing import List
+from owned_writes import insert_owned, update_owned, delete_owned, raise_missing_or_forbidden
+from events import property_events
+from pagination import paginate, finish_page, page_limit
+from response_cache import response_cache
+from fast_json import columns, dump_rows
+from typing import List, Optional
+from datetime import date, datetime, time
 
 router = APIRouter()
 
 @router.get("/announcements/{property_id}", response_model=List[Announcement])
-async def get_announcements(property_id: int, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
-    statement = select(Announcement).where(Announcement.property_id == property_id)
-    announcements = session.exec(statement).all()
+async def get_announcements(
+    property_id: int,
+    request: Request,
+    response: Response,
+    limit: int = page_limit,
+    after: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    cached = await response_cache.lookup(request, session, property_id, current_user)
+    if cached.response:
+        return cached.response
+
+    statement = select(*columns(Announcement)).where(Announcement.property_id == property_id)
+    if start_date:
+        statement = statement.where(Announcement.created_at >= datetime.combine(start_date, time.min))
+    if end_date:
+        statement = statement.where(Announcement.created_at <= datetime.combine(end_date, time.max))
+
+    # One page ordered by creation, starting after the cursor
+    keyset = [Announcement.created_at, Announcement.id]
+    page = paginate(statement, keyset, after, limit)
+    announcements = (await session.exec(page)).all()
     if not announcements:
         raise HTTPException(status_code=404, detail="Announcements not found")
-    return announcements
+    return await cached.store(response, dump_rows(finish_page(response, announcements, keyset, limit)))
 
 @router.post("/add-announcement/{property_id}", response_model=Announcement)
 async def add_announcement(
     property_id: int,
     announcement: Announcement,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Ensure the current user is a landlord
     if current_user.role != "landlord":
         raise HTTPException(status_code=403, detail="Only landlords can add announcements")
 
-    # Check if the property exists and belongs to the current landlord
-    property_statement = select(RentalProperty).where(
-        RentalProperty.id == property_id,
-        RentalProperty.landlord_id == current_user.id
-    )
-    property = session.exec(property_statement).first()
-    if not property:
+    # Create the announcement if the property belongs to the current landlord, in one statement
+    new_announcement = await insert_owned(session, Announcement, property_id, current_user.id, {
+        "title": announcement.title,
+        "message": announcement.message,
+        "created_at": datetime.utcnow(),
+    })
+    if not new_announcement:
         raise HTTPException(status_code=404, detail="Property not found or does not belong to you")
 
-    # Create a new announcement
-    new_announcement = Announcement(
-        property_id=property_id,
-        title=announcement.title,
-        message=announcement.message
-    )
-
-    session.add(new_announcement)
-    session.commit()
-    session.refresh(new_announcement)
+    await session.commit()
+    await property_events.publish(property_id, "announcement.added", new_announcement)
 
     return new_announcement
 
@@ -52,65 +73,48 @@ async def add_announcement(
 async def update_announcement(
     announcement_id: int,
     updated_announcement: Announcement,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Ensure the current user is a landlord
     if current_user.role != "landlord":
         raise HTTPException(status_code=403, detail="Only landlords can update announcements")
 
-    # Fetch the announcement to be updated
-    announcement_statement = select(Announcement).where(Announcement.id == announcement_id)
-    announcement = session.exec(announcement_statement).first()
+    # Update the announcement if its property belongs to the current landlord
+    announcement = await update_owned(session, Announcement, announcement_id, current_user.id, {
+        "title": updated_announcement.title,
+        "message": updated_announcement.message,
+    })
     if not announcement:
-        raise HTTPException(status_code=404, detail="Announcement not found")
+        await raise_missing_or_forbidden(
+            session, Announcement, announcement_id,
+            "Announcement not found", "You do not have permission to update this announcement",
+        )
 
-    # Check if the property belongs to the current landlord
-    property_statement = select(RentalProperty).where(
-        RentalProperty.id == announcement.property_id,
-        RentalProperty.landlord_id == current_user.id
-    )
-    property = session.exec(property_statement).first()
-    if not property:
-        raise HTTPException(status_code=403, detail="You do not have permission to update this announcement")
-
-    # Update announcement fields
-    announcement.title = updated_announcement.title
-    announcement.message = updated_announcement.message
-
-    session.add(announcement)
-    session.commit()
-    session.refresh(announcement)
+    await session.commit()
+    await property_events.publish(announcement.property_id, "announcement.updated", announcement)
 
     return announcement
 
 @router.delete("/delete-announcement/{announcement_id}")
 async def delete_announcement(
     announcement_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Ensure the current user is a landlord
     if current_user.role != "landlord":
         raise HTTPException(status_code=403, detail="Only landlords can delete announcements")
 
-    # Fetch the announcement to be deleted
-    announcement_statement = select(Announcement).where(Announcement.id == announcement_id)
-    announcement = session.exec(announcement_statement).first()
+    # Delete the announcement if its property belongs to the current landlord
+    announcement = await delete_owned(session, Announcement, announcement_id, current_user.id)
     if not announcement:
-        raise HTTPException(status_code=404, detail="Announcement not found")
-
-    # Check if the property belongs to the current landlord
-    property_statement = select(RentalProperty).where(
-        RentalProperty.id == announcement.property_id,
-        RentalProperty.landlord_id == current_user.id
-    )
-    property = session.exec(property_statement).first()
-    if not property:
-        raise HTTPException(status_code=403, detail="You do not have permission to delete this announcement")
-
-    # Delete the announcement
-    session.delete(announcement)
-    session.commit()
+        await raise_missing_or_forbidden(
+            session, Announcement, announcement_id,
+            "Announcement not found", "You do not have permission to delete this announcement",
+        )
+
+    await session.commit()
+    await property_events.publish(announcement.property_id, "announcement.deleted", {"id": announcement_id})
 
     return {"message": "Announcement deleted successfully"}
\ No newline at end of file
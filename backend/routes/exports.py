@@ -0,0 +1,109 @@
+import csv
+import io
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models import Transaction, TransactionResolution, User, RentalProperty
+from database import engine, get_session
+from auth import get_current_user
+from fast_json import dump_line
+from typing import Optional
+from datetime import date
+
+router = APIRouter()
+
+# Rows fetched from the server-side cursor per round-trip
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+}
+
+# One row per transaction and resolution; transactions without resolutions appear once
+def ledger_statement(
+    landlord_id: int,
+    property_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    statement = (
+        select(
+            Transaction.id.label("transaction_id"),
+            Transaction.property_id,
+            RentalProperty.name.label("property_name"),
+            Transaction.type,
+            Transaction.amount,
+            Transaction.due_date,
+            Transaction.payee_role,
+            Transaction.is_visible_to_tenants,
+            Transaction.created_at,
+            TransactionResolution.id.label("resolution_id"),
+            TransactionResolution.user_id.label("resolution_user_id"),
+            User.name.label("resolution_user_name"),
+            TransactionResolution.status.label("resolution_status"),
+            TransactionResolution.resolved_at,
+        )
+        .join(RentalProperty, RentalProperty.id == Transaction.property_id)
+        .outerjoin(TransactionResolution, TransactionResolution.transaction_id == Transaction.id)
+        .outerjoin(User, User.id == TransactionResolution.user_id)
+        .where(RentalProperty.landlord_id == landlord_id)
+        .order_by(Transaction.due_date, Transaction.id, TransactionResolution.id)
+    )
+    if property_id:
+        statement = statement.where(Transaction.property_id == property_id)
+    if start_date:
+        statement = statement.where(Transaction.due_date >= start_date)
+    if end_date:
+        statement = statement.where(Transaction.due_date <= end_date)
+    return statement
+
+def _csv_chunk(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+# Stream the rows batch by batch, so memory stays flat however long the ledger is.
+# The generator runs after the route returns, when the request's session is
+# already closed, so it opens its own.
+async def stream_ledger(statement, format: str):
+    async with AsyncSession(engine) as session:
+        if format == "csv":
+            yield _csv_chunk([[column.name for column in statement.selected_columns]])
+        result = await session.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            if format == "csv":
+                yield _csv_chunk(rows)
+            else:
+                yield b"".join(dump_line(dict(row._mapping)) for row in rows)
+
+@router.get("/export/transactions")
+async def export_transactions(
+    format: str = "ndjson",
+    property_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    # Ensure the current user is a landlord
+    if current_user.role != "landlord":
+        raise HTTPException(status_code=403, detail="Only landlords can export their ledger")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="Invalid export format")
+
+    if property_id:
+        statement = select(RentalProperty.id).where(
+            RentalProperty.id == property_id,
+            RentalProperty.landlord_id == current_user.id
+        )
+        if not (await session.exec(statement)).first():
+            raise HTTPException(status_code=404, detail="Property not found or does not belong to you")
+
+    media_type, extension = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        stream_ledger(ledger_statement(current_user.id, property_id, start_date, end_date), format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="ledger.{extension}"'},
+    )
@@ -0,0 +1,34 @@
+import csv
+import io
+from fastapi import APIRouter, Depends, HTTPException, UploadFile
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models import User
+from database import get_session
+from auth import get_current_user
+from importer import IMPORTERS, import_csv
+
+router = APIRouter()
+
+# kind is "properties", "tenancies" or "transactions"; rows with errors are skipped and reported
+@router.post("/import/{kind}", response_model=dict)
+async def import_rows(
+    kind: str,
+    file: UploadFile,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    # Ensure the current user is a landlord
+    if current_user.role != "landlord":
+        raise HTTPException(status_code=403, detail="Only landlords can import data")
+    if kind not in IMPORTERS:
+        raise HTTPException(status_code=404, detail="Unknown import kind")
+
+    # The upload is spooled to a temporary file and read from it line by line
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report = await import_csv(session, current_user.id, kind, lines)
+    except (ValueError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        lines.detach()
+    return report.as_dict()
@@ -0,0 +1,59 @@
+import asyncio
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models import RentalProperty, Tenancy
+from database import engine
+from auth import get_current_user
+from events import property_events
+
+router = APIRouter()
+
+# Browsers cannot set headers on a WebSocket, so the token comes in the query string
+@router.websocket("/ws/property/{property_id}")
+async def property_events_socket(websocket: WebSocket, property_id: int, token: str):
+    # A short session for the checks only; a socket can stay open for hours
+    async with AsyncSession(engine) as session:
+        try:
+            current_user = await get_current_user(token, session)
+        except HTTPException:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+
+        # Only the landlord and the tenants of the property can watch it
+        if current_user.role == "landlord":
+            statement = select(RentalProperty.id).where(
+                RentalProperty.id == property_id,
+                RentalProperty.landlord_id == current_user.id
+            )
+        else:
+            statement = select(Tenancy.id).where(
+                Tenancy.property_id == property_id,
+                Tenancy.tenant_id == current_user.id
+            )
+        if not (await session.exec(statement)).first():
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+
+    await websocket.accept()
+    subscriber = property_events.subscribe(property_id, current_user.role)
+
+    async def forward():
+        while True:
+            message = await subscriber.queue.get()
+            if message is None:
+                # Too far behind: the client reconnects and reloads its lists
+                await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                return
+            await websocket.send_text(message)
+
+    sender = asyncio.create_task(forward())
+    try:
+        # Clients do not send anything; reading only notices the disconnect
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        property_events.unsubscribe(subscriber)
@@ -0,0 +1,109 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlmodel import select
+from sqlalchemy import func, cast, Text
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models import (
+    RentalProperty, User, Tenancy, Transaction, TransactionResolution, Announcement,
+    Responsibility, TenantRequest, RequestResolution, TransactionRead, TenantRequestRead,
+    UserResponse, PropertyOverview,
+)
+from database import get_session
+from auth import get_current_user
+from pagination import paginate, encode_cursor, MAX_PAGE_SIZE
+from json_sql import json_rows, json_resolutions
+from fast_json import columns
+from etags import check_property_etag
+
+router = APIRouter()
+
+OVERVIEW_SECTION_SIZE = 20
+
+
+# Build a model from a JSON row. Nested resolutions are plain dicts, so their
+# timestamps are parsed here to match the per-item resolution endpoints.
+def _parse_row(model, item: dict):
+    for resolution in item.get("resolutions") or []:
+        if resolution["resolved_at"]:
+            resolution["resolved_at"] = datetime.fromisoformat(resolution["resolved_at"])
+    return model.model_validate(item)
+
+
+@router.get("/property/{property_id}/overview", response_model=PropertyOverview)
+async def get_property_overview(
+    property_id: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(OVERVIEW_SECTION_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    # The property's version identifies the overview, so revalidating builds nothing
+    not_modified = await check_property_etag(request, response, session, property_id, current_user.role)
+    if not_modified:
+        return not_modified
+
+    transactions = select(
+        Transaction,
+        json_resolutions(TransactionResolution, "transaction_id", Transaction.id).label("resolutions"),
+    ).where(Transaction.property_id == property_id)
+    if current_user.role == "tenant":
+        transactions = transactions.where(Transaction.is_visible_to_tenants == True)
+
+    # First page of every tab, newest first and limited like its list endpoint
+    sections = {
+        "tenants": (
+            select(*columns(User, UserResponse))
+            .join(Tenancy, Tenancy.tenant_id == User.id)
+            .where(Tenancy.property_id == property_id)
+            .where(User.role == "tenant"),
+            [User.created_at, User.id],
+            UserResponse,
+        ),
+        "transactions": (transactions, [Transaction.created_at, Transaction.id], TransactionRead),
+        "responsibilities": (
+            select(Responsibility).where(Responsibility.property_id == property_id),
+            [Responsibility.created_at, Responsibility.id],
+            Responsibility,
+        ),
+        "announcements": (
+            select(Announcement).where(Announcement.property_id == property_id),
+            [Announcement.created_at, Announcement.id],
+            Announcement,
+        ),
+        "tenant_requests": (
+            select(
+                TenantRequest,
+                json_resolutions(RequestResolution, "request_id", TenantRequest.id).label("resolutions"),
+            ).where(TenantRequest.property_id == property_id),
+            [TenantRequest.created_at, TenantRequest.id],
+            TenantRequestRead,
+        ),
+    }
+
+    # Everything is aggregated to JSON on the server, so the page costs one round-trip
+    property_row = select(RentalProperty).where(RentalProperty.id == property_id).subquery()
+    statement = select(
+        cast(select(func.row_to_json(property_row.table_valued())).scalar_subquery(), Text).label("property"),
+        *[
+            json_rows(paginate(section, keyset, None, limit), keyset, descending=True).label(name)
+            for name, (section, keyset, _) in sections.items()
+        ],
+    )
+    row = (await session.exec(statement)).one()
+    if row.property is None:
+        raise HTTPException(status_code=404, detail="Property not found")
+
+    # Rows go back through their models so values serialise exactly as on the list endpoints.
+    # Decimals keep their exact value; the extra row of each section becomes its next cursor.
+    overview = {"property": RentalProperty.model_validate(json.loads(row.property, parse_float=Decimal)), "next_cursors": {}}
+    for name, (_, keyset, model) in sections.items():
+        items = [_parse_row(model, item) for item in json.loads(getattr(row, name), parse_float=Decimal)]
+        overview["next_cursors"][name] = None
+        if len(items) > limit:
+            items = items[:limit]
+            overview["next_cursors"][name] = encode_cursor([getattr(items[-1], column.key) for column in keyset])
+        overview[name] = items
+    return overview
@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
-from typing import List
-from models import RentalProperty, User, Tenancy
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlmodel import select
+from sqlalchemy import delete
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional
+from models import RentalProperty, User, UserResponse, Tenancy, PropertyVersion
 from database import get_session
 from auth import get_current_user
+from versions import bump_property_version, get_property_version
+from events import property_events
+from pagination import paginate, finish_page, page_limit
+from etags import check_property_etag, check_properties_etag
+from response_cache import response_cache
 from datetime import datetime
 
 router = APIRouter()
@@ -11,7 +18,11 @@ router = APIRouter()
 # Protect the rental properties endpoint
 @router.get("/rental-properties", response_model=List[RentalProperty])
 async def get_rental_properties(
-    session: Session = Depends(get_session),
+    request: Request,
+    response: Response,
+    limit: int = page_limit,
+    after: Optional[str] = None,
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):  
     if not current_user:
@@ -24,21 +35,48 @@ async def get_rental_properties(
             .join(Tenancy, Tenancy.property_id == RentalProperty.id)
             .where(Tenancy.tenant_id == current_user.id)
         )
-    results = session.exec(statement)
-    return results.all()
+    # Properties have no creation time, so they are paged by id
+    keyset = [RentalProperty.id]
+    page = paginate(statement, keyset, after, limit)
+    not_modified = await check_properties_etag(request, response, session, page, current_user.role)
+    if not_modified:
+        return not_modified
+    results = await session.exec(page)
+    return finish_page(response, results.all(), keyset, limit)
 
 @router.get("/property/{property_id}", response_model=RentalProperty)
-async def get_property(property_id: int, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
+async def get_property(
+    property_id: int,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    not_modified = await check_property_etag(request, response, session, property_id, current_user.role)
+    if not_modified:
+        return not_modified
     statement = select(RentalProperty).where(RentalProperty.id == property_id)
-    property = session.exec(statement).first()
+    property = (await session.exec(statement)).first()
     if not property:
         raise HTTPException(status_code=404, detail="Property not found")
     return property
 
+# Cheap freshness check: the version changes whenever anything on the property is written
+@router.get("/property/{property_id}/version", response_model=PropertyVersion)
+async def get_version(
+    property_id: int,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    version = await get_property_version(session, property_id)
+    if not version:
+        raise HTTPException(status_code=404, detail="Property not found")
+    return version
+
 @router.post("/add-property", response_model=RentalProperty)
 async def add_property(
     property: RentalProperty,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Ensure the current user is a landlord
@@ -48,43 +86,44 @@ async def add_property(
     # Assign the landlord ID to the property
     property.landlord_id = current_user.id
 
-    # Add the property to the database
+    # Add the property to the database, starting its change version
     session.add(property)
-    session.commit()
-    session.refresh(property)
+    await session.flush()
+    await bump_property_version(session, property.id)
+    await session.commit()
+    await session.refresh(property)
 
     return property
 
 @router.delete("/delete-property/{property_id}")
 async def delete_property(
     property_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Ensure the current user is a landlord
     if current_user.role != "landlord":
         raise HTTPException(status_code=403, detail="Only landlords can delete properties")
 
-    # Fetch the property to be deleted
-    property_statement = select(RentalProperty).where(
+    # Delete the property in one statement; everything that belongs to it
+    # (tenancies, transactions, requests, ...) goes with it (ON DELETE CASCADE)
+    statement = delete(RentalProperty).where(
         RentalProperty.id == property_id,
         RentalProperty.landlord_id == current_user.id
-    )
-    property = session.exec(property_statement).first()
-    if not property:
+    ).returning(RentalProperty.id)
+    if not (await session.exec(statement)).first():
         raise HTTPException(status_code=404, detail="Property not found or does not belong to you")
-
-    # Delete the property
-    session.delete(property)
-    session.commit()
+    await session.commit()
+    await response_cache.invalidate([property_id])
+    await property_events.publish(property_id, "property.deleted", {"id": property_id})
 
     return {"message": "Property deleted successfully"}
 
-@router.post("/add-tenant-to-property/{property_id}/{invite_code}", response_model=User)
+@router.post("/add-tenant-to-property/{property_id}/{invite_code}", response_model=UserResponse)
 async def add_tenant_to_property(
     property_id: int,
     invite_code: str,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):  
     # Ensure the current user is a landlord
@@ -96,13 +135,13 @@ async def add_tenant_to_property(
         RentalProperty.id == property_id,
         RentalProperty.landlord_id == current_user.id
     )
-    property = session.exec(property_statement).first()
+    property = (await session.exec(property_statement)).first()
     if not property:
         raise HTTPException(status_code=404, detail="Property not found or does not belong to you")
 
     # Find the tenant by invite_code
     tenant_statement = select(User).where(User.invite_code == invite_code, User.role == "tenant")
-    tenant = session.exec(tenant_statement).first()
+    tenant = (await session.exec(tenant_statement)).first()
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant with the given invite code not found or invalid role")
 
@@ -111,7 +150,7 @@ async def add_tenant_to_property(
         Tenancy.property_id == property_id,
         Tenancy.tenant_id == tenant.id
     )
-    existing_tenancy = session.exec(tenancy_statement).first()
+    existing_tenancy = (await session.exec(tenancy_statement)).first()
     if existing_tenancy:
         raise HTTPException(status_code=400, detail="Tenant is already associated with this property")
 
@@ -126,8 +165,10 @@ async def add_tenant_to_property(
     # Create a copy of the tenant object before committing
     added_tenant = tenant.model_dump()  # Convert to a dictionary if using SQLModel
 
-    session.commit()
-    session.refresh(new_tenancy)
+    await bump_property_version(session, property_id)
+    await session.commit()
+    await session.refresh(new_tenancy)
+    await property_events.publish(property_id, "tenant.added", UserResponse.model_validate(added_tenant))
     
     return added_tenant
 
@@ -135,7 +176,7 @@ async def add_tenant_to_property(
 async def remove_tenant_from_property(
     property_id: int,
     tenant_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Ensure the current user is a landlord
@@ -147,7 +188,7 @@ async def remove_tenant_from_property(
         RentalProperty.id == property_id,
         RentalProperty.landlord_id == current_user.id
     )
-    property = session.exec(property_statement).first()
+    property = (await session.exec(property_statement)).first()
     if not property:
         raise HTTPException(status_code=404, detail="Property not found or does not belong to you")
 
@@ -156,20 +197,22 @@ async def remove_tenant_from_property(
         Tenancy.property_id == property_id,
         Tenancy.tenant_id == tenant_id
     )
-    tenancy = session.exec(tenancy_statement).first()
+    tenancy = (await session.exec(tenancy_statement)).first()
     if not tenancy:
         raise HTTPException(status_code=404, detail="Tenant is not associated with this property")
 
     # Delete the tenancy record
-    session.delete(tenancy)
-    session.commit()
+    await session.delete(tenancy)
+    await bump_property_version(session, property_id)
+    await session.commit()
+    await property_events.publish(property_id, "tenant.removed", {"id": tenant_id})
 
     return {"message": "Tenant removed from property successfully"}
 
 @router.delete("/leave-property/{property_id}")
 async def leave_property(
     property_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Ensure the current user is a tenant
@@ -181,12 +224,14 @@ async def leave_property(
         Tenancy.property_id == property_id,
         Tenancy.tenant_id == current_user.id
     )
-    tenancy = session.exec(tenancy_statement).first()
+    tenancy = (await session.exec(tenancy_statement)).first()
     if not tenancy:
         raise HTTPException(status_code=404, detail="You are not associated with this property")
 
     # Delete the tenancy record
-    session.delete(tenancy)
-    session.commit()
+    await session.delete(tenancy)
+    await bump_property_version(session, property_id)
+    await session.commit()
+    await property_events.publish(property_id, "tenant.removed", {"id": current_user.id})
 
     return {"message": "You have successfully left the property"}
\ No newline at end of file
@@ -0,0 +1,97 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models import RecurringTransaction, User, RentalProperty, validate_fields
+from database import get_session
+from auth import get_current_user
+from versions import bump_property_version
+from recurring import materialize_due
+from typing import List
+
+router = APIRouter()
+
+async def _owned_property(session: AsyncSession, property_id: int, current_user: User):
+    property_statement = select(RentalProperty).where(
+        RentalProperty.id == property_id,
+        RentalProperty.landlord_id == current_user.id
+    )
+    property = (await session.exec(property_statement)).first()
+    if not property:
+        raise HTTPException(status_code=404, detail="Property not found or does not belong to you")
+    return property
+
+@router.get("/recurring-transactions/{property_id}", response_model=List[RecurringTransaction])
+async def get_recurring_transactions(
+    property_id: int,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    # Ensure the current user is a landlord
+    if current_user.role != "landlord":
+        raise HTTPException(status_code=403, detail="Only landlords can view recurring transactions")
+    await _owned_property(session, property_id, current_user)
+
+    statement = (
+        select(RecurringTransaction)
+        .where(RecurringTransaction.property_id == property_id)
+        .order_by(RecurringTransaction.id)
+    )
+    return (await session.exec(statement)).all()
+
+@router.post("/add-recurring-transaction/{property_id}", response_model=RecurringTransaction)
+async def create_recurring_transaction(
+    property_id: int,
+    template: RecurringTransaction,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    # Ensure the current user is a landlord
+    if current_user.role != "landlord":
+        raise HTTPException(status_code=403, detail="Only landlords can create recurring transactions")
+    await _owned_property(session, property_id, current_user)
+
+    validate_fields(template)
+    if template.payee_role not in ("tenant", "landlord"):
+        raise HTTPException(status_code=400, detail="Invalid payee role")
+    if template.end_date and template.end_date < template.start_date:
+        raise HTTPException(status_code=400, detail="The end date is before the start date")
+
+    new_template = RecurringTransaction(
+        property_id=property_id,
+        type=template.type,
+        amount=template.amount,
+        payee_role=template.payee_role,
+        is_visible_to_tenants=template.is_visible_to_tenants,
+        start_date=template.start_date,
+        end_date=template.end_date,
+        next_due_date=template.start_date,
+    )
+    session.add(new_template)
+    await session.commit()
+
+    # Create the occurrences already due (a start date in the past catches up at once)
+    await materialize_due(session, template_ids=[new_template.id])
+    await session.refresh(new_template)
+    return new_template
+
+@router.delete("/delete-recurring-transaction/{template_id}")
+async def delete_recurring_transaction(
+    template_id: int,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    # Ensure the current user is a landlord
+    if current_user.role != "landlord":
+        raise HTTPException(status_code=403, detail="Only landlords can delete recurring transactions")
+
+    template = (await session.exec(select(RecurringTransaction).where(RecurringTransaction.id == template_id))).first()
+    if not template:
+        raise HTTPException(status_code=404, detail="Recurring transaction not found")
+    await _owned_property(session, template.property_id, current_user)
+
+    # Transactions already created stay, they just no longer belong to a template (ON DELETE SET NULL)
+    await session.delete(template)
+    await bump_property_version(session, template.property_id)
+    await session.commit()
+
+    return {"message": "Recurring transaction deleted successfully"}
@@ -1,104 +1,110 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
-from models import Responsibility, User, RentalProperty
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models import Responsibility, User, validate_fields
 from database import get_session
 from auth import get_current_user
-from typing import List
+from owned_writes import insert_owned, update_owned, delete_owned, raise_missing_or_forbidden
+from events import property_events
+from pagination import paginate, finish_page, page_limit
+from response_cache import response_cache
+from fast_json import columns, dump_rows
+from typing import List, Optional
+from datetime import date, datetime
 
 router = APIRouter()
 
 @router.get("/responsibilities/{property_id}", response_model=List[Responsibility])
-async def get_responsibilities(property_id: int, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
-    statement = select(Responsibility).where(Responsibility.property_id == property_id)
-    responsibilities = session.exec(statement).all()
+async def get_responsibilities(
+    property_id: int,
+    request: Request,
+    response: Response,
+    limit: int = page_limit,
+    after: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    cached = await response_cache.lookup(request, session, property_id, current_user)
+    if cached.response:
+        return cached.response
+
+    statement = select(*columns(Responsibility)).where(Responsibility.property_id == property_id)
+    if start_date:
+        statement = statement.where(Responsibility.due_date >= start_date)
+    if end_date:
+        statement = statement.where(Responsibility.due_date <= end_date)
+
+    # One page ordered by creation, starting after the cursor
+    keyset = [Responsibility.created_at, Responsibility.id]
+    page = paginate(statement, keyset, after, limit)
+    responsibilities = (await session.exec(page)).all()
     if not responsibilities:
         raise HTTPException(status_code=404, detail="Responsibilities not found")
-    return responsibilities
+    return await cached.store(response, dump_rows(finish_page(response, responsibilities, keyset, limit)))
 
 @router.post("/add-responsibility/{property_id}", response_model=Responsibility)
-async def add_responsibility(property_id: int, responsibility: Responsibility, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
+async def add_responsibility(property_id: int, responsibility: Responsibility, session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user)):
     # Ensure the current user is a landlord
     if current_user.role != "landlord":
         raise HTTPException(status_code=403, detail="Only landlords can add responsibilities")
 
-    # Check if the property exists and belongs to the current landlord
-    property_statement = select(RentalProperty).where(
-        RentalProperty.id == property_id,
-        RentalProperty.landlord_id == current_user.id
-    )
-    property = session.exec(property_statement).first()
-    if not property:
+    # Create the responsibility if the property belongs to the current landlord, in one statement
+    validate_fields(responsibility)
+    new_responsibility = await insert_owned(session, Responsibility, property_id, current_user.id, {
+        "title": responsibility.title,
+        "description": responsibility.description,
+        "due_date": responsibility.due_date,
+        "created_at": datetime.utcnow(),
+    })
+    if not new_responsibility:
         raise HTTPException(status_code=404, detail="Property not found or does not belong to you")
 
-    # Create a new responsibility
-    new_responsibility = Responsibility(
-        property_id=property_id,
-        title=responsibility.title,
-        description=responsibility.description,
-        due_date=responsibility.due_date
-    )
-
-    session.add(new_responsibility)
-    session.commit()
-    session.refresh(new_responsibility)
+    await session.commit()
+    await property_events.publish(property_id, "responsibility.added", new_responsibility)
 
     return new_responsibility
 
 @router.put("/update-responsibility/{responsibility_id}", response_model=Responsibility)
-async def update_responsibility(responsibility_id: int, updated_responsibility: Responsibility, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
+async def update_responsibility(responsibility_id: int, updated_responsibility: Responsibility, session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user)):
     # Ensure the current user is a landlord
     if current_user.role != "landlord":
         raise HTTPException(status_code=403, detail="Only landlords can update responsibilities")
 
-    # Fetch the responsibility to be updated
-    responsibility_statement = select(Responsibility).where(Responsibility.id == responsibility_id)
-    responsibility = session.exec(responsibility_statement).first()
+    # Update the responsibility if its property belongs to the current landlord
+    validate_fields(updated_responsibility)
+    responsibility = await update_owned(session, Responsibility, responsibility_id, current_user.id, {
+        "title": updated_responsibility.title,
+        "description": updated_responsibility.description,
+        "due_date": updated_responsibility.due_date,
+    })
     if not responsibility:
-        raise HTTPException(status_code=404, detail="Responsibility not found")
-
-    # Check if the property belongs to the current landlord
-    property_statement = select(RentalProperty).where(
-        RentalProperty.id == responsibility.property_id,
-        RentalProperty.landlord_id == current_user.id
-    )
-    property = session.exec(property_statement).first()
-    if not property:
-        raise HTTPException(status_code=403, detail="You do not have permission to update this responsibility")
-
-    # Update responsibility fields
-    responsibility.title = updated_responsibility.title
-    responsibility.description = updated_responsibility.description
-    responsibility.due_date = updated_responsibility.due_date
-
-    session.add(responsibility)
-    session.commit()
-    session.refresh(responsibility)
+        await raise_missing_or_forbidden(
+            session, Responsibility, responsibility_id,
+            "Responsibility not found", "You do not have permission to update this responsibility",
+        )
+
+    await session.commit()
+    await property_events.publish(responsibility.property_id, "responsibility.updated", responsibility)
 
     return responsibility
 
 @router.delete("/delete-responsibility/{responsibility_id}")
-async def delete_responsibility(responsibility_id: int, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
+async def delete_responsibility(responsibility_id: int, session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user)):
     # Ensure the current user is a landlord
     if current_user.role != "landlord":
         raise HTTPException(status_code=403, detail="Only landlords can delete responsibilities")
 
-    # Fetch the responsibility to be deleted
-    responsibility_statement = select(Responsibility).where(Responsibility.id == responsibility_id)
-    responsibility = session.exec(responsibility_statement).first()
+    # Delete the responsibility if its property belongs to the current landlord
+    responsibility = await delete_owned(session, Responsibility, responsibility_id, current_user.id)
     if not responsibility:
-        raise HTTPException(status_code=404, detail="Responsibility not found")
-
-    # Check if the property belongs to the current landlord
-    property_statement = select(RentalProperty).where(
-        RentalProperty.id == responsibility.property_id,
-        RentalProperty.landlord_id == current_user.id
-    )
-    property = session.exec(property_statement).first()
-    if not property:
-        raise HTTPException(status_code=403, detail="You do not have permission to delete this responsibility")
-
-    # Delete the responsibility
-    session.delete(responsibility)
-    session.commit()
+        await raise_missing_or_forbidden(
+            session, Responsibility, responsibility_id,
+            "Responsibility not found", "You do not have permission to delete this responsibility",
+        )
+
+    await session.commit()
+    await property_events.publish(responsibility.property_id, "responsibility.deleted", {"id": responsibility_id})
 
     return {"message": "Responsibility deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models import User
+from database import get_session
+from auth import get_current_user
+from ledger import statistics_totals
+from typing import Optional
+from datetime import date
+
+router = APIRouter()
+
+# Series returned by /statistics and the keys each one is grouped by
+STATISTICS_SERIES = {
+    "by_payee_role": ["payee_role"],
+    "by_month": ["month", "payee_role"],
+    "by_type": ["month", "type", "payee_role"],
+    "by_property": ["property_id", "payee_role"],
+}
+
+async def _series(session: AsyncSession, statement, keys: list):
+    # Turn grouped rows into a list of dicts, formatting month buckets as "YYYY-MM"
+    series = []
+    for row in (await session.exec(statement)).all():
+        entry = dict(zip(keys, row[:len(keys)]))
+        if "month" in entry:
+            entry["month"] = entry["month"].strftime("%Y-%m")
+        entry["total"] = row.total
+        entry["count"] = row.count
+        series.append(entry)
+    return series
+
+@router.get("/statistics", response_model=dict)
+async def get_statistics(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    property_id: Optional[int] = None,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    # Ensure the current user is a landlord
+    if current_user.role != "landlord":
+        raise HTTPException(status_code=403, detail="Only landlords can view statistics for their properties")
+
+    filters = {"start_date": start_date, "end_date": end_date, "property_id": property_id}
+
+    # Aggregate resolved transactions in SQL, returning only the compact series the charts need
+    return {
+        name: await _series(session, statistics_totals(current_user.id, keys, **filters), keys)
+        for name, keys in STATISTICS_SERIES.items()
+    }
@@ -1,52 +1,146 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
-from sqlmodel import Session, select
-from models import TenantRequest, RequestResolution, User
+from fastapi import APIRouter, Depends, HTTPException, Body, Request, Response
+from sqlmodel import select
+from sqlalchemy import and_, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models import TenantRequest, TenantRequestRead, RequestResolution, RequestResolutionBatch, User, validate_fields
 from database import get_session
 from auth import get_current_user
-from typing import List
-from datetime import datetime
+from versions import bump_property_version
+from owned_writes import write_and_bump, raise_missing_or_forbidden
+from events import property_events
+from pagination import paginate, finish_page, page_limit
+from etags import check_property_etag
+from fast_json import columns, dump_rows, json_response
+from typing import List, Optional
+from datetime import datetime, date
 
 router = APIRouter()
 
-@router.get("/tenant-request/{property_id}", response_model=List[TenantRequest])
-async def get_tenant_requests(property_id: int, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
-    statement = select(TenantRequest).where(TenantRequest.property_id == property_id)
-    requests = session.exec(statement).all()
+# Condition that a request has resolutions and none of them is still pending
+def request_fully_resolved():
+    resolutions = select(RequestResolution.id).where(RequestResolution.request_id == TenantRequest.id)
+    return and_(
+        resolutions.exists(),
+        ~resolutions.where(RequestResolution.status == "pending").exists(),
+    )
+
+# Resolution rows joined with the user's name and role, as returned to the client
+def resolution_details(results):
+    return [
+        {
+            "resolution_id": resolution.id,
+            "request_id": resolution.request_id,
+            "user_id": resolution.user_id,
+            "status": resolution.status,
+            "resolved_at": resolution.resolved_at,
+            "user_name": name,
+            "user_role": role
+        }
+        for resolution, name, role in results
+    ]
+
+# Resolutions of several requests with a single joined query, keyed by request id
+async def resolutions_by_request(session: AsyncSession, request_ids: List[int]):
+    statement = (
+        select(RequestResolution, User.name, User.role)
+        .join(User, RequestResolution.user_id == User.id)
+        .where(RequestResolution.request_id.in_(request_ids))
+        .order_by(RequestResolution.id)
+    )
+    grouped = {request_id: [] for request_id in request_ids}
+    for detail in resolution_details((await session.exec(statement)).all()):
+        grouped[detail["request_id"]].append(detail)
+    return grouped
+
+# Push the request's current resolutions to clients watching the property
+async def publish_resolutions(session: AsyncSession, tenant_request: TenantRequest):
+    resolutions = await resolutions_by_request(session, [tenant_request.id])
+    await property_events.publish(tenant_request.property_id, "request.resolutions", {
+        "request_id": tenant_request.id,
+        "resolutions": resolutions[tenant_request.id],
+    })
+
+# Insert resolutions of a request with the version bump of its property; returns the rows written
+async def add_resolutions(session: AsyncSession, statement, tenant_request: TenantRequest):
+    try:
+        return await write_and_bump(session, statement, RequestResolution, tenant_request.property_id)
+    except IntegrityError:
+        # The only foreign key left to fail is the user's
+        await session.rollback()
+        raise HTTPException(status_code=404, detail="User not found")
+
+@router.get("/tenant-request/{property_id}", response_model=List[TenantRequestRead])
+async def get_tenant_requests(
+    property_id: int,
+    request: Request,
+    response: Response,
+    limit: int = page_limit,
+    after: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    status: Optional[str] = None,
+    include: Optional[str] = None,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    if include not in (None, "resolutions"):
+        raise HTTPException(status_code=400, detail="Invalid include option")
+    # The property's version identifies the response, so revalidating reads no rows
+    not_modified = await check_property_etag(request, response, session, property_id, current_user.role)
+    if not_modified:
+        return not_modified
+
+    statement = select(*columns(TenantRequest)).where(TenantRequest.property_id == property_id)
+
+    # Optional filters on request date and resolution status
+    if start_date:
+        statement = statement.where(TenantRequest.request_date >= start_date)
+    if end_date:
+        statement = statement.where(TenantRequest.request_date <= end_date)
+    if status == "resolved":
+        statement = statement.where(request_fully_resolved())
+    elif status == "pending":
+        statement = statement.where(~request_fully_resolved())
+    elif status:
+        raise HTTPException(status_code=400, detail="Invalid resolution status")
+
+    # One page ordered by creation, starting after the cursor
+    keyset = [TenantRequest.created_at, TenantRequest.id]
+    page = paginate(statement, keyset, after, limit)
+
+    requests = (await session.exec(page)).all()
     if not requests:
         raise HTTPException(status_code=404, detail="Tenant requests not found")
-    return requests
+    requests = finish_page(response, requests, keyset, limit)
+
+    # Nest the page's resolutions so the client does not fetch them per request
+    resolutions = {}
+    if include == "resolutions":
+        resolutions = await resolutions_by_request(session, [tenant_request.id for tenant_request in requests])
+    rows = [dict(tenant_request._mapping, resolutions=resolutions.get(tenant_request.id)) for tenant_request in requests]
+    return json_response(response, dump_rows(rows))
 
 @router.get("/request-resolutions/{request_id}", response_model=List[dict])
-async def get_request_resolutions(request_id: int, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
+async def get_request_resolutions(request_id: int, session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user)):
     statement = (
         select(RequestResolution, User.name, User.role)
         .join(User, RequestResolution.user_id == User.id)
         .where(RequestResolution.request_id == request_id)
     )
-    results = session.exec(statement).all()
+    results = (await session.exec(statement)).all()
     if not results:
         raise HTTPException(status_code=404, detail="Request resolutions not found")
     
     # Format the response to include resolution details along with user names and roles
-    response = [
-        {
-            "resolution_id": resolution.id,
-            "request_id": resolution.request_id,
-            "user_id": resolution.user_id,
-            "status": resolution.status,
-            "resolved_at": resolution.resolved_at,
-            "user_name": name,
-            "user_role": role
-        }
-        for resolution, name, role in results
-    ]
-    return response
+    return resolution_details(results)
 
 @router.post("/add-tenant-request/{property_id}", response_model=TenantRequest)
 async def add_tenant_request(
     property_id: int,
     tenant_request: TenantRequest = Body(...),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Only tenants can add requests
@@ -54,6 +148,7 @@ async def add_tenant_request(
         raise HTTPException(status_code=403, detail="Only tenants can add requests")
 
     # Create a new tenant request
+    validate_fields(tenant_request)
     new_request = TenantRequest(
         tenant_id=current_user.id,
         property_id=property_id,
@@ -62,15 +157,17 @@ async def add_tenant_request(
         request_date=tenant_request.request_date if tenant_request.request_date else datetime.utcnow().date()
     )
     session.add(new_request)
-    session.commit()
-    session.refresh(new_request)
+    await bump_property_version(session, property_id)
+    await session.commit()
+    await session.refresh(new_request)
+    await property_events.publish(property_id, "request.created", new_request)
     return new_request
 
 @router.put("/update-tenant-request/{request_id}", response_model=TenantRequest)
 async def update_tenant_request(
     request_id: int,
     updated_request: TenantRequest = Body(...),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Only tenants can update their own requests
@@ -78,53 +175,52 @@ async def update_tenant_request(
         raise HTTPException(status_code=403, detail="Only tenants can update requests")
 
     request_statement = select(TenantRequest).where(TenantRequest.id == request_id)
-    tenant_request = session.exec(request_statement).first()
+    tenant_request = (await session.exec(request_statement)).first()
     if not tenant_request:
         raise HTTPException(status_code=404, detail="Tenant request not found")
     if tenant_request.tenant_id != current_user.id:
         raise HTTPException(status_code=403, detail="You can only update your own requests")
 
+    validate_fields(updated_request)
     tenant_request.title = updated_request.title
     tenant_request.description = updated_request.description
     tenant_request.request_date = updated_request.request_date
 
     session.add(tenant_request)
-    session.commit()
-    session.refresh(tenant_request)
+    await bump_property_version(session, tenant_request.property_id)
+    await session.commit()
+    await session.refresh(tenant_request)
+    await property_events.publish(tenant_request.property_id, "request.updated", tenant_request)
     return tenant_request
 
 @router.delete("/delete-tenant-request/{request_id}")
 async def delete_tenant_request(
     request_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Only tenants can delete their own requests
     if current_user.role != "tenant":
         raise HTTPException(status_code=403, detail="Only tenants can delete requests")
 
-    request_statement = select(TenantRequest).where(TenantRequest.id == request_id)
-    tenant_request = session.exec(request_statement).first()
-    if not tenant_request:
-        raise HTTPException(status_code=404, detail="Tenant request not found")
-    if tenant_request.tenant_id != current_user.id:
-        raise HTTPException(status_code=403, detail="You can only delete your own requests")
-
-    # Delete all resolutions associated with the request
-    resolution_statement = select(RequestResolution).where(RequestResolution.request_id == request_id)
-    resolutions = session.exec(resolution_statement).all()
-    for resolution in resolutions:
-        session.delete(resolution)
-
-    session.delete(tenant_request)
-    session.commit()
+    # Delete the request if it is the tenant's own, with its version bump; the resolutions cascade
+    statement = delete(TenantRequest).where(TenantRequest.id == request_id, TenantRequest.tenant_id == current_user.id)
+    deleted = await write_and_bump(session, statement, TenantRequest)
+    if not deleted:
+        await raise_missing_or_forbidden(
+            session, TenantRequest, request_id,
+            "Tenant request not found", "You can only delete your own requests",
+        )
+    tenant_request = deleted[0]
+    await session.commit()
+    await property_events.publish(tenant_request.property_id, "request.deleted", {"id": request_id})
     return {"message": "Tenant request and its resolutions deleted successfully"}
 
 
 @router.post("/add-request-resolution", response_model=dict)
 async def add_request_resolution(
     resolution: RequestResolution,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Only tenants can add request resolutions
@@ -137,38 +233,72 @@ async def add_request_resolution(
 
     # Check if the request exists
     request_statement = select(TenantRequest).where(TenantRequest.id == resolution.request_id)
-    tenant_request = session.exec(request_statement).first()
+    tenant_request = (await session.exec(request_statement)).first()
     if not tenant_request:
         raise HTTPException(status_code=404, detail="Tenant request not found")
 
-    # Check if there is already a resolution for this user and request
-    resolution_statement = select(RequestResolution).where(
-        RequestResolution.request_id == resolution.request_id,
-        RequestResolution.user_id == resolution.user_id
-    )
-    existing_resolution = session.exec(resolution_statement).first()
-    if existing_resolution:
-        raise HTTPException(status_code=400, detail="Resolution already exists for this request and user")
-
-    # Create a new resolution
-    new_resolution = RequestResolution(
+    # Insert the resolution unless the user already has one; a missing user fails the foreign key
+    statement = insert(RequestResolution).values(
         request_id=resolution.request_id,
         user_id=resolution.user_id,
         status=resolution.status,
         resolved_at=datetime.utcnow() if resolution.status == "resolved" else None
-    )
+    ).on_conflict_do_nothing(constraint="uq_request_resolutions_request_id_user_id")
+    new_resolutions = await add_resolutions(session, statement, tenant_request)
+    if not new_resolutions:
+        await session.rollback()
+        raise HTTPException(status_code=400, detail="Resolution already exists for this request and user")
+
+    await session.commit()
+    await publish_resolutions(session, tenant_request)
+
+    return {"message": "Request resolution added successfully", "resolution_id": new_resolutions[0].id}
+
+@router.post("/add-request-resolutions", response_model=dict)
+async def add_request_resolutions(
+    batch: RequestResolutionBatch,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    # Only tenants can add request resolutions
+    if current_user.role != "tenant":
+        raise HTTPException(status_code=403, detail="Only tenants can add request resolutions")
+
+    # Ensure the resolution status is valid
+    if batch.status not in ["resolved", "pending"]:
+        raise HTTPException(status_code=400, detail="Invalid resolution status")
+
+    user_ids = list(dict.fromkeys(batch.user_ids))
+    if not user_ids:
+        raise HTTPException(status_code=400, detail="No users given")
+
+    # Check if the request exists
+    request_statement = select(TenantRequest).where(TenantRequest.id == batch.request_id)
+    tenant_request = (await session.exec(request_statement)).first()
+    if not tenant_request:
+        raise HTTPException(status_code=404, detail="Tenant request not found")
+
+    # Insert all resolutions with a single multi-row INSERT; none may exist yet
+    resolved_at = datetime.utcnow() if batch.status == "resolved" else None
+    statement = insert(RequestResolution).values([
+        {"request_id": batch.request_id, "user_id": user_id, "status": batch.status, "resolved_at": resolved_at}
+        for user_id in user_ids
+    ]).on_conflict_do_nothing(constraint="uq_request_resolutions_request_id_user_id")
+    new_resolutions = await add_resolutions(session, statement, tenant_request)
+    if len(new_resolutions) < len(user_ids):
+        await session.rollback()
+        raise HTTPException(status_code=400, detail="Resolution already exists for this request and user")
 
-    session.add(new_resolution)
-    session.commit()
-    session.refresh(new_resolution)
+    await session.commit()
+    await publish_resolutions(session, tenant_request)
 
-    return {"message": "Request resolution added successfully", "resolution_id": new_resolution.id}
+    return {"message": "Request resolutions added successfully", "resolution_ids": [resolution.id for resolution in new_resolutions]}
 
 @router.delete("/remove-request-resolution/{request_id}/{user_id}")
 async def remove_request_resolution(
     request_id: int,
     user_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Only tenants can remove their own request resolutions
@@ -180,20 +310,23 @@ async def remove_request_resolution(
         RequestResolution.request_id == request_id,
         RequestResolution.user_id == user_id
     )
-    resolution = session.exec(resolution_statement).first()
+    resolution = (await session.exec(resolution_statement)).first()
     if not resolution:
         raise HTTPException(status_code=404, detail="Request resolution not found")
+    tenant_request = (await session.exec(select(TenantRequest).where(TenantRequest.id == request_id))).one()
 
     # Delete the request resolution
-    session.delete(resolution)
-    session.commit()
+    await session.delete(resolution)
+    await bump_property_version(session, tenant_request.property_id)
+    await session.commit()
+    await publish_resolutions(session, tenant_request)
 
     return {"message": "Request resolution removed successfully"}
 
 @router.put("/resolve-tenant-request/{request_id}")
 async def resolve_tenant_request(
     request_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Ensure the current user is authenticated
@@ -203,7 +336,7 @@ async def resolve_tenant_request(
     # Check if the tenant request exists
     from models import TenantRequest, RequestResolution  # Ensure import if not already
     request_statement = select(TenantRequest).where(TenantRequest.id == request_id)
-    tenant_request = session.exec(request_statement).first()
+    tenant_request = (await session.exec(request_statement)).first()
     if not tenant_request:
         raise HTTPException(status_code=404, detail="Tenant request not found")
 
@@ -212,7 +345,7 @@ async def resolve_tenant_request(
         RequestResolution.request_id == request_id,
         RequestResolution.user_id == current_user.id
     )
-    resolution = session.exec(resolution_statement).first()
+    resolution = (await session.exec(resolution_statement)).first()
     if not resolution:
         raise HTTPException(status_code=404, detail="Resolution not found for this request and user")
 
@@ -221,13 +354,17 @@ async def resolve_tenant_request(
         resolution.status = "resolved"
         resolution.resolved_at = datetime.now()
         session.add(resolution)
-        session.commit()
-        session.refresh(resolution)
+        await bump_property_version(session, tenant_request.property_id)
+        await session.commit()
+        await session.refresh(resolution)
+        await publish_resolutions(session, tenant_request)
         return {"message": "Request resolution updated to resolved", "resolution_id": resolution.id}
     else:
         resolution.status = "pending"
         resolution.resolved_at = None
         session.add(resolution)
-        session.commit()
-        session.refresh(resolution)
+        await bump_property_version(session, tenant_request.property_id)
+        await session.commit()
+        await session.refresh(resolution)
+        await publish_resolutions(session, tenant_request)
         return {"message": "Request resolution updated to pending", "resolution_id": resolution.id}
\ No newline at end of file
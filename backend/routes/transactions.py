@@ -1,116 +1,210 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
-from models import Transaction, TransactionResolution, User, RentalProperty
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlmodel import select
+from sqlalchemy import update, delete, case
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models import Transaction, TransactionRead, TransactionResolution, TransactionResolutionBatch, User, RentalProperty, validate_fields
 from database import get_session
 from auth import get_current_user
-from typing import List
-from datetime import datetime
+from owned_writes import owned_by, insert_owned, update_owned, delete_owned, write_and_bump
+from versions import bump_property_version
+from events import property_events
+from ledger import resolved_transactions_for_landlord, transaction_fully_resolved, rollup_snapshot, snapshot_of, update_rollup, remove_transactions
+from pagination import paginate, finish_page, page_limit
+from response_cache import response_cache
+from fast_json import columns, dump_rows
+from typing import List, Optional
+from datetime import datetime, date
 
 router = APIRouter()
 
-@router.get("/transactions/{property_id}", response_model=List[Transaction])
-async def get_transactions(property_id: int, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
+# Resolution rows joined with the user's name and role, as returned to the client
+def resolution_details(results):
+    return [
+        {
+            "resolution_id": resolution.id,
+            "transaction_id": resolution.transaction_id,
+            "user_id": resolution.user_id,
+            "status": resolution.status,
+            "resolved_at": resolution.resolved_at,
+            "user_name": name,
+            "user_role": role
+        }
+        for resolution, name, role in results
+    ]
+
+# Resolutions of several transactions with a single joined query, keyed by transaction id
+async def resolutions_by_transaction(session: AsyncSession, transaction_ids: List[int]):
+    statement = (
+        select(TransactionResolution, User.name, User.role)
+        .join(User, TransactionResolution.user_id == User.id)
+        .where(TransactionResolution.transaction_id.in_(transaction_ids))
+        .order_by(TransactionResolution.id)
+    )
+    grouped = {transaction_id: [] for transaction_id in transaction_ids}
+    for detail in resolution_details((await session.exec(statement)).all()):
+        grouped[detail["transaction_id"]].append(detail)
+    return grouped
+
+# Push a change to clients watching the property; tenants only hear about visible transactions
+async def publish_transaction(transaction: Transaction, type: str, data):
+    audience = "all" if transaction.is_visible_to_tenants else "landlord"
+    await property_events.publish(transaction.property_id, type, data, audience)
+
+# Push the transaction's current resolutions after one of them changed
+async def publish_resolutions(session: AsyncSession, transaction: Transaction):
+    resolutions = await resolutions_by_transaction(session, [transaction.id])
+    await publish_transaction(transaction, "transaction.resolutions", {
+        "transaction_id": transaction.id,
+        "resolutions": resolutions[transaction.id],
+    })
+
+# 404 if the transaction (its rollup snapshot) does not exist, 403 if it is another landlord's
+def check_transaction_owner(snapshot, current_user: User, forbidden: str):
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    if snapshot[0]["landlord_id"] != current_user.id:
+        raise HTTPException(status_code=403, detail=forbidden)
+
+# The transaction, if its property belongs to the current landlord
+async def owned_transaction(session: AsyncSession, transaction_id: int, current_user: User):
+    statement = (
+        select(Transaction, RentalProperty.landlord_id)
+        .join(RentalProperty, RentalProperty.id == Transaction.property_id)
+        .where(Transaction.id == transaction_id)
+    )
+    row = (await session.exec(statement)).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    transaction, landlord_id = row
+    if landlord_id != current_user.id:
+        raise HTTPException(status_code=403, detail="You do not have permission to change this transaction's resolutions")
+    return transaction
+
+# Run an INSERT ... ON CONFLICT DO NOTHING of resolutions with the property's version bump; returns the new ones
+async def add_resolutions(session: AsyncSession, statement, transaction: Transaction):
+    try:
+        return await write_and_bump(session, statement, TransactionResolution, transaction.property_id)
+    except IntegrityError:
+        # The only foreign key left to fail is the user's
+        await session.rollback()
+        raise HTTPException(status_code=404, detail="User not found")
+
+@router.get("/transactions/{property_id}", response_model=List[TransactionRead])
+async def get_transactions(
+    property_id: int,
+    request: Request,
+    response: Response,
+    limit: int = page_limit,
+    after: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    type: Optional[str] = None,
+    status: Optional[str] = None,
+    include: Optional[str] = None,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
     if not current_user:
         raise HTTPException(status_code=401, detail="User not authenticated")
+    if include not in (None, "resolutions"):
+        raise HTTPException(status_code=400, detail="Invalid include option")
+    cached = await response_cache.lookup(request, session, property_id, current_user)
+    if cached.response:
+        return cached.response
+
+    # Plain column rows: they are encoded straight to JSON without building models
     if current_user.role == "tenant":
         statement = (
-            select(Transaction)
+            select(*columns(Transaction))
             .where(Transaction.property_id == property_id)
             .where(Transaction.is_visible_to_tenants == True)
         )    
     else:
-        statement = select(Transaction).where(Transaction.property_id == property_id)
-    transactions = session.exec(statement).all()
+        statement = select(*columns(Transaction)).where(Transaction.property_id == property_id)
+
+    # Optional filters on due date, type and resolution status
+    if start_date:
+        statement = statement.where(Transaction.due_date >= start_date)
+    if end_date:
+        statement = statement.where(Transaction.due_date <= end_date)
+    if type:
+        statement = statement.where(Transaction.type == type)
+    if status == "resolved":
+        statement = statement.where(transaction_fully_resolved())
+    elif status == "pending":
+        statement = statement.where(~transaction_fully_resolved())
+    elif status:
+        raise HTTPException(status_code=400, detail="Invalid resolution status")
+
+    # One page ordered by creation, starting after the cursor
+    keyset = [Transaction.created_at, Transaction.id]
+    page = paginate(statement, keyset, after, limit)
+
+    transactions = (await session.exec(page)).all()
     if not transactions:
         raise HTTPException(status_code=404, detail="Transactions not found")
-    return transactions
+    transactions = finish_page(response, transactions, keyset, limit)
+
+    # Nest the page's resolutions so the client does not fetch them per transaction
+    resolutions = {}
+    if include == "resolutions":
+        resolutions = await resolutions_by_transaction(session, [transaction.id for transaction in transactions])
+    rows = [dict(transaction._mapping, resolutions=resolutions.get(transaction.id)) for transaction in transactions]
+    return await cached.store(response, dump_rows(rows))
 
 @router.get("/all-resolved-transactions", response_model=List[Transaction])
 async def get_resolved_transactions(
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Ensure the current user is a landlord
     if current_user.role != "landlord":
         raise HTTPException(status_code=403, detail="Only landlords can view all transactions for their properties")
 
-    # Get all properties owned by the landlord
-    property_statement = select(RentalProperty.id).where(RentalProperty.landlord_id == current_user.id)
-    property_ids = session.exec(property_statement).all()
-    if not property_ids:
-        return []
-
-    # Get all transactions for these properties
-    transaction_statement = select(Transaction).where(Transaction.property_id.in_(property_ids))
-    transactions = session.exec(transaction_statement).all()
-
-    # Filter transactions: only those where all resolutions are "resolved"
-    resolved_transactions = []
-    for transaction in transactions:
-        resolutions = session.exec(
-            select(TransactionResolution.status).where(TransactionResolution.transaction_id == transaction.id)
-        ).all()
-        if resolutions and all(status == "resolved" for status in resolutions):
-            resolved_transactions.append(transaction)
-        # If there are no resolutions, do not include the transaction
-
-    return resolved_transactions
+    # Only transactions where all resolutions are "resolved", computed in a single query
+    statement = resolved_transactions_for_landlord(current_user.id)
+    return (await session.exec(statement)).all()
 
 @router.get("/transaction-resolutions/{transaction_id}", response_model=List[dict])
-async def get_transaction_resolutions(transaction_id: int, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
+async def get_transaction_resolutions(transaction_id: int, session: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user)):
     statement = select(TransactionResolution, User.name, User.role).join(User, TransactionResolution.user_id == User.id).where(TransactionResolution.transaction_id == transaction_id)
-    results = session.exec(statement).all()
+    results = (await session.exec(statement)).all()
     if not results:
         raise HTTPException(status_code=404, detail="Transaction resolutions not found")
     
     # Format the response to include resolution details along with user names and roles
-    response = [
-        {
-            "resolution_id": resolution.id,
-            "transaction_id": resolution.transaction_id,
-            "user_id": resolution.user_id,
-            "status": resolution.status,
-            "resolved_at": resolution.resolved_at,
-            "user_name": name,
-            "user_role": role
-        }
-        for resolution, name, role in results
-    ]
-    return response
+    return resolution_details(results)
 
 @router.post("/add-transaction/{property_id}", response_model=Transaction)
 async def create_transaction(
     property_id: int,
     transaction: Transaction,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Ensure the current user is a landlord
     if current_user.role != "landlord":
         raise HTTPException(status_code=403, detail="Only landlords can create transactions for properties")
 
-    # Check if the property exists and belongs to the current landlord
-    property_statement = select(RentalProperty).where(
-        RentalProperty.id == property_id,
-        RentalProperty.landlord_id == current_user.id
-    )
-    property = session.exec(property_statement).first()
-    if not property:
+    # Create the transaction if the property belongs to the current landlord, in one statement
+    validate_fields(transaction)
+    new_transaction = await insert_owned(session, Transaction, property_id, current_user.id, {
+        "type": transaction.type,
+        "amount": transaction.amount,
+        "due_date": transaction.due_date,
+        "payee_role": transaction.payee_role,
+        "is_visible_to_tenants": transaction.is_visible_to_tenants,
+        "created_at": datetime.utcnow(),
+    })
+    if not new_transaction:
         raise HTTPException(status_code=404, detail="Property not found or does not belong to you")
 
-    # Create a new transaction
-    new_transaction = Transaction(
-        property_id=property_id,
-        type=transaction.type,
-        amount=transaction.amount,
-        due_date=transaction.due_date,
-        payee_role=transaction.payee_role,
-        is_visible_to_tenants=transaction.is_visible_to_tenants
-    )
-
-    session.add(new_transaction)
-    session.commit()
-    session.refresh(new_transaction)
+    # Count the new transaction in the monthly rollups; it has no resolutions yet
+    await update_rollup(session, None, snapshot_of(current_user.id, new_transaction, False))
+    await session.commit()
+    await publish_transaction(new_transaction, "transaction.created", new_transaction)
 
     return new_transaction
 
@@ -118,82 +212,107 @@ async def create_transaction(
 async def update_transaction(
     transaction_id: int,
     updated_transaction: Transaction,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Ensure the current user is a landlord
     if current_user.role != "landlord":
         raise HTTPException(status_code=403, detail="Only landlords can update transactions")
 
-    # Fetch the transaction to be updated
-    transaction_statement = select(Transaction).where(Transaction.id == transaction_id)
-    transaction = session.exec(transaction_statement).first()
-    if not transaction:
-        raise HTTPException(status_code=404, detail="Transaction not found")
-
-    # Check if the property belongs to the current landlord
-    property_statement = select(RentalProperty).where(
-        RentalProperty.id == transaction.property_id,
-        RentalProperty.landlord_id == current_user.id
-    )
-    property = session.exec(property_statement).first()
-    if not property:
-        raise HTTPException(status_code=403, detail="You do not have permission to update this transaction")
+    # Lock the transaction and check that its property belongs to the current landlord
+    before = await rollup_snapshot(session, transaction_id)
+    check_transaction_owner(before, current_user, "You do not have permission to update this transaction")
 
     # Update transaction fields
-    transaction.type = updated_transaction.type
-    transaction.amount = updated_transaction.amount
-    transaction.due_date = updated_transaction.due_date
-    transaction.payee_role = updated_transaction.payee_role
-    transaction.is_visible_to_tenants = updated_transaction.is_visible_to_tenants
-
-    session.add(transaction)
-    session.commit()
-    session.refresh(transaction)
+    validate_fields(updated_transaction)
+    transaction = await update_owned(session, Transaction, transaction_id, current_user.id, {
+        "type": updated_transaction.type,
+        "amount": updated_transaction.amount,
+        "due_date": updated_transaction.due_date,
+        "payee_role": updated_transaction.payee_role,
+        "is_visible_to_tenants": updated_transaction.is_visible_to_tenants,
+    })
+
+    # Move the transaction to its new rollup bucket; its resolutions did not change
+    await update_rollup(session, before, snapshot_of(current_user.id, transaction, before[2]))
+    await session.commit()
+    await publish_transaction(transaction, "transaction.updated", transaction)
+    if not transaction.is_visible_to_tenants:
+        # Tenants may still show it from before it was hidden
+        await property_events.publish(transaction.property_id, "transaction.deleted", {"id": transaction_id}, "tenant")
 
     return transaction
 
 @router.delete("/delete-transaction/{transaction_id}")
 async def delete_transaction(
     transaction_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Ensure the current user is a landlord
     if current_user.role != "landlord":
         raise HTTPException(status_code=403, detail="Only landlords can delete transactions")
 
-    # Fetch the transaction to be deleted
-    transaction_statement = select(Transaction).where(Transaction.id == transaction_id)
-    transaction = session.exec(transaction_statement).first()
-    if not transaction:
-        raise HTTPException(status_code=404, detail="Transaction not found")
-
-    # Check if the property belongs to the current landlord
-    property_statement = select(RentalProperty).where(
-        RentalProperty.id == transaction.property_id,
-        RentalProperty.landlord_id == current_user.id
-    )
-    property = session.exec(property_statement).first()
-    if not property:
-        raise HTTPException(status_code=403, detail="You do not have permission to delete this transaction")
+    # Lock the transaction and check that its property belongs to the current landlord
+    before = await rollup_snapshot(session, transaction_id)
+    check_transaction_owner(before, current_user, "You do not have permission to delete this transaction")
 
-    # Delete all resolutions associated with the transaction
-    resolution_statement = select(TransactionResolution).where(TransactionResolution.transaction_id == transaction_id)
-    resolutions = session.exec(resolution_statement).all()
-    for resolution in resolutions:
-        session.delete(resolution)
+    # Remove the transaction from the monthly rollups
+    await update_rollup(session, before, None)
 
-    # Delete the transaction
-    session.delete(transaction)
-    session.commit()
+    # Delete the transaction; its resolutions go with it (ON DELETE CASCADE)
+    transaction = await delete_owned(session, Transaction, transaction_id, current_user.id)
+    await session.commit()
+    await publish_transaction(transaction, "transaction.deleted", {"id": transaction_id})
 
     return {"message": "Transaction and its resolutions deleted successfully"}
 
+@router.delete("/delete-transactions/{property_id}")
+async def delete_transactions(
+    property_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    # Ensure the current user is a landlord
+    if current_user.role != "landlord":
+        raise HTTPException(status_code=403, detail="Only landlords can delete transactions")
+
+    # Delete the property's transactions due in the range with one statement, whatever
+    # their number; the resolutions cascade. RETURNING still sees the resolutions, so
+    # each row says whether it counted as resolved in the rollups.
+    statement = delete(Transaction).where(Transaction.property_id == property_id, owned_by(Transaction, current_user.id))
+    if start_date:
+        statement = statement.where(Transaction.due_date >= start_date)
+    if end_date:
+        statement = statement.where(Transaction.due_date <= end_date)
+    statement = statement.returning(
+        Transaction.property_id, Transaction.due_date, Transaction.type, Transaction.payee_role, Transaction.amount,
+        transaction_fully_resolved().label("resolved"),
+    )
+    deleted = [dict(row._mapping, landlord_id=current_user.id) for row in (await session.exec(statement)).all()]
+    if not deleted:
+        property_statement = select(RentalProperty.id).where(
+            RentalProperty.id == property_id,
+            RentalProperty.landlord_id == current_user.id
+        )
+        if not (await session.exec(property_statement)).first():
+            raise HTTPException(status_code=404, detail="Property not found or does not belong to you")
+        return {"message": "No transactions to delete", "deleted": 0}
+
+    await remove_transactions(session, deleted)
+    await bump_property_version(session, property_id)
+    await session.commit()
+    # One event instead of one per row; clients reload the property
+    await property_events.publish(property_id, "property.reload", {"reason": "delete-transactions"})
+
+    return {"message": "Transactions deleted successfully", "deleted": len(deleted)}
+
 @router.post("/add-transaction-resolution", response_model=dict)
 async def add_transaction_resolution(
     resolution: TransactionResolution,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Ensure the current user is a landlord
@@ -204,71 +323,99 @@ async def add_transaction_resolution(
     if resolution.status not in ["resolved", "pending"]:
         raise HTTPException(status_code=400, detail="Invalid resolution status")
 
-    # Check if the transaction exists
-    transaction_statement = select(Transaction).where(Transaction.id == resolution.transaction_id)
-    transaction = session.exec(transaction_statement).first()
-    if not transaction:
-        raise HTTPException(status_code=404, detail="Transaction not found")
-
-    # Check if the specified user exists
-    user_statement = select(User).where(User.id == resolution.user_id)
-    user = session.exec(user_statement).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    # Check if there is already a resolution for this user and transaction
-    resolution_statement = select(TransactionResolution).where(
-        TransactionResolution.transaction_id == resolution.transaction_id,
-        TransactionResolution.user_id == resolution.user_id
-    )
-    existing_resolution = session.exec(resolution_statement).first()
-    if existing_resolution:
-        raise HTTPException(status_code=400, detail="Resolution already exists for this transaction and user")
+    transaction = await owned_transaction(session, resolution.transaction_id, current_user)
+    before = await rollup_snapshot(session, resolution.transaction_id)
 
-    # Create a new resolution
-    new_resolution = TransactionResolution(
+    # Insert the resolution unless the user already has one; a missing user fails the foreign key
+    statement = insert(TransactionResolution).values(
         transaction_id=resolution.transaction_id,
         user_id=resolution.user_id,
         status=resolution.status,
         resolved_at=datetime.utcnow() if resolution.status == "resolved" else None
-    )
+    ).on_conflict_do_nothing(constraint="uq_transaction_resolutions_transaction_id_user_id")
+    new_resolutions = await add_resolutions(session, statement, transaction)
+    if not new_resolutions:
+        await session.rollback()
+        raise HTTPException(status_code=400, detail="Resolution already exists for this transaction and user")
+
+    await update_rollup(session, before, await rollup_snapshot(session, resolution.transaction_id))
+    await session.commit()
+    await publish_resolutions(session, transaction)
 
-    session.add(new_resolution)
-    session.commit()
-    session.refresh(new_resolution)
+    return {"message": "Transaction resolution added successfully", "resolution_id": new_resolutions[0].id}
 
-    return {"message": "Transaction resolution added successfully", "resolution_id": new_resolution.id}
+@router.post("/add-transaction-resolutions", response_model=dict)
+async def add_transaction_resolutions(
+    batch: TransactionResolutionBatch,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    # Ensure the current user is a landlord
+    if current_user.role != "landlord":
+        raise HTTPException(status_code=403, detail="Only landlords can add transaction resolutions")
+
+    # Ensure the resolution status is valid
+    if batch.status not in ["resolved", "pending"]:
+        raise HTTPException(status_code=400, detail="Invalid resolution status")
+
+    user_ids = list(dict.fromkeys(batch.user_ids))
+    if not user_ids:
+        raise HTTPException(status_code=400, detail="No users given")
+
+    transaction = await owned_transaction(session, batch.transaction_id, current_user)
+    before = await rollup_snapshot(session, batch.transaction_id)
+
+    # Insert all resolutions with a single multi-row INSERT; none may exist yet
+    resolved_at = datetime.utcnow() if batch.status == "resolved" else None
+    statement = insert(TransactionResolution).values([
+        {"transaction_id": batch.transaction_id, "user_id": user_id, "status": batch.status, "resolved_at": resolved_at}
+        for user_id in user_ids
+    ]).on_conflict_do_nothing(constraint="uq_transaction_resolutions_transaction_id_user_id")
+    new_resolutions = await add_resolutions(session, statement, transaction)
+    if len(new_resolutions) < len(user_ids):
+        await session.rollback()
+        raise HTTPException(status_code=400, detail="Resolution already exists for this transaction and user")
+
+    await update_rollup(session, before, await rollup_snapshot(session, batch.transaction_id))
+    await session.commit()
+    await publish_resolutions(session, transaction)
+
+    return {"message": "Transaction resolutions added successfully", "resolution_ids": [resolution.id for resolution in new_resolutions]}
 
 @router.delete("/remove-transaction-resolution/{transaction_id}/{user_id}")
 async def remove_transaction_resolution(
     transaction_id: int,
     user_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Ensure the current user is a landlord
     if current_user.role != "landlord":
         raise HTTPException(status_code=403, detail="Only landlords can remove transaction resolutions")
 
-    # Check if the transaction resolution exists
-    resolution_statement = select(TransactionResolution).where(
+    transaction = await owned_transaction(session, transaction_id, current_user)
+    before = await rollup_snapshot(session, transaction_id)
+
+    # Delete the transaction resolution
+    statement = delete(TransactionResolution).where(
         TransactionResolution.transaction_id == transaction_id,
         TransactionResolution.user_id == user_id
     )
-    resolution = session.exec(resolution_statement).first()
-    if not resolution:
+    removed = await write_and_bump(session, statement, TransactionResolution, transaction.property_id)
+    if not removed:
+        await session.rollback()
         raise HTTPException(status_code=404, detail="Transaction resolution not found")
 
-    # Delete the transaction resolution
-    session.delete(resolution)
-    session.commit()
+    await update_rollup(session, before, await rollup_snapshot(session, transaction_id))
+    await session.commit()
+    await publish_resolutions(session, transaction)
 
     return {"message": "Transaction resolution removed successfully"}
 
 @router.put("/resolve-transaction/{transaction_id}")
 async def resolve_transaction(
     transaction_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Ensure the current user is authenticated
@@ -277,31 +424,27 @@ async def resolve_transaction(
 
     # Check if the transaction exists
     transaction_statement = select(Transaction).where(Transaction.id == transaction_id)
-    transaction = session.exec(transaction_statement).first()
+    transaction = (await session.exec(transaction_statement)).first()
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
 
-    # Find the resolution for the current user and transaction
-    resolution_statement = select(TransactionResolution).where(
+    before = await rollup_snapshot(session, transaction_id)
+
+    # Toggle the current user's resolution between "pending" and "resolved" in place
+    statement = update(TransactionResolution).where(
         TransactionResolution.transaction_id == transaction_id,
         TransactionResolution.user_id == current_user.id
+    ).values(
+        status=case((TransactionResolution.status == "pending", "resolved"), else_="pending"),
+        resolved_at=case((TransactionResolution.status == "pending", datetime.now()), else_=None),
     )
-    resolution = session.exec(resolution_statement).first()
-    if not resolution:
+    resolutions = await write_and_bump(session, statement, TransactionResolution, transaction.property_id)
+    if not resolutions:
+        await session.rollback()
         raise HTTPException(status_code=404, detail="Resolution not found for this transaction and user")
+    resolution = resolutions[0]
 
-    # Toggle the resolution status between "pending" and "resolved"
-    if resolution.status == "pending":
-        resolution.status = "resolved"
-        resolution.resolved_at = datetime.now()
-        session.add(resolution)
-        session.commit()
-        session.refresh(resolution)
-        return {"message": "Transaction resolution updated to resolved", "resolution_id": resolution.id}
-    else:
-        resolution.status = "pending"
-        resolution.resolved_at = None
-        session.add(resolution)
-        session.commit()
-        session.refresh(resolution)
-        return {"message": "Transaction resolution updated to pending", "resolution_id": resolution.id}
\ No newline at end of file
+    await update_rollup(session, before, await rollup_snapshot(session, transaction_id))
+    await session.commit()
+    await publish_resolutions(session, transaction)
+    return {"message": f"Transaction resolution updated to {resolution.status}", "resolution_id": resolution.id}
\ No newline at end of file
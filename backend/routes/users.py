@@ -1,47 +1,70 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlmodel import Session, select
+from sqlmodel import select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
 from models import Tenancy, User, UserResponse
 from database import get_session
-from auth import get_current_user, authenticate_user, create_access_token, Token, hash_password
+from pagination import paginate, finish_page, page_limit
+from response_cache import response_cache
+from fast_json import columns, dump_rows
+from auth import get_current_user, authenticate_user, create_access_token, Token, hash_password, user_cache
+from versions import bump_property_version
+from events import property_events
 import string
 from random import choices
 
 router = APIRouter()
 
-@router.get("/get-tenants-for-property/{property_id}", response_model=List[User])
-async def get_tenants_for_property(property_id: int, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
+@router.get("/get-tenants-for-property/{property_id}", response_model=List[UserResponse])
+async def get_tenants_for_property(
+    property_id: int,
+    request: Request,
+    response: Response,
+    limit: int = page_limit,
+    after: Optional[str] = None,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    cached = await response_cache.lookup(request, session, property_id, current_user)
+    if cached.response:
+        return cached.response
+
     statement = (
-    select(User)
+    select(*columns(User, UserResponse))
     .join(Tenancy, Tenancy.tenant_id == User.id)
     .where(Tenancy.property_id == property_id)
     .where(User.role == "tenant")
     )
-    results = session.exec(statement)
-    return results.all()
+    keyset = [User.created_at, User.id]
+    page = paginate(statement, keyset, after, limit)
+    results = await session.exec(page)
+    return await cached.store(response, dump_rows(finish_page(response, results.all(), keyset, limit)))
  
 @router.post("/register", response_model=UserResponse)
-async def register_user(user: User, session: Session = Depends(get_session)):
+async def register_user(user: User, session: AsyncSession = Depends(get_session)):
     # Check if the email is already registered
     statement = select(User).where(User.email == user.email)
-    existing_user = session.exec(statement).first()
+    existing_user = (await session.exec(statement)).first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email is already registered")
 
     # Hash the password before saving
-    user.hashed_password = hash_password(user.hashed_password)
+    user.hashed_password = await hash_password(user.hashed_password)
 
     # Add the user to the database
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
+
+    # Drop any cached copy of a user previously registered under this email
+    user_cache.invalidate(user.email)
 
     return user  # Return the user object, which will be serialized as UserResponse
 
 @router.post("/token", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Session = Depends(get_session)):
-    user = authenticate_user(form_data.username, form_data.password, session)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_session)):
+    user = await authenticate_user(form_data.username, form_data.password, session)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid username or password")
     access_token = create_access_token(data={"email": form_data.username, "role": user.role})
@@ -55,7 +78,7 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
 
 @router.put("/users/me/invite-code")
 async def regenerate_invite_code(
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     if not current_user:
@@ -64,10 +87,15 @@ async def regenerate_invite_code(
     # Generate a new random invite code
     new_invite_code = ''.join(choices(string.ascii_letters + string.digits, k=10))
 
-    # Update the user's invite code
-    current_user.invite_code = new_invite_code
-    session.add(current_user)
-    session.commit()
-    session.refresh(current_user)
+    # Update the user's invite code; current_user is a cached copy, so update the row directly
+    statement = update(User).where(User.id == current_user.id).values(invite_code=new_invite_code)
+    await session.exec(statement)
+    property_ids = await bump_property_version(session, select(Tenancy.property_id).where(Tenancy.tenant_id == current_user.id))
+    await session.commit()
+    user_cache.invalidate(current_user.email)
+
+    # The invite code is shown in the tenant lists of the tenant's properties
+    for property_id in property_ids:
+        await property_events.publish(property_id, "tenant.updated", {"id": current_user.id, "invite_code": new_invite_code})
 
     return {"message": "Invite code regenerated successfully", "invite_code": new_invite_code}
\ No newline at end of file
@@ -0,0 +1,33 @@
+import os
+import pytest
+
+if not os.getenv("BENCH_DATABASE_URL"):
+    pytest.skip("Set BENCH_DATABASE_URL to a scratch PostgreSQL database", allow_module_level=True)
+
+from benchmarks.query_budget import BUDGETS, call_route
+
+# Every route in BUDGETS, in order: later writes use the ids earlier ones created
+
+
+@pytest.fixture(scope="module")
+def created():
+    return {}
+
+
+@pytest.mark.parametrize(
+    "user_id, method, path, body, budget", BUDGETS,
+    ids=[f"{method} {path}" for _, method, path, _, _ in BUDGETS],
+)
+def test_route_within_query_budget(bench_client, run, query_budget, created, user_id, method, path, body, budget):
+    needed = {"transaction"} if body == "resolutions" else set()
+    try:
+        path.format(**created)
+    except KeyError as missing:
+        needed.add(missing.args[0])
+    if needed - created.keys():
+        pytest.skip(f"needs the {', '.join(needed - created.keys())} created by an earlier route")
+
+    with query_budget(budget) as stats:
+        response = run(call_route(bench_client, user_id, method, path, body, created))
+    assert response.status_code < 400, response.text
+    assert not stats.repeated(), stats.repeated()
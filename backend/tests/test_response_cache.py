@@ -0,0 +1,124 @@
+import asyncio
+import time
+import pytest
+from benchmarks.redis_stand_in import RedisStandIn
+from redis_client import RedisError, encode_command, read_reply
+from response_cache import MemoryBackend, RedisBackend
+
+# The cache backends on their own, without a database: the in-process LRU and
+# the Redis backend against the RESP stand-in used by the benchmarks
+
+
+def entry_size(key: str, value: bytes) -> int:
+    return len(key) + len(value)
+
+
+def test_memory_backend_counts_keys_and_values(run):
+    backend = MemoryBackend(1000)
+    run(backend.set("1:1:a", b"x" * 10))
+    run(backend.set("1:1:b", b"y" * 20))
+    assert backend.size == entry_size("1:1:a", b"x" * 10) + entry_size("1:1:b", b"y" * 20)
+
+    # Replacing an entry counts only its new value
+    run(backend.set("1:1:a", b"z" * 5))
+    assert backend.size == entry_size("1:1:a", b"z" * 5) + entry_size("1:1:b", b"y" * 20)
+    assert run(backend.get("1:1:a")) == b"z" * 5
+
+    run(backend.delete("1:1:b"))
+    run(backend.delete("1:1:missing"))
+    assert backend.size == entry_size("1:1:a", b"z" * 5)
+
+
+def test_memory_backend_evicts_least_recently_used(run):
+    value = b"v" * 95
+    backend = MemoryBackend(3 * entry_size("1:1:a", value))
+    for key in ("1:1:a", "1:1:b", "1:1:c"):
+        run(backend.set(key, value))
+
+    # Reading a moves it to the end, so b is the oldest when d needs room
+    assert run(backend.get("1:1:a")) == value
+    run(backend.set("1:1:d", value))
+    assert run(backend.get("1:1:b")) is None
+    assert [run(backend.get(key)) for key in ("1:1:a", "1:1:c", "1:1:d")] == [value] * 3
+    assert backend.size == backend.max_bytes
+
+
+def test_memory_backend_skips_entries_larger_than_the_cache(run):
+    backend = MemoryBackend(50)
+    run(backend.set("1:1:a", b"small"))
+    run(backend.set("1:1:b", b"x" * 100))
+    assert run(backend.get("1:1:b")) is None
+    assert run(backend.get("1:1:a")) == b"small"
+    assert backend.size == entry_size("1:1:a", b"small")
+
+
+def test_memory_backend_invalidates_one_property(run):
+    backend = MemoryBackend(1000)
+    for key in ("1:1:a", "1:2:b", "12:1:a"):
+        run(backend.set(key, b"value"))
+    run(backend.invalidate(1))
+    assert run(backend.get("1:1:a")) is None
+    assert run(backend.get("1:2:b")) is None
+    assert run(backend.get("12:1:a")) == b"value"
+    assert backend.size == entry_size("12:1:a", b"value")
+
+    run(backend.clear())
+    assert backend.size == 0
+    assert run(backend.get("12:1:a")) is None
+
+
+def test_resp_replies_decode(run):
+    async def decode(data: bytes):
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        return await read_reply(reader)
+
+    assert run(decode(b"+OK\r\n")) == "OK"
+    assert run(decode(b":42\r\n")) == 42
+    assert run(decode(b"$-1\r\n")) is None
+    assert run(decode(b"$4\r\na\r\nb\r\n")) == b"a\r\nb"
+    assert run(decode(b"*2\r\n$1\r\n0\r\n" + encode_command("k1", b"k2"))) == [b"0", [b"k1", b"k2"]]
+    with pytest.raises(RedisError, match="ERR unknown command"):
+        run(decode(b"-ERR unknown command\r\n"))
+
+
+@pytest.fixture
+def stand_in(run):
+    server = RedisStandIn()
+    port = run(server.start())
+    server.url = f"redis://127.0.0.1:{port}/0"
+    yield server
+    run(server.stop())
+
+
+@pytest.fixture
+def redis_backend(run, stand_in):
+    backend = RedisBackend(stand_in.url, ttl=300)
+    yield backend
+    run(backend.close())
+
+
+def test_redis_backend_round_trip(run, stand_in, redis_backend):
+    # Bodies are binary and may hold the protocol's own line breaks
+    body = b'{"Content-Type": "application/json"}\n[{"note": "a\r\nb"}]'
+    run(redis_backend.set("1:1:landlord:/users/1", body))
+    assert run(redis_backend.get("1:1:landlord:/users/1")) == body
+    assert run(redis_backend.get("1:2:landlord:/users/1")) is None
+    assert stand_in.data == {b"response:1:1:landlord:/users/1": body}
+
+
+def test_redis_backend_sets_the_ttl(run, stand_in, redis_backend):
+    run(redis_backend.set("1:1:a", b"value"))
+    assert stand_in.expires[b"response:1:1:a"] - time.monotonic() == pytest.approx(300, abs=5)
+
+    # Once the TTL has passed the entry is gone
+    stand_in.expires[b"response:1:1:a"] = time.monotonic() - 1
+    assert run(redis_backend.get("1:1:a")) is None
+
+
+def test_redis_backend_clears_only_its_own_keys(run, stand_in, redis_backend):
+    stand_in.data[b"sessions:1"] = b"other data"
+    for key in ("1:1:a", "1:1:b", "2:1:a"):
+        run(redis_backend.set(key, b"value"))
+    run(redis_backend.clear())
+    assert stand_in.data == {b"sessions:1": b"other data"}
@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import Optional, Union
+from sqlalchemy import literal, Select
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models import PropertyVersion
+from response_cache import response_cache
+
+# Every write to a property's data bumps its version inside the same database
+# transaction, so a reader that sees version N sees all writes up to N. Clients
+# and caches compare versions instead of re-reading the property's tables.
+
+
+# Upsert bumping one property, or every property id returned by a select statement
+def version_bump(property_ids: Union[int, Select]):
+    if isinstance(property_ids, int):
+        source = select(literal(property_ids).label("property_id"))
+    else:
+        source = property_ids.distinct()
+    rows = source.subquery()
+    statement = insert(PropertyVersion).from_select(
+        ["property_id", "version", "updated_at"],
+        select(rows.c[0], literal(1), literal(datetime.utcnow())),
+    )
+    return statement.on_conflict_do_update(
+        index_elements=["property_id"],
+        set_={"version": PropertyVersion.version + 1, "updated_at": statement.excluded.updated_at},
+    )
+
+# Bump one property, or every property id returned by a select statement; returns the bumped ids
+async def bump_property_version(session: AsyncSession, property_ids: Union[int, Select]):
+    statement = version_bump(property_ids).returning(PropertyVersion.property_id)
+    property_ids = (await session.exec(statement)).scalars().all()
+
+    # Cached responses are keyed by version, so this only frees their memory early
+    await response_cache.invalidate(property_ids)
+    return property_ids
+
+# Current version of a property (a primary key lookup), None if it does not exist
+async def get_property_version(session: AsyncSession, property_id: int) -> Optional[PropertyVersion]:
+    statement = select(PropertyVersion).where(PropertyVersion.property_id == property_id)
+    return (await session.exec(statement)).first()
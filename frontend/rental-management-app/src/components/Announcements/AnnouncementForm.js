@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
+import { findInPages } from '../paging';
 
 const styles = {
     container: {
@@ -54,10 +55,10 @@ const AnnouncementForm = ({ propertyId, announcementId, mode, onAnnouncementAdde
         const fetchAnnouncement = async () => {
             if (mode === 'edit' && announcementId) {
                 try {
-                    const response = await axios.get(`http://localhost:8000/announcements/${propertyId}`, {
-                        headers: { Authorization: `Bearer ${localStorage.getItem('token')}` },
-                    });
-                    const announcement = response.data.find((a) => a.id === announcementId);
+                    const announcement = await findInPages(
+                        `http://localhost:8000/announcements/${propertyId}`,
+                        (a) => a.id === announcementId
+                    );
                     if (announcement) {
                         setFormData({
                             title: announcement.title,
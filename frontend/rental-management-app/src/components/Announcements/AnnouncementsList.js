@@ -2,10 +2,14 @@ import React, { useEffect, useState } from 'react';
 import axios from 'axios';
 import AnnouncementCard from './AnnouncementCard';
 import AnnouncementForm from './AnnouncementForm';
+import usePropertyEvents, { applyRowEvent } from '../usePropertyEvents';
+import { fetchPage, appendPage, LoadMoreButton } from '../paging';
 
-const AnnouncementsList = () => {
-    const [announcements, setAnnouncements] = useState([]);
-    const [loading, setLoading] = useState(true);
+const AnnouncementsList = ({ initialItems, initialCursor }) => {
+    const [announcements, setAnnouncements] = useState(initialItems || []);
+    const [nextCursor, setNextCursor] = useState(initialCursor || null);
+    const [loadingMore, setLoadingMore] = useState(false);
+    const [loading, setLoading] = useState(!initialItems);
     const [error, setError] = useState(null);
     const [showAddAnnouncementForm, setShowAddAnnouncementForm] = useState(false);
     const [editAnnouncementId, setEditAnnouncementId] = useState(null);
@@ -16,7 +20,7 @@ const AnnouncementsList = () => {
     };
 
     const handleAnnouncementAdded = (newAnnouncement) => {
-        setAnnouncements((prevAnnouncements) => [...prevAnnouncements, newAnnouncement]);
+        setAnnouncements((prevAnnouncements) => applyRowEvent(prevAnnouncements, 'added', newAnnouncement));
         setShowAddAnnouncementForm(false);
     };
 
@@ -52,34 +56,56 @@ const AnnouncementsList = () => {
         }
     };
 
-    useEffect(() => {
-        const propertyId = window.location.pathname.split('/').pop();
-        const fetchAnnouncements = async () => {
-            try {
-                const response = await axios.get(`http://localhost:8000/announcements/${propertyId}`, {
-                    headers: {
-                        Authorization: `Bearer ${localStorage.getItem('token')}`,
-                    },
-                });
-                setAnnouncements(response.data);
-            } catch (err) {
-                if (err.response?.status === 401) {
-                    setError('Unauthorized access. Please log in again.');
-                }
-                if (err.response?.status === 404) {
-                    setError('Announcements not found');
-                }
-                else {
-                    setError(err.message);
-                }
-            } finally {
-                setLoading(false);
+    const propertyId = window.location.pathname.split('/').pop();
+    const fetchAnnouncements = async () => {
+        try {
+            const page = await fetchPage(`http://localhost:8000/announcements/${propertyId}`);
+            setAnnouncements(page.items);
+            setNextCursor(page.nextCursor);
+        } catch (err) {
+            if (err.response?.status === 401) {
+                setError('Unauthorized access. Please log in again.');
             }
-        };
+            if (err.response?.status === 404) {
+                setError('Announcements not found');
+            }
+            else {
+                setError(err.message);
+            }
+        } finally {
+            setLoading(false);
+        }
+    };
 
-        fetchAnnouncements();
+    // Older announcements, one page at a time
+    const loadMoreAnnouncements = async () => {
+        setLoadingMore(true);
+        try {
+            const page = await fetchPage(`http://localhost:8000/announcements/${propertyId}`, { after: nextCursor });
+            setAnnouncements((prev) => appendPage(prev, page.items));
+            setNextCursor(page.nextCursor);
+        } catch (err) {
+            alert(`Error: ${err.response?.data?.detail || err.message}`);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
+    useEffect(() => {
+        // The property overview already loaded this list
+        if (!initialItems) {
+            fetchAnnouncements();
+        }
     }, []);
 
+    // Changes made by other users arrive as events and are applied in place
+    usePropertyEvents((event) => {
+        const [kind, action] = event.type.split('.');
+        if (kind === 'announcement') {
+            setAnnouncements((prev) => applyRowEvent(prev, action, event.data));
+        }
+    }, fetchAnnouncements);
+
     return (
         <div>
             <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center' }}>
@@ -112,14 +138,17 @@ const AnnouncementsList = () => {
             ) : error && error !== 'Announcements not found' ? (
                 <p>Error: {error}</p>
             ) : (
-                announcements.map((announcement) => (
-                    <AnnouncementCard
-                        key={announcement.id}
-                        announcement={announcement}
-                        onClick={() => handleAnnouncementClick(announcement)}
-                        onDelete={() => handleDeleteAnnouncement(announcement)}
-                    />
-                ))
+                <>
+                    {announcements.map((announcement) => (
+                        <AnnouncementCard
+                            key={announcement.id}
+                            announcement={announcement}
+                            onClick={() => handleAnnouncementClick(announcement)}
+                            onDelete={() => handleDeleteAnnouncement(announcement)}
+                        />
+                    ))}
+                    <LoadMoreButton nextCursor={nextCursor} loading={loadingMore} onClick={loadMoreAnnouncements} />
+                </>
             )}
         </div>
     );
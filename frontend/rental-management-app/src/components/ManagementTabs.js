@@ -5,22 +5,39 @@ import TransactionsList from './Transactions/TransactionsList';
 import RequestsList from './Requests/RequestsList';
 import AnnouncementsList from './Announcements/AnnouncementsList';
 
-const ManagementTabs = () => {
+// Overview section holding the first page of each tab
+const TAB_SECTIONS = {
+  Tenants: 'tenants',
+  Responsibilities: 'responsibilities',
+  Payments: 'transactions',
+  Announcements: 'announcements',
+  'Tenant requests': 'tenant_requests',
+};
+
+const ManagementTabs = ({ overview }) => {
   const [activeTab, setActiveTab] = useState('Tenants');
   const [forceListRender, setForceListRender] = useState(false); // State to force re-render of the list
+  const [usedSections, setUsedSections] = useState([]); // Sections that may be stale and must be re-fetched
+
+  // A list starts from the overview's first page the first time it is shown and pages on from its cursor
+  const initialPage = (tab) => {
+    const section = TAB_SECTIONS[tab];
+    if (!overview || usedSections.includes(section)) return {};
+    return { initialItems: overview[section], initialCursor: overview.next_cursors[section] };
+  };
 
   const renderContent = () => {
     switch (activeTab) {
       case 'Tenants':
-        return <TenantList key={forceListRender ? 'force-tenants' : 'tenants'} />;
+        return <TenantList key={forceListRender ? 'force-tenants' : 'tenants'} {...initialPage('Tenants')} />;
       case 'Responsibilities':
-        return <ResponsibilitiesList key={forceListRender ? 'force-responsibilities' : 'responsibilities'} />;
+        return <ResponsibilitiesList key={forceListRender ? 'force-responsibilities' : 'responsibilities'} {...initialPage('Responsibilities')} />;
       case 'Payments':
-        return <TransactionsList key={forceListRender ? 'force-payments' : 'payments'} />;
+        return <TransactionsList key={forceListRender ? 'force-payments' : 'payments'} {...initialPage('Payments')} />;
       case 'Announcements':
-        return <AnnouncementsList key={forceListRender ? 'force-announcements' : 'announcements'} />;
+        return <AnnouncementsList key={forceListRender ? 'force-announcements' : 'announcements'} {...initialPage('Announcements')} />;
       case 'Tenant requests':
-        return <RequestsList key={forceListRender ? 'force-requests' : 'requests'} />;
+        return <RequestsList key={forceListRender ? 'force-requests' : 'requests'} {...initialPage('Tenant requests')} />;
       default:
         return null;
     }
@@ -84,6 +101,7 @@ const ManagementTabs = () => {
               ...(activeTab === tab ? styles.activeTab : {}),
             }}
             onClick={() => {
+              setUsedSections((prev) => [...prev, TAB_SECTIONS[activeTab]]);
               setActiveTab(tab);
               setForceListRender(false); // Reset force render when switching tabs
             }}
@@ -96,7 +114,10 @@ const ManagementTabs = () => {
         {renderContent()}
         <button
           style={styles.backButton}
-          onClick={() => setForceListRender((prev) => !prev)} // Toggle force render to re-render the list
+          onClick={() => {
+            setUsedSections((prev) => [...prev, TAB_SECTIONS[activeTab]]);
+            setForceListRender((prev) => !prev); // Toggle force render to re-render the list
+          }}
         >
           ←
         </button>
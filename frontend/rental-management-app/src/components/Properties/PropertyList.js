@@ -2,10 +2,13 @@ import React, { useEffect, useState } from 'react';
 import axios from 'axios';
 import PropertyCard from './PropertyCard'; // Corrected path
 import PropertyForm from './PropertyForm'; // Import PropertyForm
+import { fetchPage, appendPage, LoadMoreButton } from '../paging';
 import { useNavigate } from 'react-router-dom';
 
 const PropertyList = () => {
     const [properties, setProperties] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
     const [showAddPropertyForm, setShowAddPropertyForm] = useState(false); // State to toggle form visibility
@@ -17,7 +20,7 @@ const PropertyList = () => {
     };
 
     const handlePropertyAdded = (newProperty) => {
-        setProperties((prevProperties) => [...prevProperties, newProperty]);
+        setProperties((prevProperties) => [newProperty, ...prevProperties]); // Newest first, like the list
         setShowAddPropertyForm(false); // Hide form after submission
     };
 
@@ -57,12 +60,9 @@ const PropertyList = () => {
     useEffect(() => {
         const fetchProperties = async () => {
             try {
-                const response = await axios.get('http://localhost:8000/rental-properties', {
-                    headers: {
-                        Authorization: `Bearer ${localStorage.getItem('token')}`,
-                    },
-                });
-                setProperties(response.data);
+                const page = await fetchPage('http://localhost:8000/rental-properties');
+                setProperties(page.items);
+                setNextCursor(page.nextCursor);
             } catch (err) {
                 if (err.response.status === 401) {
                     setError('Unauthorized access. Please log in again.');
@@ -77,6 +77,20 @@ const PropertyList = () => {
         fetchProperties();
     }, []);
 
+    // Older properties, one page at a time
+    const loadMoreProperties = async () => {
+        setLoadingMore(true);
+        try {
+            const page = await fetchPage('http://localhost:8000/rental-properties', { after: nextCursor });
+            setProperties((prevProperties) => appendPage(prevProperties, page.items));
+            setNextCursor(page.nextCursor);
+        } catch (error) {
+            alert(error.response?.data?.detail || 'Failed to load more properties.');
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     if (loading) {
         return <p>Loading properties...</p>;
     }
@@ -109,6 +123,7 @@ const PropertyList = () => {
                     onDelete={() => handleDeleteProperty(property.id)} // Pass delete handler
                 />
             ))}
+            <LoadMoreButton nextCursor={nextCursor} loading={loadingMore} onClick={loadMoreProperties} />
         </div>
     );
 };
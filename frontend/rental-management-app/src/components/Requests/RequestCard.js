@@ -4,9 +4,9 @@ import axios from 'axios';
 
 const RequestCard = ({ request, onClick, onDelete }) => {
     const [isHovered, setIsHovered] = React.useState(false);
-    const [resolutions, setResolutions] = useState([]);
-    const [loading, setLoading] = useState(true);
-    const [forceUpdate, setForceUpdate] = useState(false);
+    const [resolutions, setResolutions] = useState(request.resolutions || []);
+    const [loading, setLoading] = useState(!request.resolutions);
+    const [forceUpdate, setForceUpdate] = useState(0);
 
     // Get current user id and role from localStorage
     const currentUserId = Number(localStorage.getItem('user_id'));
@@ -14,6 +14,13 @@ const RequestCard = ({ request, onClick, onDelete }) => {
 
     // Fetch request resolutions
     useEffect(() => {
+        // The list embeds resolutions, so only fetch them after a change on this card
+        if (request.resolutions && forceUpdate === 0) {
+            setResolutions(request.resolutions);
+            setLoading(false);
+            return;
+        }
+
         const fetchResolutions = async () => {
             try {
                 const response = await fetch(`http://localhost:8000/request-resolutions/${request.id}`, {
@@ -31,7 +38,7 @@ const RequestCard = ({ request, onClick, onDelete }) => {
         };
 
         fetchResolutions();
-    }, [request.id, forceUpdate]);
+    }, [request.id, request.resolutions, forceUpdate]);
 
     // Determine card background color
     const determineCardColor = () => {
@@ -57,7 +64,7 @@ const RequestCard = ({ request, onClick, onDelete }) => {
                 },
             });
             alert(response.data.message || 'Request confirmed successfully!');
-            setForceUpdate((prev) => !prev);
+            setForceUpdate((prev) => prev + 1);
         } catch (error) {
             console.error('Error confirming transaction:', error);
             alert(error.response?.data?.detail || 'Failed to confirm transaction. Please try again.');
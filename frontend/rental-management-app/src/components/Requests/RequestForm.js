@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from "react";
 import axios from "axios";
+import { fetchAllPages, findInPages } from "../paging";
 
 const styles = {
   container: {
@@ -64,11 +65,9 @@ const RequestForm = ({
   useEffect(() => {
     const fetchParticipants = async () => {
       try {
-        const tenantsResponse = await axios.get(
-          `http://localhost:8000/get-tenants-for-property/${propertyId}`,
-          { headers: { Authorization: `Bearer ${localStorage.getItem("token")}` } }
-        );
-        setTenants(tenantsResponse.data);
+        // Every tenant can be a confirmer, not only the first page
+        const propertyTenants = await fetchAllPages(`http://localhost:8000/get-tenants-for-property/${propertyId}`);
+        setTenants(propertyTenants);
 
         const userResponse = await axios.get(
           `http://localhost:8000/users/me`,
@@ -90,11 +89,10 @@ const RequestForm = ({
     const fetchRequest = async () => {
       if (mode === "edit" && requestId) {
         try {
-          const response = await axios.get(
+          const req = await findInPages(
             `http://localhost:8000/tenant-request/${propertyId}`,
-            { headers: { Authorization: `Bearer ${localStorage.getItem("token")}` } }
+            (r) => r.id === requestId
           );
-          const req = response.data.find((r) => r.id === requestId);
           if (req) {
             setFormData({
               title: req.title,
@@ -190,18 +188,14 @@ const RequestForm = ({
         const newRequest = response.data;
 
         if (formData.confirmers.length > 0) {
-          await Promise.all(
-            formData.confirmers.map((userId) =>
-              axios.post(
-                `http://localhost:8000/add-request-resolution`,
-                {
-                  request_id: newRequest.id,
-                  user_id: userId,
-                  status: "pending",
-                },
-                { headers: { Authorization: `Bearer ${localStorage.getItem("token")}` } }
-              )
-            )
+          await axios.post(
+            `http://localhost:8000/add-request-resolutions`,
+            {
+              request_id: newRequest.id,
+              user_ids: formData.confirmers,
+              status: "pending",
+            },
+            { headers: { Authorization: `Bearer ${localStorage.getItem("token")}` } }
           );
         }
 
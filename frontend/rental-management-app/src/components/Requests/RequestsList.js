@@ -2,43 +2,80 @@ import React, { useEffect, useState } from 'react';
 import axios from 'axios';
 import RequestCard from './RequestCard';
 import RequestForm from './RequestForm';
+import usePropertyEvents, { applyRowEvent } from '../usePropertyEvents';
+import { fetchPage, appendPage, LoadMoreButton } from '../paging';
 import { useNavigate } from 'react-router-dom';
 
-const RequestsList = () => {
+const RequestsList = ({ initialItems, initialCursor }) => {
     const propertyId = window.location.pathname.split('/').pop();
-    const [requests, setRequests] = useState([]);
-    const [loading, setLoading] = useState(true);
+    const [requests, setRequests] = useState(initialItems || []);
+    const [nextCursor, setNextCursor] = useState(initialCursor || null);
+    const [loadingMore, setLoadingMore] = useState(false);
+    const [loading, setLoading] = useState(!initialItems);
     const [error, setError] = useState(null);
     const [showAddRequestForm, setShowAddRequestForm] = useState(false);
     const [editRequestId, setEditRequestId] = useState(null);
     const navigate = useNavigate();
 
-    useEffect(() => {
-        const fetchRequests = async () => {
-            try {
-                const response = await axios.get(`http://localhost:8000/tenant-request/${propertyId}`, {
-                    headers: {
-                        Authorization: `Bearer ${localStorage.getItem('token')}`,
-                    },
-                });
-                setRequests(response.data);
-            } catch (err) {
-                if (err.response?.status === 401) {
-                    setError('Unauthorized access. Please log in again.');
-                } else if (err.response?.status === 404) {
-                    setError('No requests found for this property.');
-                } else {
-                    setError(err.message);
-                }
-            } finally {
-                setLoading(false);
+    const fetchRequests = async () => {
+        try {
+            const page = await fetchPage(`http://localhost:8000/tenant-request/${propertyId}`, {
+                params: { include: 'resolutions' },
+            });
+            setRequests(page.items);
+            setNextCursor(page.nextCursor);
+        } catch (err) {
+            if (err.response?.status === 401) {
+                setError('Unauthorized access. Please log in again.');
+            } else if (err.response?.status === 404) {
+                setError('No requests found for this property.');
+            } else {
+                setError(err.message);
             }
-        };
-        fetchRequests();
-    }, [propertyId]);
+        } finally {
+            setLoading(false);
+        }
+    };
+
+    // Older requests, one page at a time
+    const loadMoreRequests = async () => {
+        setLoadingMore(true);
+        try {
+            const page = await fetchPage(`http://localhost:8000/tenant-request/${propertyId}`, {
+                params: { include: 'resolutions' },
+                after: nextCursor,
+            });
+            setRequests((prev) => appendPage(prev, page.items));
+            setNextCursor(page.nextCursor);
+        } catch (err) {
+            alert(err.response?.data?.detail || "Failed to load more requests.");
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
+    useEffect(() => {
+        // The property overview already loaded this list
+        if (!initialItems) {
+            fetchRequests();
+        }
+    }, []);
+
+    // Changes made by other users arrive as events and are applied in place
+    usePropertyEvents((event) => {
+        const [kind, action] = event.type.split('.');
+        if (event.type === 'request.resolutions') {
+            const { request_id, resolutions } = event.data;
+            setRequests((prev) => prev.map((r) => (r.id === request_id ? { ...r, resolutions } : r)));
+            return;
+        }
+        if (kind === 'request') {
+            setRequests((prev) => applyRowEvent(prev, action, event.data));
+        }
+    }, fetchRequests);
 
     const handleRequestAdded = (newRequest) => {
-        setRequests((prev) => [...prev, newRequest]);
+        setRequests((prev) => applyRowEvent(prev, 'added', newRequest));
         setShowAddRequestForm(false);
     };
 
@@ -106,14 +143,17 @@ const RequestsList = () => {
                     onRequestUpdated={handleRequestUpdated}
                 />
             ) : (
-                requests.map((request) => (
-                    <RequestCard
-                        key={request.id}
-                        request={request}
-                        onClick={() => setEditRequestId(request.id)}
-                        onDelete={() => handleDeleteRequest(request.id)}
-                    />
-                ))
+                <>
+                    {requests.map((request) => (
+                        <RequestCard
+                            key={request.id}
+                            request={request}
+                            onClick={() => setEditRequestId(request.id)}
+                            onDelete={() => handleDeleteRequest(request.id)}
+                        />
+                    ))}
+                    <LoadMoreButton nextCursor={nextCursor} loading={loadingMore} onClick={loadMoreRequests} />
+                </>
             )}
         </div>
     );
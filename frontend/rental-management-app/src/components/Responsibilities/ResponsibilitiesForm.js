@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
+import { findInPages } from '../paging';
 
 const styles = {
     container: {
@@ -55,10 +56,10 @@ const ResponsibilitiesForm = ({ propertyId, responsibilityId, mode, onResponsibi
         const fetchResponsibility = async () => {
             if (mode === 'edit' && responsibilityId) {
                 try {
-                    const response = await axios.get(`http://localhost:8000/responsibilities/${propertyId}`, {
-                        headers: { Authorization: `Bearer ${localStorage.getItem('token')}` },
-                    });
-                    const responsibility = response.data.find((r) => r.id === responsibilityId);
+                    const responsibility = await findInPages(
+                        `http://localhost:8000/responsibilities/${propertyId}`,
+                        (r) => r.id === responsibilityId
+                    );
                     if (responsibility) {
                         setFormData({
                             title: responsibility.title,
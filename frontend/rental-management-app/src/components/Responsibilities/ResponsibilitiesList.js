@@ -2,10 +2,14 @@ import React, { useEffect, useState } from 'react';
 import axios from 'axios';
 import Card from '../Card';
 import ResponsibilitiesForm from './ResponsibilitiesForm';
+import usePropertyEvents, { applyRowEvent } from '../usePropertyEvents';
+import { fetchPage, appendPage, LoadMoreButton } from '../paging';
 
-const ResponsibilitiesList = () => {
-    const [responsibilities, setResponsibilities] = useState([]);
-    const [loading, setLoading] = useState(true);
+const ResponsibilitiesList = ({ initialItems, initialCursor }) => {
+    const [responsibilities, setResponsibilities] = useState(initialItems || []);
+    const [nextCursor, setNextCursor] = useState(initialCursor || null);
+    const [loadingMore, setLoadingMore] = useState(false);
+    const [loading, setLoading] = useState(!initialItems);
     const [error, setError] = useState(null);
     const [showAddForm, setShowAddForm] = useState(false);
     const [editResponsibilityId, setEditResponsibilityId] = useState(null);
@@ -16,7 +20,7 @@ const ResponsibilitiesList = () => {
     const currentUserRole = localStorage.getItem('role');
 
     const handleResponsibilityAdded = (newResponsibility) => {
-        setResponsibilities((prev) => [...prev, newResponsibility]);
+        setResponsibilities((prev) => applyRowEvent(prev, 'added', newResponsibility));
         setShowAddForm(false);
     };
 
@@ -46,31 +50,54 @@ const ResponsibilitiesList = () => {
         }
     };
 
-    useEffect(() => {
-        const fetchResponsibilities = async () => {
-            try {
-                const response = await axios.get(`http://localhost:8000/responsibilities/${propertyId}`, {
-                    headers: {
-                        Authorization: `Bearer ${localStorage.getItem('token')}`,
-                    },
-                });
-                setResponsibilities(response.data);
-            } catch (err) {
-                if (err.response?.status === 401) {
-                    setError('Unauthorized access. Please log in again.');
-                }
-                if (err.response?.status === 404) {
-                    setError('Responsibilities not found');
-                }
-                 else {
-                    setError(err.message);
-                }
-            } finally {
-                setLoading(false);
+    const fetchResponsibilities = async () => {
+        try {
+            const page = await fetchPage(`http://localhost:8000/responsibilities/${propertyId}`);
+            setResponsibilities(page.items);
+            setNextCursor(page.nextCursor);
+        } catch (err) {
+            if (err.response?.status === 401) {
+                setError('Unauthorized access. Please log in again.');
+            }
+            if (err.response?.status === 404) {
+                setError('Responsibilities not found');
+            }
+             else {
+                setError(err.message);
             }
-        };
-        fetchResponsibilities();
-    }, [propertyId]);
+        } finally {
+            setLoading(false);
+        }
+    };
+
+    // Older responsibilities, one page at a time
+    const loadMoreResponsibilities = async () => {
+        setLoadingMore(true);
+        try {
+            const page = await fetchPage(`http://localhost:8000/responsibilities/${propertyId}`, { after: nextCursor });
+            setResponsibilities((prev) => appendPage(prev, page.items));
+            setNextCursor(page.nextCursor);
+        } catch (err) {
+            alert(`Error: ${err.response?.data?.detail || err.message}`);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
+    useEffect(() => {
+        // The property overview already loaded this list
+        if (!initialItems) {
+            fetchResponsibilities();
+        }
+    }, []);
+
+    // Changes made by other users arrive as events and are applied in place
+    usePropertyEvents((event) => {
+        const [kind, action] = event.type.split('.');
+        if (kind === 'responsibility') {
+            setResponsibilities((prev) => applyRowEvent(prev, action, event.data));
+        }
+    }, fetchResponsibilities);
 
     return (
         <div>
@@ -106,42 +133,45 @@ const ResponsibilitiesList = () => {
             ) : error && error !== 'Responsibilities not found' ? (
                 <p>Error: {error}</p>
             ) : (
-                responsibilities.map((responsibility) => (
-                    <Card
-                        key={responsibility.id}
-                        title={responsibility.title}
-                        content={[
-                            { label: 'Description', value: responsibility.description || 'N/A' },
-                            { label: 'Due Date', value: responsibility.due_date || 'N/A' },
-                        ]}
-                        onClick={() => setEditResponsibilityId(responsibility.id)}
-                        actions={
-                            currentUserRole === "landlord"
-                                ? [
-                                    {
-                                        label: 'X',
-                                        onClick: (e) => {
-                                            e.stopPropagation(); // Prevent triggering the card's onClick
-                                            handleDeleteResponsibility(responsibility.id);
-                                        },
-                                        style: {
-                                            position: 'absolute',
-                                            top: '10px',
-                                            right: '10px',
-                                            backgroundColor: 'red',
-                                            color: 'white',
-                                            border: 'none',
-                                            padding: '8px 12px',
-                                            borderRadius: '4px',
-                                            cursor: 'pointer',
+                <>
+                    {responsibilities.map((responsibility) => (
+                        <Card
+                            key={responsibility.id}
+                            title={responsibility.title}
+                            content={[
+                                { label: 'Description', value: responsibility.description || 'N/A' },
+                                { label: 'Due Date', value: responsibility.due_date || 'N/A' },
+                            ]}
+                            onClick={() => setEditResponsibilityId(responsibility.id)}
+                            actions={
+                                currentUserRole === "landlord"
+                                    ? [
+                                        {
+                                            label: 'X',
+                                            onClick: (e) => {
+                                                e.stopPropagation(); // Prevent triggering the card's onClick
+                                                handleDeleteResponsibility(responsibility.id);
+                                            },
+                                            style: {
+                                                position: 'absolute',
+                                                top: '10px',
+                                                right: '10px',
+                                                backgroundColor: 'red',
+                                                color: 'white',
+                                                border: 'none',
+                                                padding: '8px 12px',
+                                                borderRadius: '4px',
+                                                cursor: 'pointer',
+                                            },
                                         },
-                                    },
-                                ]
-                                : []
-                        }
-                        tooltip="Click to edit"
-                    />
-                ))
+                                    ]
+                                    : []
+                            }
+                            tooltip="Click to edit"
+                        />
+                    ))}
+                    <LoadMoreButton nextCursor={nextCursor} loading={loadingMore} onClick={loadMoreResponsibilities} />
+                </>
             )}
         </div>
     );
@@ -1,11 +1,15 @@
 import React, { useEffect, useState } from 'react';
 import axios from 'axios';
 import TenantCard from './TenantCard'; // Corrected path
+import usePropertyEvents, { applyRowEvent } from '../usePropertyEvents';
+import { fetchPage, appendPage, LoadMoreButton } from '../paging';
 
 
-const TenantList = () => {
-    const [tenants, setTenants] = useState([]);
-    const [loading, setLoading] = useState(true);
+const TenantList = ({ initialItems, initialCursor }) => {
+    const [tenants, setTenants] = useState(initialItems || []);
+    const [nextCursor, setNextCursor] = useState(initialCursor || null);
+    const [loadingMore, setLoadingMore] = useState(false);
+    const [loading, setLoading] = useState(!initialItems);
     const [error, setError] = useState(null);
     const [showAddTenantForm, setShowAddTenantForm] = useState(false);
     const [newTenantInviteCode, setNewTenantInviteCode] = useState(''); // Update state for invite code
@@ -51,7 +55,7 @@ const TenantList = () => {
             alert("New tenant added successfully!");
             setNewTenantInviteCode(''); // Clear the input field
             setShowAddTenantForm(false);
-            setTenants((prevTenants) => [...prevTenants, response.data]); // Update the tenant list
+            setTenants((prevTenants) => applyRowEvent(prevTenants, 'added', response.data)); // Update the tenant list
         } catch (err) {
             console.error(err);
             alert(`Error: ${err.response?.data?.detail || err.message}`);
@@ -64,27 +68,50 @@ const TenantList = () => {
     const currentUserRole = localStorage.getItem('role');
 
 
-    useEffect(() => {
-        const fetchTenants = async () => {
-            try {
-                const response = await axios.get(`http://localhost:8000/get-tenants-for-property/${propertyId}`, {
-                    headers: {
-                        Authorization: `Bearer ${localStorage.getItem('token')}`,
-                    },
-                });
-                setTenants(response.data);
-            } catch (err) {
-                if (err.response?.status === 401) {
-                    setError('Unauthorized access. Please log in again.');
-                } else {
-                    setError(err.message);
-                }
-            } finally {
-                setLoading(false);
+    const fetchTenants = async () => {
+        try {
+            const page = await fetchPage(`http://localhost:8000/get-tenants-for-property/${propertyId}`);
+            setTenants(page.items);
+            setNextCursor(page.nextCursor);
+        } catch (err) {
+            if (err.response?.status === 401) {
+                setError('Unauthorized access. Please log in again.');
+            } else {
+                setError(err.message);
             }
-        };
-        fetchTenants();
-    }, [propertyId]);
+        } finally {
+            setLoading(false);
+        }
+    };
+
+    // More tenants, one page at a time
+    const loadMoreTenants = async () => {
+        setLoadingMore(true);
+        try {
+            const page = await fetchPage(`http://localhost:8000/get-tenants-for-property/${propertyId}`, { after: nextCursor });
+            setTenants((prev) => appendPage(prev, page.items));
+            setNextCursor(page.nextCursor);
+        } catch (err) {
+            alert(`Error: ${err.response?.data?.detail || err.message}`);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
+    useEffect(() => {
+        // The property overview already loaded this list
+        if (!initialItems) {
+            fetchTenants();
+        }
+    }, []);
+
+    // Changes made by other users arrive as events and are applied in place
+    usePropertyEvents((event) => {
+        const [kind, action] = event.type.split('.');
+        if (kind === 'tenant') {
+            setTenants((prev) => applyRowEvent(prev, action, event.data));
+        }
+    }, fetchTenants);
 
     if (loading) {
         return <p>Loading tenants...</p>;
@@ -133,6 +160,7 @@ const TenantList = () => {
                     onRemove={() => handleRemoveTenant(tenant)}
                 />
             ))}
+            <LoadMoreButton nextCursor={nextCursor} loading={loadingMore} onClick={loadMoreTenants} />
         </div>
     );
 };
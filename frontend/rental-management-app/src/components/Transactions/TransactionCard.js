@@ -4,9 +4,9 @@ import axios from 'axios';
 
 const TransactionCard = ({ transaction, onClick, onDelete }) => {
     const [isHovered, setIsHovered] = useState(false);
-    const [resolutions, setResolutions] = useState([]);
-    const [loading, setLoading] = useState(true); // Add loading state
-    const [forceUpdate, setForceUpdate] = useState(false);
+    const [resolutions, setResolutions] = useState(transaction.resolutions || []);
+    const [loading, setLoading] = useState(!transaction.resolutions); // Add loading state
+    const [forceUpdate, setForceUpdate] = useState(0);
 
     // Calculate days left
     const calculateDaysLeft = (dueDate) => {
@@ -20,6 +20,13 @@ const TransactionCard = ({ transaction, onClick, onDelete }) => {
 
     // Fetch transaction resolutions
     useEffect(() => {
+        // The list embeds resolutions, so only fetch them after a change on this card
+        if (transaction.resolutions && forceUpdate === 0) {
+            setResolutions(transaction.resolutions);
+            setLoading(false);
+            return;
+        }
+
         const fetchResolutions = async () => {
             try {
                 const response = await fetch(`http://localhost:8000/transaction-resolutions/${transaction.id}`, {
@@ -37,7 +44,7 @@ const TransactionCard = ({ transaction, onClick, onDelete }) => {
         };
 
         fetchResolutions();
-    }, [transaction.id, forceUpdate]);
+    }, [transaction.id, transaction.resolutions, forceUpdate]);
 
     // Determine card background color
     const determineCardColor = () => {
@@ -71,7 +78,7 @@ const TransactionCard = ({ transaction, onClick, onDelete }) => {
                 },
             });
             alert(response.data.message || 'Transaction confirmed successfully!');
-            setForceUpdate((prev) => !prev); // Force update the component to re-fetch resolutions
+            setForceUpdate((prev) => prev + 1); // Force update the component to re-fetch resolutions
         } catch (error) {
             console.error('Error confirming transaction:', error);
             alert(error.response?.data?.detail || 'Failed to confirm transaction. Please try again.');
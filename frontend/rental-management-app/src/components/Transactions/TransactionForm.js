@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from "react";
 import axios from "axios";
+import { fetchAllPages, findInPages } from "../paging";
 
 const styles = {
   container: {
@@ -74,11 +75,9 @@ const TransactionForm = ({ propertyId, transactionId, mode, onTransactionUpdated
   useEffect(() => {
     const fetchParticipants = async () => {
       try {
-        const tenantsResponse = await axios.get(
-          `http://localhost:8000/get-tenants-for-property/${propertyId}`,
-          { headers: { Authorization: `Bearer ${localStorage.getItem("token")}` } }
-        );
-        setTenants(tenantsResponse.data);
+        // Every tenant can be a confirmer, not only the first page
+        const propertyTenants = await fetchAllPages(`http://localhost:8000/get-tenants-for-property/${propertyId}`);
+        setTenants(propertyTenants);
 
         const landlordResponse = await axios.get(
           `http://localhost:8000/users/me`,
@@ -100,11 +99,10 @@ const TransactionForm = ({ propertyId, transactionId, mode, onTransactionUpdated
     const fetchTransaction = async () => {
       if (mode === "edit" && transactionId) {
         try {
-          const transactionResponse = await axios.get(
+          const transaction = await findInPages(
             `http://localhost:8000/transactions/${propertyId}`,
-            { headers: { Authorization: `Bearer ${localStorage.getItem("token")}` } }
+            (t) => t.id === transactionId
           );
-          const transaction = transactionResponse.data.find((t) => t.id === transactionId);
           if (transaction) {
             setFormData({
               type: transaction.type,
@@ -199,18 +197,14 @@ const TransactionForm = ({ propertyId, transactionId, mode, onTransactionUpdated
         const newTransaction = transactionResponse.data;
 
         if (formData.confirmers.length > 0) {
-          await Promise.all(
-            formData.confirmers.map((userId) =>
-              axios.post(
-                `http://localhost:8000/add-transaction-resolution`,
-                {
-                  transaction_id: newTransaction.id,
-                  user_id: userId,
-                  status: "pending",
-                },
-                { headers: { Authorization: `Bearer ${localStorage.getItem("token")}` } }
-              )
-            )
+          await axios.post(
+            `http://localhost:8000/add-transaction-resolutions`,
+            {
+              transaction_id: newTransaction.id,
+              user_ids: formData.confirmers,
+              status: "pending",
+            },
+            { headers: { Authorization: `Bearer ${localStorage.getItem("token")}` } }
           );
         }
 
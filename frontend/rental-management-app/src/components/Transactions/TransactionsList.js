@@ -2,10 +2,14 @@ import React, { useEffect, useState } from 'react';
 import axios from 'axios';
 import TransactionCard from './TransactionCard'; // Corrected path
 import TransactionForm from './TransactionForm'; // Corrected path
+import usePropertyEvents, { applyRowEvent } from '../usePropertyEvents';
+import { fetchPage, appendPage, LoadMoreButton } from '../paging';
 
-const TransactionsList = () => {
-    const [transactions, setTransactions] = useState([]);
-    const [loading, setLoading] = useState(true);
+const TransactionsList = ({ initialItems, initialCursor }) => {
+    const [transactions, setTransactions] = useState(initialItems || []);
+    const [nextCursor, setNextCursor] = useState(initialCursor || null);
+    const [loadingMore, setLoadingMore] = useState(false);
+    const [loading, setLoading] = useState(!initialItems);
     const [error, setError] = useState(null);
     const [showAddTransactionForm, setShowAddTransactionForm] = useState(false); // State for toggling form
     const [editTransactionId, setEditTransactionId] = useState(null); // State for editing transaction
@@ -16,7 +20,7 @@ const TransactionsList = () => {
     };
 
     const handleTransactionAdded = (newTransaction) => {
-        setTransactions((prevTransactions) => [...prevTransactions, newTransaction]);
+        setTransactions((prevTransactions) => applyRowEvent(prevTransactions, 'added', newTransaction));
         setShowAddTransactionForm(false); // Hide form after submission
     };
 
@@ -52,32 +56,64 @@ const TransactionsList = () => {
         }
     };
 
-    useEffect(() => {
-        const propertyId = window.location.pathname.split('/').pop(); // Get the property ID from the URL
-        const fetchTransactions = async () => {
-            try {
-                const response = await axios.get(`http://localhost:8000/transactions/${propertyId}`, {
-                    headers: {
-                        Authorization: `Bearer ${localStorage.getItem('token')}`,
-                    },
-                });
-                setTransactions(response.data);
-            } catch (err) {
-                if (err.response?.status === 401) {
-                    setError('Unauthorized access. Please log in again.');
-                } else if (err.response?.status === 404) {
-                    setError('No transactions found for this property.'); // Handle 404 error
-                } else {
-                    setError(err.message);
-                }
-            } finally {
-                setLoading(false);
+    const propertyId = window.location.pathname.split('/').pop(); // Get the property ID from the URL
+    const fetchTransactions = async () => {
+        try {
+            const page = await fetchPage(`http://localhost:8000/transactions/${propertyId}`, {
+                params: { include: 'resolutions' },
+            });
+            setTransactions(page.items);
+            setNextCursor(page.nextCursor);
+        } catch (err) {
+            if (err.response?.status === 401) {
+                setError('Unauthorized access. Please log in again.');
+            } else if (err.response?.status === 404) {
+                setError('No transactions found for this property.'); // Handle 404 error
+            } else {
+                setError(err.message);
             }
-        };
+        } finally {
+            setLoading(false);
+        }
+    };
 
-        fetchTransactions();
+    // Older transactions, one page at a time
+    const loadMoreTransactions = async () => {
+        setLoadingMore(true);
+        try {
+            const page = await fetchPage(`http://localhost:8000/transactions/${propertyId}`, {
+                params: { include: 'resolutions' },
+                after: nextCursor,
+            });
+            setTransactions((prev) => appendPage(prev, page.items));
+            setNextCursor(page.nextCursor);
+        } catch (err) {
+            alert(`Error: ${err.response?.data?.detail || err.message}`);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
+    useEffect(() => {
+        // The property overview already loaded this list
+        if (!initialItems) {
+            fetchTransactions();
+        }
     }, []);
 
+    // Changes made by other users arrive as events and are applied in place
+    usePropertyEvents((event) => {
+        const [kind, action] = event.type.split('.');
+        if (event.type === 'transaction.resolutions') {
+            const { transaction_id, resolutions } = event.data;
+            setTransactions((prev) => prev.map((t) => (t.id === transaction_id ? { ...t, resolutions } : t)));
+            return;
+        }
+        if (kind === 'transaction') {
+            setTransactions((prev) => applyRowEvent(prev, action, event.data));
+        }
+    }, fetchTransactions);
+
     // Get current user role from localStorage
     const currentUserRole = localStorage.getItem('role');
 
@@ -115,14 +151,17 @@ const TransactionsList = () => {
                     onTransactionUpdated={handleTransactionUpdated} // Pass updated transaction handler
                 />
             ) : (
-                transactions.map((transaction) => (
-                    <TransactionCard
-                        key={transaction.id}
-                        transaction={transaction}
-                        onClick={() => handleTransactionClick(transaction)}
-                        onDelete={() => handleDeleteTransaction(transaction)} // Pass delete handler
-                    />
-                ))
+                <>
+                    {transactions.map((transaction) => (
+                        <TransactionCard
+                            key={transaction.id}
+                            transaction={transaction}
+                            onClick={() => handleTransactionClick(transaction)}
+                            onDelete={() => handleDeleteTransaction(transaction)} // Pass delete handler
+                        />
+                    ))}
+                    <LoadMoreButton nextCursor={nextCursor} loading={loadingMore} onClick={loadMoreTransactions} />
+                </>
             )}
         </div>
     );
@@ -0,0 +1,60 @@
+import React from 'react';
+import axios from 'axios';
+
+// The list routes return one page at a time, newest first. The cursor of the
+// next page comes in the X-Next-Cursor header and is sent back as `after`.
+
+const authHeaders = () => ({ Authorization: `Bearer ${localStorage.getItem('token')}` });
+
+// Fetch one page of a list route: { items, nextCursor } (nextCursor is null on the last page)
+export const fetchPage = async (url, { params, after } = {}) => {
+    const response = await axios.get(url, {
+        params: after ? { ...params, after } : params,
+        headers: authHeaders(),
+    });
+    return { items: response.data, nextCursor: response.headers['x-next-cursor'] || null };
+};
+
+// Fetch every page of a list route, for forms that need the whole list (e.g. all tenants)
+export const fetchAllPages = async (url, params) => {
+    let items = [];
+    let after = null;
+    do {
+        const page = await fetchPage(url, { params, after });
+        items = [...items, ...page.items];
+        after = page.nextCursor;
+    } while (after);
+    return items;
+};
+
+// Find a row of a list route, reading pages until it turns up (undefined if it does not)
+export const findInPages = async (url, predicate, params) => {
+    let after = null;
+    do {
+        const page = await fetchPage(url, { params, after });
+        const item = page.items.find(predicate);
+        if (item) return item;
+        after = page.nextCursor;
+    } while (after);
+    return undefined;
+};
+
+// Rows of the next page, without the ones the list already holds (a row that
+// arrived through an event can also be on a later page)
+export const appendPage = (rows, items) => {
+    const ids = new Set(rows.map((row) => row.id));
+    return [...rows, ...items.filter((item) => !ids.has(item.id))];
+};
+
+export const LoadMoreButton = ({ nextCursor, loading, onClick }) => {
+    if (!nextCursor) return null;
+    return (
+        <button
+            style={{ display: 'block', margin: '10px auto', padding: '8px 16px', border: '1px solid #007BFF', borderRadius: '5px', backgroundColor: 'white', color: '#007BFF', cursor: 'pointer' }}
+            disabled={loading}
+            onClick={onClick}
+        >
+            {loading ? 'Loading...' : 'Load more'}
+        </button>
+    );
+};
@@ -0,0 +1,63 @@
+import { useEffect, useRef } from 'react';
+
+// Listens to the change events of the property shown on this page.
+// onEvent gets every event; after a dropped connection the hook reconnects
+// and calls onResync, because events sent in the meantime were missed.
+const usePropertyEvents = (onEvent, onResync) => {
+    const handlers = useRef({ onEvent, onResync });
+    handlers.current = { onEvent, onResync };
+
+    useEffect(() => {
+        const propertyId = window.location.pathname.split('/').pop();
+        let socket;
+        let retryTimer;
+        let attempts = 0;
+        let stopped = false;
+
+        const connect = () => {
+            const token = localStorage.getItem('token');
+            socket = new WebSocket(`ws://localhost:8000/ws/property/${propertyId}?token=${token}`);
+            socket.onopen = () => {
+                if (attempts > 0 && handlers.current.onResync) {
+                    handlers.current.onResync();
+                }
+                attempts = 0;
+            };
+            socket.onmessage = (message) => {
+                const event = JSON.parse(message.data);
+                // Bulk changes (imports, recurring transactions) send one event instead of a row each
+                if (event.type === 'property.reload') {
+                    if (handlers.current.onResync) handlers.current.onResync();
+                    return;
+                }
+                handlers.current.onEvent(event);
+            };
+            socket.onclose = (event) => {
+                // 1008: not allowed to watch this property, retrying will not help
+                if (stopped || event.code === 1008) return;
+                attempts += 1;
+                retryTimer = setTimeout(connect, Math.min(30000, 1000 * 2 ** attempts));
+            };
+        };
+
+        connect();
+        return () => {
+            stopped = true;
+            clearTimeout(retryTimer);
+            socket.close();
+        };
+    }, []);
+};
+
+// Apply an added, updated or deleted row from an event to a list of rows (newest first)
+export const applyRowEvent = (rows, action, row) => {
+    if (action === 'deleted' || action === 'removed') {
+        return rows.filter((item) => item.id !== row.id);
+    }
+    if (rows.some((item) => item.id === row.id)) {
+        return rows.map((item) => (item.id === row.id ? { ...item, ...row } : item));
+    }
+    return [row, ...rows];
+};
+
+export default usePropertyEvents;
@@ -7,17 +7,21 @@ const PropertyPanel = () => {
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
     const [property, setProperty] = useState();
+    const [overview, setOverview] = useState(null);
 
 
     const fetchPropertyDetails = async () => {
         try {
             const propertyId = window.location.pathname.split('/').pop(); // Get the property ID from the URL
-            const response = await axios.get(`http://localhost:8000/property/${propertyId}`, {
+            // One request loads the property and the first page of every tab
+            const response = await axios.get(`http://localhost:8000/property/${propertyId}/overview`, {
+                params: { limit: 100 },
                 headers: {
                     Authorization: `Bearer ${localStorage.getItem('token')}`,
                 },
             });
-            setProperty(response.data);
+            setProperty(response.data.property);
+            setOverview(response.data);
         } catch (err) {
             if (err.response.status === 401) {
                 setError('Unauthorized access. Please log in again.');
@@ -43,7 +47,7 @@ const PropertyPanel = () => {
                     <h1 >{property.name}</h1>
                     <p>{property.description}</p>
                     <p><strong>Location:</strong> {property.location}</p>
-                    <ManagementTabs />
+                    <ManagementTabs overview={overview} />
                 </div>
             )}
         </div>
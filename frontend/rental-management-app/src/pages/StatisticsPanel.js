@@ -3,7 +3,7 @@ import { PieChart, Pie, Cell, Tooltip, Legend } from 'recharts';
 import axios from 'axios';
 
 const StatisticsPanel = () => {
-    const [transactions, setTransactions] = useState([]);
+    const [statistics, setStatistics] = useState({ by_month: [], by_type: [] });
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
     const [userRole, setUserRole] = useState(null);
@@ -25,14 +25,14 @@ const StatisticsPanel = () => {
         });
     };
 
-    const fetchTransactions = async () => {
+    const fetchStatistics = async () => {
         try {
-            const response = await axios.get(`http://localhost:8000/all-resolved-transactions`, {
+            const response = await axios.get(`http://localhost:8000/statistics`, {
                 headers: {
                     Authorization: `Bearer ${localStorage.getItem('token')}`,
                 },
             });
-            setTransactions(response.data);
+            setStatistics(response.data);
             // Try to get user role from localStorage or decode from token if available
             const storedRole = localStorage.getItem('role');
             if (storedRole) {
@@ -63,81 +63,39 @@ const StatisticsPanel = () => {
     };
 
     useEffect(() => {
-        fetchTransactions();
+        fetchStatistics();
     }, []);
 
-    // Helper to aggregate transactions by type and sum their amounts
-    const aggregateByType = (transactions) => {
-        const map = {};
-        transactions.forEach((transaction) => {
-            const type = transaction.type;
-            const amount = parseFloat(transaction.amount);
-            if (!map[type]) {
-                map[type] = 0;
-            }
-            map[type] += amount;
-        });
-        // Convert to array of { name, value }
-        return Object.entries(map)
-            .map(([name, value]) => ({ name, value }))
+    // Convert aggregated totals to chart data of { name, value }
+    const toChartData = (series) => {
+        return series
+            .map((entry) => ({ name: entry.type, value: parseFloat(entry.total) }))
             .sort((a, b) => b.value - a.value);
     };
 
-    // Split transactions into incomes and expenses based on payee_role and userRole
-    const incomes = transactions.filter(
-        (transaction) => userRole && transaction.payee_role !== userRole
-    );
-    const expenses = transactions.filter(
-        (transaction) => userRole && transaction.payee_role === userRole
-    );
-
-    // Helper to check if a transaction is in the selected month
-    const isInSelectedMonth = (dateStr) => {
-        if (!dateStr) return false;
-        const date = new Date(dateStr);
-        const [year, month] = selectedMonth.split('-');
-        return (
-            date.getFullYear() === parseInt(year, 10) &&
-            date.getMonth() + 1 === parseInt(month, 10)
-        );
-    };
+    // Split the server-side aggregates into incomes and expenses based on payee_role and userRole
+    const isIncome = (entry) => userRole && entry.payee_role !== userRole;
+    const isExpense = (entry) => userRole && entry.payee_role === userRole;
 
-    // Filter transactions for the selected month
-    const monthlyIncomes = transactions.filter(
-        (transaction) =>
-            userRole &&
-            transaction.payee_role !== userRole &&
-            isInSelectedMonth(transaction.due_date)
-    );
-    const monthlyExpenses = transactions.filter(
-        (transaction) =>
-            userRole &&
-            transaction.payee_role === userRole &&
-            isInSelectedMonth(transaction.due_date)
-    );
+    // Aggregates for the selected month
+    const monthlyTypes = statistics.by_type.filter((entry) => entry.month === selectedMonth);
+    const monthlyTotals = statistics.by_month.filter((entry) => entry.month === selectedMonth);
 
-    // Aggregate chart data for incomes and expenses for the selected month
-    const chartDataIncomes = aggregateByType(monthlyIncomes);
-    const chartDataExpenses = aggregateByType(monthlyExpenses);
+    // Chart data for incomes and expenses for the selected month
+    const chartDataIncomes = toChartData(monthlyTypes.filter(isIncome));
+    const chartDataExpenses = toChartData(monthlyTypes.filter(isExpense));
 
     const COLORS_INCOMES = generateColorsBasedOnValues(chartDataIncomes, 'green');
     const COLORS_EXPENSES = generateColorsBasedOnValues(chartDataExpenses, 'red');
 
     // Calculate totals for selected month
-    const totalMonthlyIncome = monthlyIncomes.reduce((sum, t) => sum + parseFloat(t.amount), 0);
-    const totalMonthlyExpenses = monthlyExpenses.reduce((sum, t) => sum + parseFloat(t.amount), 0);
+    const totalMonthlyIncome = monthlyTotals.filter(isIncome).reduce((sum, t) => sum + parseFloat(t.total), 0);
+    const totalMonthlyExpenses = monthlyTotals.filter(isExpense).reduce((sum, t) => sum + parseFloat(t.total), 0);
     const monthlyBalance = totalMonthlyIncome - totalMonthlyExpenses;
 
-    // Generate month options based on transactions
+    // Generate month options based on the months that have resolved transactions
     const getMonthOptions = () => {
-        const monthsSet = new Set();
-        transactions.forEach((t) => {
-            if (t.due_date) {
-                const date = new Date(t.due_date);
-                const key = `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}`;
-                monthsSet.add(key);
-            }
-        });
+        const monthsSet = new Set(statistics.by_month.map((entry) => entry.month));
         // Always include the current month
         const now = new Date();
         monthsSet.add(`${now.getFullYear()}-${String(now.getMonth() + 1).padStart(2, '0')}`);